@@ -0,0 +1,52 @@
+// Журнал ответов игр — общий помощник.
+//   <script src="./answer-events.js"></script>  (до game-loader.js)
+//   const logAnswerEvent = createAnswerLogger('number-racing');
+//   logAnswerEvent(profileId, { k: 'count:5', ok: false, ms: 2300, a: 1 });
+// События копятся в памяти и уходят на сервер пачкой (POST /api/events)
+// раз в FLUSH_MS, при смене профиля или при уходе со страницы.
+// Профиль ими не нагружается — сводки сервер собирает из журнала
+// (формат строки — в server/events.js).
+(function() {
+  var EVENTS_URL = '/api/events';
+  var FLUSH_MS = 5000;
+  var pending = { profileId: null, queue: [], timer: null };
+
+  function flush(leaving) {
+    if (pending.timer) {
+      clearTimeout(pending.timer);
+      pending.timer = null;
+    }
+    if (!pending.profileId || pending.queue.length === 0) return;
+    var body = JSON.stringify({ profileId: pending.profileId, events: pending.queue });
+    pending.queue = [];
+    // При закрытии вкладки обычный fetch может не успеть уйти
+    if (leaving && navigator.sendBeacon
+      && navigator.sendBeacon(EVENTS_URL, new Blob([body], { type: 'application/json' }))) {
+      return;
+    }
+    fetch(EVENTS_URL, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: body,
+      keepalive: !!leaving
+    }).catch(function(e) { console.error('Error sending answer events:', e); });
+  }
+
+  // Логгер одной игры: game уходит в каждое событие полем g
+  function createAnswerLogger(game) {
+    return function logAnswerEvent(profileId, event) {
+      if (!profileId) return;
+      if (pending.profileId !== profileId) {
+        flush(false);
+        pending.profileId = profileId;
+      }
+      pending.queue.push(Object.assign({ t: Date.now(), g: game }, event));
+      if (!pending.timer) {
+        pending.timer = setTimeout(function() { flush(false); }, FLUSH_MS);
+      }
+    };
+  }
+
+  window.addEventListener('pagehide', function() { flush(true); });
+  window.createAnswerLogger = createAnswerLogger;
+})();
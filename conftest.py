@@ -0,0 +1,22 @@
+"""pytest fixtures for the Playwright scripts.
+
+Session fixtures live once per process, so under pytest-xdist every worker
+gets its own server.js and data file.
+"""
+import pytest
+
+from harness import config
+from harness.server import LocalServer
+
+
+@pytest.fixture(scope='session')
+def local_server():
+    with LocalServer() as server:
+        yield server
+
+
+@pytest.fixture(scope='session')
+def app_url(request):
+    if config.APP_URL:
+        return config.APP_URL
+    return request.getfixturevalue('local_server').url
@@ -9,6 +9,9 @@ SSH_ALIAS="beget"
 REMOTE_DIR="~/education-games"
 LOCAL_DIR="."
 
+echo "🛠️ Сборка бандлов игр..."
+npm run build || exit 1
+
 echo "📦 Упаковка файлов..."
 tar -czf deploy.tar.gz \
   --exclude=node_modules \
@@ -0,0 +1,63 @@
+// Загрузчик игр.
+//   <script src="./game-loader.js" data-game="number-racing.tsx"></script>
+// Берёт предсобранный бандл из dist/manifest.json (npm run build).
+// Если бандла нет или открыто с ?dev=1 — компилирует .tsx Babel'ем в браузере.
+// iOS Safari блокирует <script type="text/babel" src="...">, когда сервер
+// отдаёт .tsx как application/octet-stream, поэтому fallback идёт через
+// fetch+Babel.transform.
+(function() {
+  var BABEL_URL = 'https://unpkg.com/@babel/standalone/babel.min.js';
+  var source = document.currentScript.getAttribute('data-game');
+  var dev = /[?&]dev=1(&|$)/.test(location.search);
+
+  function report(err) {
+    if (window.__dbg) {
+      window.__dbg.push('LOAD GAME FAILED: ' + (err.message || err));
+      window.__showDbg && window.__showDbg('LOAD FAILED');
+    } else {
+      console.error('Не удалось загрузить игру ' + source + ':', err);
+    }
+  }
+
+  function loadScript(src, onload, onerror) {
+    var s = document.createElement('script');
+    s.src = src;
+    s.onload = onload;
+    s.onerror = function() { onerror(new Error('script load failed: ' + src)); };
+    document.body.appendChild(s);
+  }
+
+  function compileInBrowser() {
+    var run = function() {
+      fetch('./' + source, { cache: 'no-cache' })
+        .then(function(r) {
+          if (!r.ok) throw new Error('tsx fetch failed: ' + r.status);
+          return r.text();
+        })
+        .then(function(src) {
+          // retainLines + sourceURL: в DevTools и профилях видно имя .tsx
+          // и номера строк исходника (python -m harness.raceprofile)
+          var compiled = Babel.transform(src, {
+            presets: ['react', ['env', { targets: { safari: '12' } }]],
+            retainLines: true
+          }).code;
+          var s = document.createElement('script');
+          s.textContent = compiled + '\n//# sourceURL=' + location.origin + '/' + source;
+          document.body.appendChild(s);
+        })
+        .catch(report);
+    };
+    if (typeof Babel !== 'undefined') run();
+    else loadScript(BABEL_URL, run, report);
+  }
+
+  if (dev) { compileInBrowser(); return; }
+
+  fetch('/dist/manifest.json', { cache: 'no-cache' })
+    .then(function(r) { return r.ok ? r.json() : {}; })
+    .then(function(manifest) {
+      if (manifest[source]) loadScript(manifest[source], null, compileInBrowser);
+      else compileInBrowser();
+    })
+    .catch(compileInBrowser);
+})();
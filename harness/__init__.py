@@ -0,0 +1,11 @@
+"""Shared Playwright test harness for the education games.
+
+See ``python -m harness --help`` for the parallel scenario runner.
+"""
+from .runner import BrowserPool, Scenario, ScenarioResult, scenario
+from .waits import STATES, AsyncWaiter, StateTimeout, Waiter
+
+__all__ = [
+    'BrowserPool', 'Scenario', 'ScenarioResult', 'scenario',
+    'STATES', 'AsyncWaiter', 'StateTimeout', 'Waiter',
+]
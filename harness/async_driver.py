@@ -0,0 +1,98 @@
+"""asyncio driver built on ``playwright.async_api``.
+
+The thread pool in runner.py still blocks one thread on every goto/click/wait.
+Here scenarios are coroutines sharing a single Chromium in one event loop;
+each gets its own BrowserContext and up to ``concurrency`` of them are in
+flight at once. Within a scenario, independent pages can be driven together
+with ``asyncio.gather`` (see ``load_pages``).
+
+    python -m harness --async -c 8
+"""
+import asyncio
+import contextlib
+import time
+from typing import Dict, List
+
+from playwright.async_api import async_playwright
+
+from . import config
+from .runner import Scenario, ScenarioResult, _print_result
+from .server import LocalServer
+from .waits import AsyncWaiter
+
+ASYNC_SCENARIOS: Dict[str, Scenario] = {}
+
+
+def async_scenario(name=None, tags=()):
+    """Register a coroutine function as an async scenario."""
+    def decorator(fn):
+        key = name or fn.__name__
+        ASYNC_SCENARIOS[key] = Scenario(key, fn, tuple(tags))
+        return fn
+    return decorator
+
+
+async def load_pages(context, paths, state='react_mounted', legacy_ms=3000):
+    """Open ``paths`` in parallel pages.
+
+    Returns ``({path: seconds until state}, pages)``; the pages stay open for
+    further checks and close with their context.
+    """
+    async def load(path):
+        page = await context.new_page()
+        waiter = AsyncWaiter(page)
+        started = time.perf_counter()
+        await page.goto(path, timeout=30000)
+        await waiter.until(state, legacy_ms=legacy_ms)
+        return path, time.perf_counter() - started, page
+
+    loaded = await asyncio.gather(*(load(p) for p in paths))
+    return {path: seconds for path, seconds, _ in loaded}, [page for _, _, page in loaded]
+
+
+class AsyncBrowserPool:
+    """Runs async scenarios on one browser with bounded concurrency."""
+
+    def __init__(self, concurrency=None, headless=None, base_url=None, context_options=None):
+        self.concurrency = concurrency or config.WORKERS * 2
+        self.headless = config.HEADLESS if headless is None else headless
+        self.base_url = config.APP_URL if base_url is None else base_url
+        self.context_options = context_options or {}
+
+    async def run(self, scenarios: List[Scenario]) -> List[ScenarioResult]:
+        async with contextlib.AsyncExitStack() as stack:
+            base_url = self.base_url or stack.enter_context(LocalServer()).url
+            p = await stack.enter_async_context(async_playwright())
+            browser = await p.chromium.launch(headless=self.headless)
+            stack.push_async_callback(browser.close)
+
+            slots = asyncio.Semaphore(self.concurrency)
+            return list(await asyncio.gather(
+                *(self._run_one(browser, base_url, sc, slots) for sc in scenarios)))
+
+    async def _run_one(self, browser, base_url, sc, slots):
+        async with slots:
+            context = await browser.new_context(base_url=base_url, **self.context_options)
+            result = ScenarioResult(sc.name, False, 0.0, 0)
+            started = time.perf_counter()
+            try:
+                notes = await sc.fn(context)
+                result.passed = True
+                if isinstance(notes, dict):
+                    result.notes = notes
+            except Exception as e:
+                result.error = f'{type(e).__name__}: {e}'
+            finally:
+                result.seconds = time.perf_counter() - started
+                await context.close()
+            _print_result(result)
+            return result
+
+
+def select(pattern=None, tags=None):
+    picked = list(ASYNC_SCENARIOS.values())
+    if pattern:
+        picked = [s for s in picked if pattern in s.name]
+    if tags:
+        picked = [s for s in picked if set(tags) & set(s.tags)]
+    return picked
@@ -0,0 +1,72 @@
+"""Async ports of the legacy flows for ``python -m harness --async``."""
+from . import config
+from .async_driver import async_scenario, load_pages
+from .oracle import ANSWER_BUTTONS
+from .scenarios import GAME_PAGES
+from .waits import AsyncWaiter
+
+
+async def _open_race(context, profile=True):
+    page = await context.new_page()
+    waiter = AsyncWaiter(page)
+    query = f"?profile={config.PROFILE_ID}" if profile else ''
+    await page.goto(f"/games-number-racing.html{query}", timeout=30000)
+    await waiter.until('menu', legacy_ms=3000)
+    await page.locator('button:has-text("▶️")').first.click()
+    await waiter.until('race_task', legacy_ms=2000)
+    return page, waiter
+
+
+async def _assert_not_blank(page, when):
+    body = await page.locator('body').text_content() or ''
+    assert len(body) >= 100, f"white screen {when} ({len(body)} chars)"
+
+
+@async_scenario('game_pages_concurrent', tags=('ui', 'games', 'smoke'))
+async def game_pages_concurrent(context):
+    """All game pages load at the same time instead of back to back."""
+    paths = [f"{path}?profile={config.PROFILE_ID}" for path in GAME_PAGES.values()]
+    errors = []
+    context.on('weberror', lambda err: errors.append(str(err.error)))
+    timings, _ = await load_pages(context, paths)
+    assert not errors, f"JavaScript errors: {errors[:3]}"
+    return {path.split('?')[0]: round(seconds, 2) for path, seconds in timings.items()}
+
+
+@async_scenario('race_wrong_then_right', tags=('ui', 'race'))
+async def race_wrong_then_right(context):
+    """test_answers_scenarios.py: three taps on the first option, then the second."""
+    page, waiter = await _open_race(context, profile=False)
+
+    for attempt in range(3):
+        await page.locator(ANSWER_BUTTONS).first.click(force=True)
+        await waiter.until('feedback_settled', legacy_ms=1500)
+        await _assert_not_blank(page, f"after attempt {attempt + 1}")
+
+    if await page.locator(ANSWER_BUTTONS).count() > 1:
+        await page.locator(ANSWER_BUTTONS).nth(1).click(force=True)
+        await waiter.until('feedback_settled', legacy_ms=2000)
+        await _assert_not_blank(page, "after the second option")
+    return waiter.summary()
+
+
+@async_scenario('race_pause_resume', tags=('ui', 'race'))
+async def race_pause_resume(context):
+    """test_pause_feature.py: pause, resume, auto-save and exit to menu."""
+    page, waiter = await _open_race(context)
+
+    for _ in range(3):
+        await page.locator(ANSWER_BUTTONS).first.click(force=True)
+        await waiter.until('feedback_settled', legacy_ms=1200)
+
+    await page.locator('button:has-text("⏸️")').first.click()
+    await waiter.until('pause_menu', legacy_ms=1000)
+    await page.locator('button:has-text("Продолжить")').first.click()
+    await waiter.until('race_resumed', legacy_ms=1000)
+    await waiter.until('race_autosaved', legacy_ms=6000, timeout=8000)
+
+    await page.locator('button:has-text("⏸️")').first.click()
+    await waiter.until('pause_menu', legacy_ms=1000)
+    await page.locator('button:has-text("Выйти в меню")').first.click()
+    await waiter.until('continue_dialog', legacy_ms=2000)
+    return waiter.summary()
@@ -0,0 +1,275 @@
+"""Page-load benchmark for the marketplace and the game pages.
+
+Opens index.html and every games-*.html ``iterations`` times, each time in a
+fresh BrowserContext (cold HTTP cache), and records:
+
+    ttfb_ms              Navigation Timing responseStart
+    dcl_ms               domContentLoadedEventEnd
+    load_ms              loadEventEnd
+    script_download_ms   first script request start to last script response end
+                         (.js bundles, Babel, .tsx sources fetched for compiling)
+    jsx_compile_ms       in-browser Babel: from the source being available to the
+                         compiled <script> being inserted; 0 with prebuilt bundles
+    interactive_ms       first enabled ▶️ button or profile card ("Играть" /
+                         "Новый игрок")
+    js_heap_mb           used JS heap once interactive (CDP Runtime.getHeapUsage)
+    transfer_kb          bytes on the wire until interactive, all origins
+                         (CDP Network encodedDataLength: compressed size + headers)
+    local_transfer_kb    the same for the app's own origin only
+
+Median and p95 per metric go to a JSON baseline. A later run compares its
+medians against the stored ones and fails when one is worse by more than
+``--threshold`` (relative) and by more than the metric's noise floor.
+
+    python -m harness.bench -n 5 --update   # record the baseline
+    python -m harness.bench -n 5            # compare, exit 1 on regression
+
+``--identity`` asks for uncompressed responses (Accept-Encoding: identity), so
+the saving from Brotli/gzip shows up as a before/after pair:
+
+    python -m harness.bench --identity --baseline identity.json --update
+    python -m harness.bench --baseline identity.json
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+
+from playwright.sync_api import sync_playwright
+
+from . import config
+from .server import REPO_ROOT, local_app
+from .stats import median, percentile
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+# Lower is better for every metric. A regression must exceed both the relative
+# threshold and this absolute floor, so a 3 ms TTFB wobble never fails a run.
+METRICS = {
+    'ttfb_ms': 20,
+    'dcl_ms': 50,
+    'load_ms': 50,
+    'script_download_ms': 50,
+    'jsx_compile_ms': 50,
+    'interactive_ms': 100,
+    'js_heap_mb': 2,
+    'transfer_kb': 5,
+    'local_transfer_kb': 1,
+}
+
+# Installed before any page script runs. Records when the first interactive
+# control appears and when a compiled script is inserted: both @babel/standalone
+# (text/babel) and game-loader.js's fallback append an inline <script> with the
+# compiled code once the HTML has been parsed.
+PROBE = """(() => {
+    const m = window.__bench = { interactive: null, compiled: null };
+    const isInteractive = b => !b.disabled && (b.textContent.includes('▶️')
+        || b.textContent.includes('Играть') || b.textContent.includes('Новый игрок'));
+    const poll = () => {
+        if (Array.from(document.querySelectorAll('button')).some(isInteractive)) {
+            m.interactive = performance.now();
+        } else {
+            requestAnimationFrame(poll);
+        }
+    };
+    requestAnimationFrame(poll);
+    new MutationObserver(records => {
+        if (m.compiled !== null || document.readyState === 'loading') return;
+        for (const r of records) {
+            for (const n of r.addedNodes) {
+                if (n.tagName === 'SCRIPT' && !n.src && n.textContent.length > 1000) {
+                    m.compiled = performance.now();
+                    return;
+                }
+            }
+        }
+    }).observe(document, { childList: true, subtree: true });
+})()"""
+
+COLLECT = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const scripts = resources.filter(r => r.initiatorType === 'script'
+        || /\\.(tsx|jsx|ts)(\\?|$)/.test(r.name));
+    let compile = 0;
+    if (window.__bench.compiled !== null) {
+        const sources = resources.filter(r => /babel|\\.(tsx|jsx|ts)(\\?|$)/.test(r.name));
+        const ready = Math.max(nav.domInteractive, ...sources.map(r => r.responseEnd));
+        compile = Math.max(0, window.__bench.compiled - ready);
+    }
+    return {
+        ttfb_ms: nav.responseStart,
+        dcl_ms: nav.domContentLoadedEventEnd,
+        load_ms: nav.loadEventEnd,
+        script_download_ms: scripts.length
+            ? Math.max(...scripts.map(r => r.responseEnd)) - Math.min(...scripts.map(r => r.startTime))
+            : 0,
+        jsx_compile_ms: compile,
+        interactive_ms: window.__bench.interactive,
+    };
+}"""
+
+
+def page_paths():
+    """index.html plus every games-*.html in the repo root."""
+    games = sorted(os.path.basename(p) for p in glob.glob(os.path.join(REPO_ROOT, 'games-*.html')))
+    return ['/index.html'] + [f"/{name}?profile={config.PROFILE_ID}" for name in games]
+
+
+def measure(context, path, timeout=30000):
+    page = context.new_page()
+    try:
+        cdp = context.new_cdp_session(page)
+        urls, transferred = {}, []
+        cdp.on('Network.responseReceived',
+               lambda e: urls.__setitem__(e['requestId'], e['response']['url']))
+        cdp.on('Network.loadingFinished',
+               lambda e: transferred.append((e['requestId'], e['encodedDataLength'])))
+        cdp.send('Network.enable')
+        page.goto(path, wait_until='load', timeout=timeout)
+        page.wait_for_function("() => window.__bench.interactive !== null", timeout=timeout)
+        sample = page.evaluate(COLLECT)
+        sample['js_heap_mb'] = cdp.send('Runtime.getHeapUsage')['usedSize'] / 2**20
+        origin = page.evaluate("() => location.origin")
+        sample['transfer_kb'] = sum(n for _, n in transferred) / 1024
+        sample['local_transfer_kb'] = sum(
+            n for rid, n in transferred if urls.get(rid, '').startswith(origin)) / 1024
+        return sample
+    finally:
+        page.close()
+
+
+def _new_context(browser, base_url, identity=False):
+    headers = {'Accept-Encoding': 'identity'} if identity else None
+    context = browser.new_context(base_url=base_url, extra_http_headers=headers)
+    context.add_init_script(PROBE)
+    return context
+
+
+def run(base_url, paths, iterations, headless=True, warm=False, identity=False):
+    """Return ``{path: {metric: [samples]}}``."""
+    samples = {path: {m: [] for m in METRICS} for path in paths}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            shared = _new_context(browser, base_url, identity) if warm else None
+            for i in range(iterations):
+                for path in paths:
+                    context = shared or _new_context(browser, base_url, identity)
+                    try:
+                        sample = measure(context, path)
+                    finally:
+                        if not warm:
+                            context.close()
+                    for metric in METRICS:
+                        samples[path][metric].append(sample[metric])
+                print(f"  iteration {i + 1}/{iterations} done", flush=True)
+        finally:
+            browser.close()
+    return samples
+
+
+def summarize(samples):
+    return {
+        path: {
+            metric: {
+                'median': round(median(values), 2),
+                'p95': round(percentile(values, 95), 2),
+            }
+            for metric, values in metrics.items()
+        }
+        for path, metrics in samples.items()
+    }
+
+
+def compare(results, baseline, threshold):
+    """List of human-readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for path, metrics in results.items():
+        for metric, stats in metrics.items():
+            old = baseline.get('pages', {}).get(path, {}).get(metric)
+            if not old:
+                continue
+            delta = stats['median'] - old['median']
+            if delta > METRICS[metric] and delta > old['median'] * threshold:
+                regressions.append(
+                    f"{path} {metric}: median {old['median']:.1f} -> {stats['median']:.1f} "
+                    f"(+{delta / max(old['median'], 1e-9):.0%})")
+    return regressions
+
+
+def print_table(results, baseline=None):
+    print("\n" + "=" * 70)
+    print("PAGE LOAD (median / p95)")
+    print("=" * 70)
+    for path, metrics in results.items():
+        print(f"\n  {path.split('?')[0]}")
+        for metric, stats in metrics.items():
+            line = f"    {metric:<20} {stats['median']:9.1f} / {stats['p95']:9.1f}"
+            old = (baseline or {}).get('pages', {}).get(path, {}).get(metric)
+            if old:
+                line += f"   baseline {old['median']:9.1f}"
+            print(line)
+    print("=" * 70)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--iterations', type=int, default=5)
+    parser.add_argument('-k', dest='pattern', help='only pages whose path contains this')
+    parser.add_argument('--baseline', default=config.BENCH_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative regression that fails the run (default 0.2 = 20%%)')
+    parser.add_argument('--update', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--warm', action='store_true',
+                        help='reuse one context so later iterations hit the HTTP cache')
+    parser.add_argument('--identity', action='store_true',
+                        help='request uncompressed responses (Accept-Encoding: identity)')
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--base-url', default=config.APP_URL)
+    args = parser.parse_args(argv)
+
+    paths = [p for p in page_paths() if not args.pattern or args.pattern in p]
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    app = contextlib.nullcontext(args.base_url) if args.base_url else local_app()
+    with app as base_url:
+        print(f"Benchmarking {len(paths)} pages x {args.iterations} iterations against {base_url}")
+        results = summarize(run(base_url, paths, args.iterations,
+                                headless=config.HEADLESS and not args.headed, warm=args.warm,
+                                identity=args.identity))
+
+    print_table(results, baseline)
+
+    if args.update or baseline is None:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'iterations': args.iterations,
+                    'warm': args.warm,
+                    'identity': args.identity,
+                    'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                },
+                'pages': results,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for r in regressions:
+        print(f"  [FAIL] {r}")
+    if not regressions:
+        print(f"  [OK] no metric regressed by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""Shared settings for the Playwright harness.
+
+Every value can be overridden through the environment so the same scenarios
+run against a local checkout, a staging box or production.
+"""
+import os
+
+# Base URL of the marketplace server (server/server.js). When empty, the
+# harness starts a hermetic local server (harness/server.py) per worker.
+APP_URL = os.environ.get('APP_URL', '').rstrip('/')
+
+# Profile used by the game scenarios that need saved progress.
+PROFILE_ID = os.environ.get('TEST_PROFILE_ID', '1764998591846')
+
+# Worker count for the parallel runner; defaults to the number of CPUs.
+WORKERS = int(os.environ.get('HARNESS_WORKERS', '0')) or (os.cpu_count() or 2)
+
+HEADLESS = os.environ.get('HARNESS_HEADED', '') == ''
+
+# Directory for screenshots and other artifacts written by scenarios.
+SCREENSHOT_DIR = os.environ.get('HARNESS_SCREENSHOT_DIR', 'test_screenshots')
+
+# JSON file with the page-load medians/p95 that ``python -m harness.bench``
+# compares against.
+BENCH_BASELINE = os.environ.get('HARNESS_BENCH_BASELINE', 'bench_baseline.json')
+
+# JSON file with the perceptual hashes and thumbnails that
+# ``python -m harness.visual`` and the runner compare screenshots against.
+VISUAL_BASELINE = os.environ.get('HARNESS_VISUAL_BASELINE', 'visual_baseline.json')
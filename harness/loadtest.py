@@ -0,0 +1,300 @@
+"""asyncio load generator for the profile REST API in server/server.js.
+
+Replays the traffic the pages actually send, from virtual users that each hold
+one keep-alive connection (like a browser tab):
+
+    marketplace   index.html: GET /api/profiles?summary=1, GET /api/current-profile,
+                  then GET /api/profiles/:id and POST /api/current-profile
+                  when a card is picked
+    game          a game page opening with ?profile=: GET /api/profiles
+    reading       reading-game.tsx: every answer changes the profile and a
+                  PATCH with the changed fields fires once 500 ms pass
+                  without another change (the debounce effect); with
+                  ``--full-put`` it PUTs the whole profile as the game used to
+
+Each concurrency level in ``--levels`` runs for ``--duration`` seconds; the
+report shows requests/s, p50/p95/p99 latency and mean request body size per
+endpoint, errors, and
+lost updates (a reading user's last PUT missing from the store afterwards),
+so the level where the single-file JSON store collapses stands out.
+
+The run always uses a hermetic LocalServer seeded with ``--profiles`` profiles;
+it writes constantly and must never point at real data.
+
+    python -m harness.loadtest                       # levels 1,5,10,25,50
+    python -m harness.loadtest --levels 10,100 -d 20 --mix marketplace=1,game=1,reading=8
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import sys
+import time
+import urllib.parse
+from collections import defaultdict
+
+from .server import LocalServer, make_profile
+from .stats import percentile
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+DEBOUNCE_S = 0.5
+DEFAULT_MIX = {'marketplace': 1, 'game': 2, 'reading': 4}
+
+
+def loadtest_profile(i):
+    """A profile the size of one that has played for a couple of months."""
+    days = {f"2024-{1 + d // 28:02d}-{1 + d % 28:02d}": {'tasks': d % 9 + 1, 'stars': d % 7}
+            for d in range(60)}
+    islands = {
+        str(n): {'unlocked': n <= 3, 'completed': n <= 2,
+                 'letters': [n <= 2] * 6, 'words': [n <= 2] * 9, 'stories': [False] * 3}
+        for n in range(1, 6)
+    }
+    return make_profile(
+        f"{2000000000000 + i}", f"Игрок {i}", random.choice(['fox', 'bunny', 'bear', 'cat']),
+        stars=i * 3, totalStars=i * 5, stats=days,
+        progress={'islands': islands, 'letters': [True] * 10 + [False] * 23},
+        numberRacingData={'stars': i, 'unlockedCars': ['starter'], 'difficulty': 2,
+                          'stats': {'totalRaces': i, 'totalCorrect': i * 20, 'wins': i // 2}},
+    )
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive JSON client on asyncio streams."""
+
+    def __init__(self, base_url):
+        url = urllib.parse.urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        """Return ``(status, parsed JSON or None)``."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        content_type = 'application/merge-patch+json' if method == 'PATCH' else 'application/json'
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+                "Connection: keep-alive\r\n\r\n")
+        self.writer.write(head.encode('ascii') + payload)
+        await self.writer.drain()
+
+        status_line = (await self.reader.readline()).split()
+        if len(status_line) < 2:
+            # The server closed the keep-alive connection (Recorder counts an error)
+            raise ConnectionError('connection closed before the status line')
+        status = int(status_line[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding') == 'chunked':
+            data = b''
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                data += await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+            data = data[:-2]
+        else:
+            data = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection') == 'close':
+            await self.close()
+        return status, json.loads(data) if data else None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            with contextlib.suppress(Exception):
+                await self.writer.wait_closed()
+        self.reader = self.writer = None
+
+
+class Recorder:
+    """Latencies, request body bytes and failures per ``(kind, endpoint)``."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.body_bytes = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    async def call(self, conn, kind, endpoint, method, path, body=None):
+        if body is not None:
+            self.body_bytes[kind, endpoint] += len(json.dumps(body).encode('utf-8'))
+        started = time.perf_counter()
+        try:
+            status, data = await conn.request(method, path, body)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            await conn.close()
+            self.errors[kind, endpoint] += 1
+            return None
+        self.latencies[kind, endpoint].append(time.perf_counter() - started)
+        if status >= 400:
+            self.errors[kind, endpoint] += 1
+            return None
+        return data
+
+
+async def marketplace_user(conn, rec, profiles, stop):
+    while time.monotonic() < stop:
+        await rec.call(conn, 'marketplace', 'GET /api/profiles?summary=1', 'GET',
+                       '/api/profiles?summary=1')
+        await rec.call(conn, 'marketplace', 'GET /api/current-profile', 'GET', '/api/current-profile')
+        picked = random.choice(profiles)['id']
+        await rec.call(conn, 'marketplace', 'GET /api/profiles/:id', 'GET', f"/api/profiles/{picked}")
+        await rec.call(conn, 'marketplace', 'POST /api/current-profile', 'POST', '/api/current-profile',
+                       {'profileId': picked})
+        await asyncio.sleep(random.uniform(2, 5))
+
+
+async def game_user(conn, rec, profiles, stop):
+    while time.monotonic() < stop:
+        await rec.call(conn, 'game', 'GET /api/profiles', 'GET', '/api/profiles')
+        await asyncio.sleep(random.uniform(3, 8))
+
+
+async def reading_user(conn, rec, profile, stop, last_written, full_put=False):
+    """Answers every ~1.2 s on average; bursts of quick taps share one save."""
+    profile = json.loads(json.dumps(profile))
+    seq = 0
+    while time.monotonic() < stop:
+        seq += 1
+        profile['stars'] += 1
+        profile['loadtestSeq'] = seq
+        gap = random.expovariate(1 / 1.2)
+        if gap < DEBOUNCE_S:
+            await asyncio.sleep(gap)
+            continue
+        await asyncio.sleep(DEBOUNCE_S)
+        path = f"/api/profiles/{profile['id']}"
+        if full_put:
+            saved = await rec.call(conn, 'reading', 'PUT /api/profiles/:id', 'PUT', path, profile)
+        else:
+            saved = await rec.call(conn, 'reading', 'PATCH /api/profiles/:id', 'PATCH', path,
+                                   {'stars': profile['stars'], 'loadtestSeq': seq})
+        if saved is not None:
+            last_written[profile['id']] = seq
+        await asyncio.sleep(gap - DEBOUNCE_S)
+
+
+async def run_level(base_url, users, mix, profiles, duration, full_put=False):
+    rec = Recorder()
+    last_written = {}
+    stop = time.monotonic() + duration
+    kinds = random.choices(list(mix), weights=list(mix.values()), k=users)
+    readers = iter(profiles)
+    conns, tasks = [], []
+    for kind in kinds:
+        conn = Connection(base_url)
+        conns.append(conn)
+        if kind == 'reading':
+            profile = next(readers, None)
+            if profile is None:
+                continue
+            tasks.append(reading_user(conn, rec, profile, stop, last_written, full_put))
+        elif kind == 'game':
+            tasks.append(game_user(conn, rec, profiles, stop))
+        else:
+            tasks.append(marketplace_user(conn, rec, profiles, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    check = Connection(base_url)
+    lost = 0
+    for profile_id, seq in last_written.items():
+        _, stored = await check.request('GET', f"/api/profiles/{profile_id}")
+        if not stored or stored.get('loadtestSeq') != seq:
+            lost += 1
+    for conn in conns + [check]:
+        await conn.close()
+    return rec, elapsed, lost, len(last_written)
+
+
+def report(users, rec, elapsed, lost, writers):
+    rows = sorted(set(rec.latencies) | set(rec.errors), key=lambda k: (k[1], k[0]))
+    total = sum(len(v) for v in rec.latencies.values())
+    print(f"\n  {users} users: {total / elapsed:8.1f} req/s total, "
+          f"lost updates {lost}/{writers}")
+    print(f"    {'endpoint':<28} {'traffic':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'body B':>8} {'errors':>7}")
+    summary = {}
+    for kind, endpoint in rows:
+        values = rec.latencies.get((kind, endpoint)) or [0.0]
+        sent = len(rec.latencies.get((kind, endpoint), []))
+        stats = {
+            'rps': round(sent / elapsed, 2),
+            'p50_ms': round(percentile(values, 50) * 1000, 1),
+            'p95_ms': round(percentile(values, 95) * 1000, 1),
+            'p99_ms': round(percentile(values, 99) * 1000, 1),
+            'body_bytes': round(rec.body_bytes.get((kind, endpoint), 0) / max(sent, 1)),
+            'errors': rec.errors.get((kind, endpoint), 0),
+        }
+        summary[f"{kind} {endpoint}"] = stats
+        print(f"    {endpoint:<28} {kind:<12} {stats['rps']:8.1f} {stats['p50_ms']:8.1f} "
+              f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f} {stats['body_bytes']:8d} "
+              f"{stats['errors']:7d}")
+    return {'users': users, 'rps': round(total / elapsed, 2), 'lost_updates': lost,
+            'writers': writers, 'endpoints': summary}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown traffic kind {kind!r}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+async def main_async(args):
+    profiles = [loadtest_profile(i) for i in range(args.profiles)]
+    with LocalServer(profiles=profiles) as server:
+        base_url = server.url
+        print(f"Load test against {base_url}: {args.profiles} profiles, "
+              f"{args.duration:.0f}s per level, mix {args.mix}")
+        print("=" * 70)
+        levels = []
+        for users in args.levels:
+            rec, elapsed, lost, writers = await run_level(base_url, users, args.mix, profiles,
+                                                          args.duration, args.full_put)
+            levels.append(report(users, rec, elapsed, lost, writers))
+        print("=" * 70)
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', default='1,5,10,25,50',
+                        type=lambda s: [int(x) for x in s.split(',')],
+                        help='comma-separated virtual user counts')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds per level')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='traffic weights, e.g. marketplace=1,game=2,reading=4')
+    parser.add_argument('--profiles', type=int, default=50,
+                        help='seeded profiles; each reading user writes its own')
+    parser.add_argument('--full-put', action='store_true',
+                        help='reading users PUT the whole profile instead of a merge patch')
+    parser.add_argument('--json', help='also write the per-level results here')
+    args = parser.parse_args(argv)
+
+    levels = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(levels, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Answer oracle for Number Racing.
+
+Opened with ``?test=1``, number-racing.tsx publishes the current task
+(visual, options, correct) plus screen, learningStage, raceProgress and streak
+on ``window.__numberRacing``. ``RaceOracle`` reads it to click the right (or a
+deliberately wrong) option, so reaching a learning stage or the finish screen
+takes the minimum number of clicks and no 🙈 animations.
+
+    page.goto(race_url())
+    oracle = RaceOracle(page)
+    oracle.start()
+    oracle.reach_stage(4)
+"""
+from urllib.parse import urlencode
+
+from . import config
+from .waits import Waiter
+
+ANSWER_BUTTONS = '.grid.grid-cols-3 button'
+
+# The hook and the rendered buttons describe the same task. The hook is set in
+# a layout effect, so it never lags the DOM by more than one commit.
+HOOK_READY = """() => {
+    const h = window.__numberRacing;
+    if (!h || h.screen !== 'race' || !h.task) return false;
+    const buttons = document.querySelectorAll('.grid.grid-cols-3 button');
+    if (buttons.length !== h.task.options.length) return false;
+    return h.task.options.every((o, i) => buttons[i].textContent.trim() === String(o.display));
+}"""
+
+# Each correct answer adds 18% progress, so 6 of them finish a race.
+CORRECT_PER_RACE = 6
+
+
+def race_url(profile_id=None, **params):
+    """URL of the racing page with the test hook enabled."""
+    query = {'test': '1', **params}
+    if profile_id is not False:
+        query['profile'] = profile_id or config.PROFILE_ID
+    return f"/games-number-racing.html?{urlencode(query)}"
+
+
+class RaceOracle:
+    """Drives a Number Racing page using the ``?test=1`` hook."""
+
+    def __init__(self, page, waiter=None):
+        self.page = page
+        self.waiter = waiter or Waiter(page)
+        self.clicks = 0
+
+    def state(self):
+        return self.page.evaluate("() => window.__numberRacing || null")
+
+    def task(self):
+        """Current task once the option buttons are rendered for it."""
+        self.waiter.until(HOOK_READY)
+        return self.state()['task']
+
+    def start(self):
+        """Start a race from the menu or the finish/failed screen."""
+        self.waiter.until("""() => window.__numberRacing
+            && ['menu', 'finish', 'failed'].includes(window.__numberRacing.screen)""")
+        self.page.locator('button:has-text("▶️")').first.click()
+        self.clicks += 1
+        self.waiter.until('race_task', legacy_ms=2000)
+
+    def option_index(self, correct=True):
+        task = self.task()
+        for i, opt in enumerate(task['options']):
+            if (opt['value'] == task['correct']) == correct:
+                return i
+        raise AssertionError(f"task has no {'correct' if correct else 'wrong'} option: {task}")
+
+    def answer(self, correct=True):
+        """Click the correct (or a wrong) option and wait for the feedback to clear."""
+        index = self.option_index(correct)
+        self.page.locator(ANSWER_BUTTONS).nth(index).click(force=True)
+        self.clicks += 1
+        self.waiter.until('answer_feedback')
+        self.waiter.until('feedback_settled')
+        return index
+
+    def finish_race(self, max_answers=CORRECT_PER_RACE * 2):
+        """Answer correctly until the finish screen; returns answers given."""
+        for answered in range(max_answers):
+            if self.state()['screen'] == 'finish':
+                return answered
+            self.answer(True)
+            if self.page.evaluate("() => window.__numberRacing.raceProgress >= 100"):
+                self.waiter.until("() => window.__numberRacing.screen === 'finish'")
+                return answered + 1
+        raise AssertionError(f"race not finished after {max_answers} correct answers")
+
+    def reach_stage(self, stage, max_answers=60):
+        """Answer correctly (starting new races as needed) until ``stage``."""
+        answered = 0
+        while self.state()['learningStage'] < stage:
+            if answered >= max_answers:
+                raise AssertionError(f"stage {stage} not reached after {max_answers} answers")
+            screen = self.state()['screen']
+            if screen in ('menu', 'finish', 'failed'):
+                self.start()
+                continue
+            if screen == 'race' and self.state()['raceProgress'] >= 100:
+                self.waiter.until("() => window.__numberRacing.screen === 'finish'")
+                continue
+            self.answer(True)
+            answered += 1
+        return answered
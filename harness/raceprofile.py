@@ -0,0 +1,234 @@
+"""CPU profile and frame timeline of a scripted Number Racing race.
+
+For the "the race lags" reports: opens games-number-racing.html with
+``?test=1&dev=1`` and attaches a Chrome DevTools Protocol session. ``dev=1``
+makes game-loader.js compile the .tsx in the page, so function names are not
+minified and the profile shows ``number-racing.tsx`` with the source line
+numbers. It then plays the race from test_pause_feature.py and
+test_finish_screen.py through ``RaceOracle``:
+
+    start -> 3 correct answers -> pause (--pause-ms) -> resume -> finish
+
+While the race runs, the CDP sampling profiler records (``Profiler.start``,
+sampling every ``--interval-us``). An init script records every
+requestAnimationFrame interval and the ``longtask`` entries (tasks over
+50 ms). The report shows:
+
+    cpu        sampled time split into game code, React, GC, idle and the rest
+    functions  top self-time functions in number-racing.tsx (``--source``)
+    frames     frame count, median/p95/max interval; frames over the 16.7 ms
+               budget (plus ``--jitter-ms`` of vsync jitter) are flagged with
+               the long tasks that overlap them
+
+``--out`` saves the raw profile as a .cpuprofile that the DevTools Performance
+panel opens directly.
+
+    python -m harness.raceprofile
+    python -m harness.raceprofile --races 3 --top 25 --out race.cpuprofile
+"""
+import argparse
+import contextlib
+import json
+import sys
+from collections import defaultdict
+
+from playwright.sync_api import sync_playwright
+
+from . import config
+from .oracle import RaceOracle, race_url
+from .server import local_app
+from .stats import median, percentile
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+FRAME_BUDGET_MS = 1000 / 60
+
+# Installed before any page script: every rAF interval plus long tasks, both
+# on the performance.now() clock so Python can cut out the race window.
+PROBE = """(() => {
+    const perf = window.__racePerf = { frames: [], longTasks: [] };
+    let last = null;
+    const tick = now => {
+        if (last !== null) perf.frames.push([last, now - last]);
+        last = now;
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+    try {
+        new PerformanceObserver(list => {
+            for (const e of list.getEntries()) perf.longTasks.push([e.startTime, e.duration]);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {}
+})();"""
+
+# Built-in profiler nodes, reported as their own categories
+SPECIAL = {'(idle)': 'idle', '(garbage collector)': 'gc', '(program)': 'program', '(root)': 'program'}
+
+
+def self_times(profile):
+    """``{(function, url, line): self ms}`` from a CDP ``Profiler.Profile``.
+
+    Sample ``i`` is charged the gap up to sample ``i + 1``: ``timeDeltas[i]``
+    is the gap *before* sample ``i``.
+    """
+    frames = {node['id']: node['callFrame'] for node in profile['nodes']}
+    samples, deltas = profile.get('samples', []), profile.get('timeDeltas', [])
+    totals = defaultdict(float)
+    for i, node_id in enumerate(samples):
+        gap_us = deltas[i + 1] if i + 1 < len(deltas) else 0
+        frame = frames[node_id]
+        key = (frame['functionName'] or '(anonymous)', frame['url'], frame['lineNumber'] + 1)
+        totals[key] += gap_us / 1000
+    return totals
+
+
+def categorize(totals, source):
+    """Split sampled time into game code, React, GC, idle and the rest."""
+    split = defaultdict(float)
+    for (name, url, _), ms in totals.items():
+        if name in SPECIAL and not url:
+            split[SPECIAL[name]] += ms
+        elif source in url:
+            split['game'] += ms
+        elif 'react' in url:
+            split['react'] += ms
+        else:
+            split['other'] += ms
+    return dict(split)
+
+
+def long_frames(frames, long_tasks, limit_ms):
+    """Frames longer than ``limit_ms``, each with the long tasks overlapping it."""
+    flagged = []
+    for start, duration in frames:
+        if duration <= limit_ms:
+            continue
+        end = start + duration
+        overlapping = [round(d, 1) for s, d in long_tasks if s < end and s + d > start]
+        flagged.append({'at_ms': round(start, 1), 'ms': round(duration, 1), 'long_tasks_ms': overlapping})
+    return flagged
+
+
+def play_race(page, pause_ms):
+    """The flow of test_pause_feature.py + test_finish_screen.py, without sleeps."""
+    oracle = RaceOracle(page)
+    oracle.start()
+    for _ in range(3):
+        oracle.answer(True)
+    page.locator('button:has-text("⏸️")').first.click()
+    oracle.waiter.until('pause_menu')
+    page.wait_for_timeout(pause_ms)
+    page.locator('button:has-text("Продолжить")').first.click()
+    oracle.waiter.until('race_resumed')
+    oracle.finish_race()
+    oracle.waiter.until('finish')
+
+
+def run(base_url, races=1, pause_ms=1000, interval_us=100, headless=True):
+    """Return ``(profile, frames, long_tasks)`` for the recorded window."""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            context = browser.new_context(base_url=base_url)
+            context.add_init_script(PROBE)
+            page = context.new_page()
+            page.goto(race_url(dev='1'), timeout=60000)
+            cdp = context.new_cdp_session(page)
+            cdp.send('Profiler.enable')
+            cdp.send('Profiler.setSamplingInterval', {'interval': interval_us})
+
+            started = page.evaluate("() => performance.now()")
+            cdp.send('Profiler.start')
+            for i in range(races):
+                play_race(page, pause_ms)
+                print(f"  race {i + 1}/{races} done", flush=True)
+            profile = cdp.send('Profiler.stop')['profile']
+            stopped = page.evaluate("() => performance.now()")
+
+            perf = page.evaluate("() => window.__racePerf")
+            frames = [f for f in perf['frames'] if started <= f[0] <= stopped]
+            long_tasks = [t for t in perf['longTasks'] if started <= t[0] <= stopped]
+        finally:
+            browser.close()
+    return profile, frames, long_tasks
+
+
+def report(profile, frames, long_tasks, source, top, jitter_ms):
+    totals = self_times(profile)
+    split = categorize(totals, source)
+    sampled = sum(split.values()) or 1
+    busy = sampled - split.get('idle', 0)
+
+    print(f"\n  CPU: {sampled:,.0f} ms sampled, {busy:,.0f} ms busy")
+    for name in ('game', 'react', 'gc', 'program', 'other', 'idle'):
+        print(f"    {name:<10} {split.get(name, 0):9.1f} ms  {split.get(name, 0) / sampled:6.1%}")
+
+    game = sorted(((k, v) for k, v in totals.items() if source in k[1]), key=lambda kv: -kv[1])[:top]
+    print(f"\n  Top self time in {source}:")
+    functions = []
+    for (name, url, line), ms in game:
+        print(f"    {ms:9.1f} ms  {ms / max(busy, 1e-9):6.1%}  {name}  (line {line})")
+        functions.append({'function': name, 'line': line, 'self_ms': round(ms, 2)})
+    if not game:
+        print(f"    [FAIL] no samples from {source}; was the page opened with ?dev=1?")
+
+    limit = FRAME_BUDGET_MS + jitter_ms
+    flagged = long_frames(frames, long_tasks, limit)
+    durations = [d for _, d in frames] or [0.0]
+    print(f"\n  Frames: {len(frames)}, median {median(durations):.1f} ms, "
+          f"p95 {percentile(durations, 95):.1f} ms, max {max(durations):.1f} ms")
+    print(f"  Long tasks (>50 ms): {len(long_tasks)}, "
+          f"total {sum(d for _, d in long_tasks):.0f} ms")
+    status = '[OK]' if not flagged else '[FAIL]'
+    print(f"  {status} {len(flagged)} frames over {limit:.1f} ms")
+    for frame in sorted(flagged, key=lambda f: -f['ms'])[:top]:
+        tasks = f", long tasks {frame['long_tasks_ms']} ms" if frame['long_tasks_ms'] else ''
+        print(f"    {frame['ms']:7.1f} ms at {frame['at_ms'] / 1000:8.2f} s{tasks}")
+
+    return {
+        'cpu_ms': {k: round(v, 1) for k, v in split.items()},
+        'functions': functions,
+        'frames': {'count': len(frames), 'median_ms': round(median(durations), 2),
+                   'p95_ms': round(percentile(durations, 95), 2), 'max_ms': round(max(durations), 2),
+                   'limit_ms': round(limit, 2), 'long': flagged},
+        'long_tasks_ms': [round(d, 1) for _, d in long_tasks],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--races', type=int, default=1)
+    parser.add_argument('--pause-ms', type=int, default=1000, help='how long the race stays paused')
+    parser.add_argument('--interval-us', type=int, default=100, help='CPU sampling interval')
+    parser.add_argument('--source', default='number-racing', help='script URL part counted as game code')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--jitter-ms', type=float, default=2.0,
+                        help='slack over the 16.7 ms frame budget before a frame is flagged')
+    parser.add_argument('--out', help='write the raw profile here (.cpuprofile for DevTools)')
+    parser.add_argument('--json', help='also write the summary here')
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--base-url', default=config.APP_URL)
+    args = parser.parse_args(argv)
+
+    app = contextlib.nullcontext(args.base_url) if args.base_url else local_app()
+    with app as base_url:
+        print(f"Profiling {args.races} race(s) against {base_url}")
+        print("=" * 70)
+        profile, frames, long_tasks = run(base_url, args.races, args.pause_ms, args.interval_us,
+                                          headless=config.HEADLESS and not args.headed)
+        summary = report(profile, frames, long_tasks, args.source, args.top, args.jitter_ms)
+        print("=" * 70)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(profile, f)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
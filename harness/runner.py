@@ -0,0 +1,234 @@
+"""Parallel runner for Playwright scenarios.
+
+The legacy test_*.py scripts each start their own Playwright driver and
+Chromium, often headful with slow_mo, and have to be run one after another.
+The runner keeps one long-lived browser per worker thread, hands every
+scenario a fresh BrowserContext (separate cookies, localStorage and cache)
+and drains a shared queue of scenarios on N workers.
+
+Playwright's sync API objects are bound to the thread that created them, so
+the "shared" browser is one Chromium per worker that is reused by every
+scenario the worker picks up; launch cost is paid N times, not once per
+scenario.
+
+Unless APP_URL / --base-url is given, every worker also starts its own
+LocalServer (server.js on a free port with a throwaway profiles.json), so
+scenarios never share server state and never touch production.
+
+Screenshots taken by the scenarios are checked against the visual
+references after the run (harness/visual.py); ``--update-visual`` records them.
+
+Usage:
+    python -m harness                 # all scenarios, one worker per CPU
+    python -m harness -w 4 -k race    # 4 workers, names containing "race"
+    python -m harness --async         # coroutine scenarios, see async_driver.py
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from playwright.sync_api import sync_playwright
+
+from . import config
+from .server import LocalServer
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+
+@dataclass
+class Scenario:
+    """A named test flow; ``fn`` receives an isolated BrowserContext."""
+    name: str
+    fn: Callable
+    tags: tuple = ()
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    passed: bool
+    seconds: float
+    worker: int
+    error: Optional[str] = None
+    notes: Dict[str, object] = field(default_factory=dict)
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name=None, tags=()):
+    """Register a function as a runner scenario."""
+    def decorator(fn):
+        key = name or fn.__name__
+        SCENARIOS[key] = Scenario(key, fn, tuple(tags))
+        return fn
+    return decorator
+
+
+class BrowserPool:
+    """Runs scenarios on ``workers`` threads, one reusable Chromium each."""
+
+    def __init__(self, workers=None, headless=None, slow_mo=0, base_url=None,
+                 context_options=None):
+        self.workers = workers or config.WORKERS
+        self.headless = config.HEADLESS if headless is None else headless
+        self.slow_mo = slow_mo
+        self.base_url = config.APP_URL if base_url is None else base_url
+        self.context_options = context_options or {}
+
+    def run(self, scenarios: List[Scenario]) -> List[ScenarioResult]:
+        pending = queue.Queue()
+        for sc in scenarios:
+            pending.put(sc)
+
+        results: List[ScenarioResult] = []
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self._worker, args=(i, pending, results, lock),
+                             name=f'harness-worker-{i}', daemon=True)
+            for i in range(min(self.workers, len(scenarios)) or 1)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def _worker(self, index, pending, results, lock):
+        with contextlib.ExitStack() as stack:
+            base_url = self.base_url or stack.enter_context(LocalServer()).url
+            p = stack.enter_context(sync_playwright())
+            browser = p.chromium.launch(headless=self.headless, slow_mo=self.slow_mo)
+            stack.callback(browser.close)
+            while True:
+                try:
+                    sc = pending.get_nowait()
+                except queue.Empty:
+                    break
+                result = self._run_one(browser, base_url, sc, index)
+                with lock:
+                    results.append(result)
+                    _print_result(result)
+
+    def _run_one(self, browser, base_url, sc, index):
+        context = browser.new_context(base_url=base_url, **self.context_options)
+        result = ScenarioResult(sc.name, False, 0.0, index)
+        started = time.perf_counter()
+        try:
+            notes = sc.fn(context)
+            result.passed = True
+            if isinstance(notes, dict):
+                result.notes = notes
+        except Exception as e:
+            result.error = f'{type(e).__name__}: {e}'
+            if os.environ.get('HARNESS_TRACEBACK'):
+                traceback.print_exc()
+        finally:
+            result.seconds = time.perf_counter() - started
+            context.close()
+        return result
+
+
+def _print_result(result):
+    mark = '[OK]  ' if result.passed else '[FAIL]'
+    line = f"  {mark} {result.name:<32} {result.seconds:7.2f}s  (worker {result.worker})"
+    if result.error:
+        line += f"\n         {result.error[:200]}"
+    print(line, flush=True)
+
+
+def print_report(results, wall_seconds):
+    print("\n" + "=" * 70)
+    print("SCENARIO TIMINGS (slowest first):")
+    print("=" * 70)
+    for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+        status = 'ok' if r.passed else 'FAIL'
+        saved = r.notes.get('saved_s')
+        extra = f"  saved {saved:.2f}s vs fixed sleeps" if saved is not None else ''
+        print(f"  {r.name:<36} {r.seconds:8.2f}s  {status}{extra}")
+    serial = sum(r.seconds for r in results)
+    failed = [r for r in results if not r.passed]
+    total_saved = sum(r.notes.get('saved_s', 0) for r in results)
+    print("-" * 70)
+    print(f"  Scenarios: {len(results)}   Failed: {len(failed)}")
+    if total_saved:
+        print(f"  Saved by state waits: {total_saved:.2f}s")
+    print(f"  Sum of scenario time: {serial:.2f}s")
+    print(f"  Wall-clock time:      {wall_seconds:.2f}s")
+    if wall_seconds > 0:
+        print(f"  Parallel speedup:     {serial / wall_seconds:.2f}x")
+    print("=" * 70)
+
+
+def select(pattern=None, tags=None):
+    picked = list(SCENARIOS.values())
+    if pattern:
+        picked = [s for s in picked if pattern in s.name]
+    if tags:
+        picked = [s for s in picked if set(tags) & set(s.tags)]
+    return picked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-w', '--workers', type=int, default=config.WORKERS)
+    parser.add_argument('-k', dest='pattern', help='run scenarios whose name contains this')
+    parser.add_argument('-t', '--tag', action='append', dest='tags')
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--slow-mo', type=int, default=0)
+    parser.add_argument('--base-url', default=config.APP_URL)
+    parser.add_argument('--async', action='store_true', dest='use_async',
+                        help='run the asyncio scenarios on a single browser')
+    parser.add_argument('-c', '--concurrency', type=int, default=None,
+                        help='scenarios in flight at once with --async')
+    parser.add_argument('--list', action='store_true')
+    parser.add_argument('--update-visual', action='store_true',
+                        help='record the screenshots as the new visual references')
+    args = parser.parse_args(argv)
+
+    if args.use_async:
+        from . import async_driver, async_scenarios  # noqa: F401
+        picked = async_driver.select(args.pattern, args.tags)
+    else:
+        from . import scenarios  # noqa: F401  (registers the built-in scenarios)
+        picked = select(args.pattern, args.tags)
+
+    if args.list:
+        for s in picked:
+            print(f"{s.name:<36} {','.join(s.tags)}")
+        return 0
+    if not picked:
+        print("No scenarios selected")
+        return 1
+
+    os.makedirs(config.SCREENSHOT_DIR, exist_ok=True)
+    headless = False if args.headed else None
+    if args.use_async:
+        pool = async_driver.AsyncBrowserPool(concurrency=args.concurrency, headless=headless,
+                                             base_url=args.base_url)
+        mode = f"{pool.concurrency} concurrent coroutines"
+    else:
+        pool = BrowserPool(workers=args.workers, headless=headless,
+                           slow_mo=args.slow_mo, base_url=args.base_url)
+        mode = f"{pool.workers} workers"
+    target = pool.base_url or 'a local server per worker'
+    print(f"Running {len(picked)} scenarios on {mode} against {target}")
+    started = time.perf_counter()
+    if args.use_async:
+        results = asyncio.run(pool.run(picked))
+    else:
+        results = pool.run(picked)
+    print_report(results, time.perf_counter() - started)
+    from . import visual  # not at import time: python -m harness.visual imports the package
+    visual_ok = visual.check_captures(update=args.update_visual)
+    return 0 if all(r.passed for r in results) and visual_ok else 1
@@ -0,0 +1,137 @@
+"""Built-in scenarios for ``python -m harness``.
+
+Each scenario is a port of one of the legacy test_*.py flows. They receive a
+fresh BrowserContext whose base_url points at the server under test, so URLs
+below are relative. Waits go through ``Waiter`` and return its summary so the
+runner can report the time saved against the legacy fixed sleeps.
+"""
+import json
+
+from . import config, visual
+from .oracle import ANSWER_BUTTONS, RaceOracle, race_url
+from .runner import scenario
+from .waits import Waiter
+
+GAME_PAGES = {
+    'number_racing': '/games-number-racing.html',
+    'reading': '/games-reading.html',
+    'number_island': '/games-number-island.html',
+}
+
+
+def _shot(page, name):
+    # Checked against visual_baseline.json after the run; only a changed
+    # screenshot is written to disk (harness/visual.py)
+    visual.capture(name, page.screenshot(full_page=True))
+
+
+def _collect_errors(page):
+    errors = []
+    page.on('pageerror', lambda err: errors.append(str(err)))
+    return errors
+
+
+@scenario('api_health', tags=('api', 'smoke'))
+def api_health(context):
+    response = context.request.get('/api/health')
+    assert response.ok, f"/api/health returned {response.status}"
+    assert response.json().get('status') == 'ok'
+
+
+@scenario('api_profiles', tags=('api', 'smoke'))
+def api_profiles(context):
+    response = context.request.get('/api/profiles')
+    assert response.ok, f"/api/profiles returned {response.status}"
+    profiles = response.json()
+    assert isinstance(profiles, list)
+    return {'profiles': len(profiles)}
+
+
+@scenario('marketplace_home', tags=('ui', 'smoke'))
+def marketplace_home(context):
+    page = context.new_page()
+    w = Waiter(page)
+    errors = _collect_errors(page)
+    page.goto('/', timeout=30000)
+    w.until('marketplace', legacy_ms=2000)
+    _shot(page, 'runner_marketplace_home')
+    assert not errors, f"JavaScript errors: {errors[:3]}"
+    return w.summary()
+
+
+def _game_page_scenario(key, path):
+    @scenario(f'game_load_{key}', tags=('ui', 'games', 'smoke'))
+    def load_game(context):
+        page = context.new_page()
+        w = Waiter(page)
+        errors = _collect_errors(page)
+        page.goto(f"{path}?profile={config.PROFILE_ID}", timeout=30000)
+        w.until('react_mounted', legacy_ms=3000)
+        _shot(page, f'runner_{key}')
+        body = page.locator('body').text_content() or ''
+        assert len(body.strip()) >= 20, f"{path} looks blank ({len(body.strip())} chars)"
+        assert not errors, f"JavaScript errors: {errors[:3]}"
+        return w.summary()
+    return load_game
+
+
+for _key, _path in GAME_PAGES.items():
+    _game_page_scenario(_key, _path)
+
+
+def _open_race(context):
+    page = context.new_page()
+    w = Waiter(page)
+    page.goto(f"/games-number-racing.html?profile={config.PROFILE_ID}", timeout=30000)
+    w.until('menu', legacy_ms=3000)
+    page.locator('button:has-text("▶️")').first.click()
+    w.until('race_task', legacy_ms=2000)
+    return page, w
+
+
+@scenario('race_pause_resume', tags=('ui', 'race'))
+def race_pause_resume(context):
+    page, w = _open_race(context)
+
+    for _ in range(3):
+        page.locator(ANSWER_BUTTONS).first.click(force=True)
+        w.until('answer_feedback')
+        w.until('feedback_settled', legacy_ms=1200)
+
+    page.locator('button:has-text("⏸️")').first.click()
+    w.until('pause_menu', legacy_ms=1000)
+    page.locator('button:has-text("Продолжить")').first.click()
+    w.until('race_resumed', legacy_ms=1000)
+
+    # The auto-save interval is 5 s; there is nothing to short-circuit except
+    # the legacy script's extra second of slack.
+    w.until('race_autosaved', legacy_ms=6000, timeout=8000)
+    saved = page.evaluate("localStorage.getItem('raceInProgress')")
+
+    page.locator('button:has-text("⏸️")').first.click()
+    w.until('pause_menu', legacy_ms=1000)
+    page.locator('button:has-text("Выйти в меню")').first.click()
+    w.until('continue_dialog', legacy_ms=2000)
+    return {'saved_progress': json.loads(saved).get('progress', 0), **w.summary()}
+
+
+@scenario('race_finish', tags=('ui', 'race'))
+def race_finish(context):
+    page = context.new_page()
+    page.goto(race_url(), timeout=30000)
+    oracle = RaceOracle(page)
+    oracle.start()
+    answers = oracle.finish_race()
+    oracle.waiter.until('finish', legacy_ms=3000)
+    return {'answers': answers, 'clicks': oracle.clicks, **oracle.waiter.summary()}
+
+
+@scenario('race_reach_stage_4', tags=('ui', 'race'))
+def race_reach_stage_4(context):
+    page = context.new_page()
+    page.goto(race_url(), timeout=30000)
+    oracle = RaceOracle(page)
+    oracle.start()
+    answers = oracle.reach_stage(4)
+    assert oracle.task() is not None
+    return {'answers': answers, 'clicks': oracle.clicks}
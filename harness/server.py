@@ -0,0 +1,176 @@
+"""Hermetic local instance of server/server.js for tests.
+
+``LocalServer`` copies nothing from production: it writes a throwaway
+profiles.json into a temp directory, starts ``node server/server.js`` on a
+free port with ``PROFILES_FILE`` pointing at it (the server migrates it into
+per-profile files next to it), waits for ``/api/health`` and removes
+everything on exit. Every worker can own one, so parallel runs never
+share state.
+
+    with LocalServer() as server:
+        page.goto(f"{server.url}/games-number-racing.html?profile={PROFILE_ID}")
+"""
+import contextlib
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from . import config
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_JS = os.path.join(REPO_ROOT, 'server', 'server.js')
+
+
+def make_profile(profile_id, name, character='fox', **extra):
+    """Build a profile record in the shape server.js creates."""
+    profile = {
+        'id': str(profile_id),
+        'name': name,
+        'character': character,
+        'stars': 0,
+        'totalStars': 0,
+        'gameProgress': {},
+        'stats': {},
+        'createdAt': '2024-01-01T00:00:00.000Z',
+    }
+    profile.update(extra)
+    return profile
+
+
+# The game scenarios open ?profile=PROFILE_ID, so it is always seeded.
+DEFAULT_PROFILES = [
+    make_profile(config.PROFILE_ID, 'Тест', 'fox'),
+    make_profile('1000000000001', 'Маша', 'bunny', stars=12, totalStars=12),
+]
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class ServerStartError(RuntimeError):
+    pass
+
+
+class LocalServer:
+    """A private server.js process backed by a temporary data file."""
+
+    def __init__(self, profiles=None, port=None, node=None, env=None,
+                 startup_timeout=15.0):
+        self.profiles = DEFAULT_PROFILES if profiles is None else profiles
+        self.port = port
+        self.node = node or os.environ.get('NODE', 'node')
+        self.extra_env = env or {}
+        self.startup_timeout = startup_timeout
+        self.tmpdir = None
+        self.process = None
+        self._log = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def data_file(self):
+        return os.path.join(self.tmpdir, 'profiles.json')
+
+    def start(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='edu-games-')
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            json.dump({'profiles': list(self.profiles), 'currentProfileId': None}, f,
+                      ensure_ascii=False)
+        self.port = self.port or free_port()
+
+        env = dict(os.environ, PORT=str(self.port), PROFILES_FILE=self.data_file)
+        env.update(self.extra_env)
+        self._log = open(os.path.join(self.tmpdir, 'server.log'), 'w+', encoding='utf-8')
+        self.process = subprocess.Popen([self.node, SERVER_JS], cwd=REPO_ROOT, env=env,
+                                        stdout=self._log, stderr=subprocess.STDOUT)
+        try:
+            self._wait_healthy()
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def _wait_healthy(self):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise ServerStartError(
+                    f"server.js exited with code {self.process.returncode}:\n{self.log()}")
+            try:
+                with urllib.request.urlopen(f"{self.url}/api/health", timeout=1) as r:
+                    if r.status == 200:
+                        return
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.05)
+        raise ServerStartError(f"server.js not healthy after {self.startup_timeout}s:\n{self.log()}")
+
+    def log(self):
+        if not self._log:
+            return ''
+        self._log.flush()
+        self._log.seek(0)
+        return self._log.read()
+
+    def request(self, method, path, body=None):
+        """Small JSON client for seeding and assertions."""
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(f"{self.url}{path}", data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=10) as r:
+            return json.loads(r.read().decode('utf-8') or 'null')
+
+    def seed(self, *profiles):
+        """Add profiles through the API; ids are assigned by the server."""
+        created = []
+        for p in profiles:
+            new = self.request('POST', '/api/profiles',
+                               {'name': p['name'], 'character': p.get('character', 'fox')})
+            extra = {k: v for k, v in p.items() if k not in ('id', 'name', 'character')}
+            if extra:
+                new = self.request('PUT', f"/api/profiles/{new['id']}", extra)
+            created.append(new)
+        return created
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        if self._log:
+            self._log.close()
+            self._log = None
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            self.tmpdir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextlib.contextmanager
+def local_app(**kwargs):
+    """Yield ``APP_URL`` if it is set, otherwise start a hermetic server."""
+    if config.APP_URL:
+        yield config.APP_URL
+        return
+    with LocalServer(**kwargs) as server:
+        yield server.url
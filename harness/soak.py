@@ -0,0 +1,212 @@
+"""Memory-leak soak test: hundreds of Number Racing races in one page.
+
+number-racing.tsx starts intervals (auto-save, music) and many setTimeouts
+across its start, pause, continue and finish paths. A timer that is never
+cleared, or a closure that keeps old state alive, costs nothing in one race
+and adds up over a long session. This plays ``--races`` races back to back in
+one page through ``RaceOracle``. Every race is paused and resumed, and every
+``--exit-every``-th race also leaves to the menu from the pause menu and comes
+back through the "Продолжить гонку?" dialog.
+
+After each race, over the same CDP session:
+
+    heap_mb      JS heap in use after HeapProfiler.collectGarbage
+    timers       live setTimeout/setInterval ids (an init script wraps the
+                 timer functions; a timeout stops counting once it fires)
+    intervals    the setInterval part of ``timers``
+    nodes        DOM nodes (Memory.getDOMCounters)
+    listeners    JS event listeners (Memory.getDOMCounters)
+
+The first ``--warmup`` races are skipped (JIT, caches, first sounds). The
+run fails when, over the rest:
+
+    heap         the least-squares slope exceeds ``--max-heap-kb`` per race
+    timers       live timers ever exceed the warmup maximum by ``--timer-slack``
+                 or keep climbing (slope over ``--max-timer-slope`` per race)
+
+    python -m harness.soak                      # 200 races
+    python -m harness.soak --races 50 --json soak.json
+"""
+import argparse
+import contextlib
+import json
+import sys
+
+from playwright.sync_api import sync_playwright
+
+from . import config
+from .oracle import RaceOracle, race_url
+from .server import local_app
+from .stats import slope
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+# Installed before any page script. Only function callbacks are tracked;
+# clearTimeout and clearInterval are interchangeable in browsers.
+TIMER_PROBE = """(() => {
+    const live = new Map();
+    const { setTimeout: st, setInterval: si, clearTimeout: ct, clearInterval: ci } = window;
+    window.setTimeout = function(fn, ...rest) {
+        if (typeof fn !== 'function') return st.call(window, fn, ...rest);
+        let id;
+        id = st.call(window, function() { live.delete(id); return fn.apply(this, arguments); }, ...rest);
+        live.set(id, 'timeout');
+        return id;
+    };
+    window.setInterval = function(fn, ...rest) {
+        const id = si.call(window, fn, ...rest);
+        if (typeof fn === 'function') live.set(id, 'interval');
+        return id;
+    };
+    window.clearTimeout = function(id) { live.delete(id); return ct.call(window, id); };
+    window.clearInterval = function(id) { live.delete(id); return ci.call(window, id); };
+    window.__soakTimers = () => {
+        let intervals = 0;
+        live.forEach(kind => { if (kind === 'interval') intervals += 1; });
+        return { timers: live.size, intervals };
+    };
+})();"""
+
+METRICS = ('heap_mb', 'timers', 'intervals', 'nodes', 'listeners')
+
+
+def sample(page, cdp):
+    cdp.send('HeapProfiler.collectGarbage')
+    dom = cdp.send('Memory.getDOMCounters')
+    return {
+        'heap_mb': cdp.send('Runtime.getHeapUsage')['usedSize'] / 2**20,
+        **page.evaluate("() => window.__soakTimers()"),
+        'nodes': dom['nodes'],
+        'listeners': dom['jsEventListeners'],
+    }
+
+
+def play_race(page, oracle, leave_to_menu=False):
+    """Start (from the menu or the finish screen), pause, resume, finish."""
+    oracle.start()
+    for _ in range(2):
+        oracle.answer(True)
+    page.locator('button:has-text("⏸️")').first.click()
+    oracle.waiter.until('pause_menu')
+    if leave_to_menu:
+        page.locator('button:has-text("Выйти в меню")').first.click()
+        oracle.waiter.until('continue_dialog')
+        page.locator('button:has-text("✅ Продолжить")').first.click()
+    else:
+        page.locator('button:has-text("Продолжить")').first.click()
+    oracle.waiter.until('race_resumed')
+    oracle.finish_race()
+    oracle.waiter.until('finish')
+
+
+def run(base_url, races, exit_every=10, headless=True):
+    """Return one sample per race, plus the sample taken before the first race."""
+    samples = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            context = browser.new_context(base_url=base_url)
+            context.add_init_script(TIMER_PROBE)
+            page = context.new_page()
+            page.goto(race_url(), timeout=30000)
+            cdp = context.new_cdp_session(page)
+            cdp.send('HeapProfiler.enable')
+            oracle = RaceOracle(page)
+            oracle.waiter.until('menu')
+            samples.append(sample(page, cdp))
+            for race in range(1, races + 1):
+                play_race(page, oracle, leave_to_menu=exit_every > 0 and race % exit_every == 0)
+                samples.append(sample(page, cdp))
+                if race % 10 == 0 or race == races:
+                    s = samples[-1]
+                    print(f"  race {race:4d}/{races}: heap {s['heap_mb']:6.2f} MB, "
+                          f"timers {s['timers']:3d} ({s['intervals']} intervals), "
+                          f"nodes {s['nodes']}, listeners {s['listeners']}", flush=True)
+        finally:
+            browser.close()
+    return samples
+
+
+def analyze(samples, warmup, max_heap_kb, timer_slack, max_timer_slope):
+    """``(summary, problems)`` for the samples after ``warmup`` races."""
+    steady = samples[warmup + 1:] or samples[-1:]
+    xs = list(range(len(samples) - len(steady), len(samples)))
+    slopes = {m: slope(xs, [s[m] for s in steady]) for m in METRICS}
+    warm_timers = max(s['timers'] for s in samples[:warmup + 1])
+    peak_timers = max(s['timers'] for s in steady)
+
+    problems = []
+    heap_kb = slopes['heap_mb'] * 1024
+    if heap_kb > max_heap_kb:
+        problems.append(f"heap grows {heap_kb:.1f} KB/race (limit {max_heap_kb} KB)")
+    if peak_timers > warm_timers + timer_slack:
+        problems.append(f"live timers reached {peak_timers}, warmup max was {warm_timers}")
+    if slopes['timers'] > max_timer_slope:
+        problems.append(f"live timers grow {slopes['timers']:.3f}/race")
+
+    summary = {
+        'races': len(samples) - 1,
+        'warmup': warmup,
+        'slope_per_race': {'heap_kb': round(heap_kb, 2),
+                           **{m: round(slopes[m], 4) for m in METRICS if m != 'heap_mb'}},
+        'first': samples[0],
+        'last': samples[-1],
+        'warmup_max_timers': warm_timers,
+        'peak_timers': peak_timers,
+        'problems': problems,
+    }
+    return summary, problems
+
+
+def report(summary):
+    first, last, slopes = summary['first'], summary['last'], summary['slope_per_race']
+    print(f"\n  {summary['races']} races, slopes over races {summary['warmup'] + 1}..{summary['races']}:")
+    print(f"    heap       {first['heap_mb']:7.2f} -> {last['heap_mb']:7.2f} MB   "
+          f"{slopes['heap_kb']:+8.2f} KB/race")
+    for metric in ('timers', 'intervals', 'nodes', 'listeners'):
+        print(f"    {metric:<10} {first[metric]:7d} -> {last[metric]:7d}      {slopes[metric]:+8.3f}/race")
+    status = '[OK]' if not summary['problems'] else '[FAIL]'
+    print(f"  {status} warmup max timers {summary['warmup_max_timers']}, "
+          f"peak after warmup {summary['peak_timers']}")
+    for problem in summary['problems']:
+        print(f"    [FAIL] {problem}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--races', type=int, default=200)
+    parser.add_argument('--exit-every', type=int, default=10,
+                        help='every Nth race leaves to the menu and continues (0 = never)')
+    parser.add_argument('--warmup', type=int, default=10, help='races left out of the slopes')
+    parser.add_argument('--max-heap-kb', type=float, default=20.0,
+                        help='allowed heap growth per race after warmup')
+    parser.add_argument('--timer-slack', type=int, default=3,
+                        help='live timers allowed above the warmup maximum')
+    parser.add_argument('--max-timer-slope', type=float, default=0.02)
+    parser.add_argument('--json', help='also write the summary and every sample here')
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--base-url', default=config.APP_URL)
+    args = parser.parse_args(argv)
+    warmup = min(args.warmup, max(args.races - 2, 0))
+
+    app = contextlib.nullcontext(args.base_url) if args.base_url else local_app()
+    with app as base_url:
+        print(f"Soak: {args.races} races in one page against {base_url}")
+        print("=" * 70)
+        samples = run(base_url, args.races, args.exit_every,
+                      headless=config.HEADLESS and not args.headed)
+        summary, problems = analyze(samples, warmup, args.max_heap_kb, args.timer_slack,
+                                    args.max_timer_slope)
+        report(summary)
+        print("=" * 70)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({**summary, 'samples': samples}, f, indent=2, ensure_ascii=False)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Small statistics helpers shared by the benchmarks."""
+import math
+import statistics
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def median(values):
+    return statistics.median(values)
+
+
+def slope(xs, ys):
+    """Least-squares slope of ``ys`` over ``xs``; 0 for fewer than two points."""
+    if len(xs) < 2:
+        return 0.0
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if not var:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
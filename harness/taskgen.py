@@ -0,0 +1,229 @@
+"""Bulk benchmark and invariant check for the Number Racing task generator.
+
+Opens games-number-racing.html with ``?test=1`` (number-racing.tsx then
+publishes its generator on ``window.__numberRacingTasks``) and draws tasks in
+batches of ``--batch`` inside the page with one ``page.evaluate`` per batch.
+Every task is checked in the page:
+
+    correct answer      among the options, options distinct
+    counts              compare has 2 options, bigger/smaller 3, the rest 2-3
+    ranges              shown numbers within the stage range; answers too,
+                        except addSub (0 allowed) and sequence (answer+1 may
+                        go one past the range, as it always has)
+    arithmetic          left + right / left - right equals the answer, never
+                        negative; bigger/smaller pick the max/min; the
+                        sequence gap is the answer; count shows the answer
+    types               only the stage's task types
+
+Per stage it reports tasks/second and the distribution of task types and
+answers; stage 4 must produce both + and - and a 0 answer. ``--weak`` repeats
+the run with a weak topic so the sampler's bias is visible next to the
+unweighted numbers. UI scenarios then only need to cover rendering.
+
+    python -m harness.taskgen                    # 3 batches of 100k per stage
+    python -m harness.taskgen -n 1 --batch 20000 --weak 7
+"""
+import argparse
+import contextlib
+import json
+import sys
+
+from playwright.sync_api import sync_playwright
+
+from . import config
+from .oracle import race_url
+from .server import local_app
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+# Runs in the page: draws ``n`` tasks for a stage and checks each one.
+# Returns counters only; at most a few violations are sent back as examples.
+BATCH = """({ stage, n, weak }) => {
+    const { LEARNING_STAGES, createTaskSampler, makeTask } = window.__numberRacingTasks;
+    const { tasks: types, range: [lo, hi] } = LEARNING_STAGES[stage];
+    const weakTopics = { numbers: {}, operations: {} };
+    if (weak !== null) weakTopics.numbers[weak] = 3;
+
+    const result = { n, ms: 0, types: {}, answers: {}, ops: {}, violations: 0, examples: [] };
+    const fail = (task, why) => {
+        result.violations += 1;
+        if (result.examples.length < 5) {
+            result.examples.push({ why, visual: task.visual, options: task.options.map(o => o.value),
+                                   correct: task.correct });
+        }
+    };
+    const inRange = v => Number.isInteger(v) && v >= lo && v <= hi;
+
+    const started = performance.now();
+    const sampler = createTaskSampler(stage, weakTopics);
+    const drawn = new Array(n);
+    for (let i = 0; i < n; i++) drawn[i] = makeTask(sampler.sample());
+    result.ms = performance.now() - started;
+
+    for (const task of drawn) {
+        const { visual, options, correct } = task;
+        const values = options.map(o => o.value);
+        result.types[visual.type] = (result.types[visual.type] || 0) + 1;
+        result.answers[correct] = (result.answers[correct] || 0) + 1;
+
+        if (!types.includes(visual.type)) fail(task, 'type not in stage');
+        if (!values.includes(correct)) fail(task, 'correct answer not among options');
+        if (new Set(values).size !== values.length) fail(task, 'duplicate options');
+        switch (visual.type) {
+            case 'compare':
+                if (values.length !== 2) fail(task, 'compare needs 2 options');
+                if (!inRange(visual.left) || !inRange(visual.right) || visual.left === visual.right) {
+                    fail(task, 'compare numbers');
+                }
+                if (correct !== (visual.left > visual.right ? 'left' : 'right')) fail(task, 'compare answer');
+                break;
+            case 'bigger':
+            case 'smaller': {
+                const nums = visual.nums;
+                if (values.length !== 3 || nums.length !== 3 || new Set(nums).size !== 3) fail(task, 'needs 3 distinct numbers');
+                if (!nums.every(inRange)) fail(task, 'number out of range');
+                const want = visual.type === 'bigger' ? Math.max(...nums) : Math.min(...nums);
+                if (correct !== want) fail(task, `${visual.type} answer`);
+                break;
+            }
+            case 'sequence': {
+                const gaps = visual.seq.filter(v => v === '?').length;
+                const start = visual.seq[0] === '?' ? visual.seq[1] - 1 : visual.seq[0];
+                const ok = gaps === 1 && visual.seq.every((v, i) => v === '?' ? correct === start + i : v === start + i);
+                if (!ok) fail(task, 'sequence gap');
+                if (!inRange(correct)) fail(task, 'sequence answer out of range');
+                if (!values.every(v => Number.isInteger(v) && v >= lo && v <= hi + 1)) fail(task, 'sequence option range');
+                break;
+            }
+            case 'count':
+                if (visual.count !== correct || !inRange(correct)) fail(task, 'count answer');
+                if (!values.every(inRange)) fail(task, 'count option range');
+                break;
+            case 'addSub': {
+                result.ops[visual.op] = (result.ops[visual.op] || 0) + 1;
+                const want = visual.op === '+' ? visual.left + visual.right : visual.left - visual.right;
+                if (correct !== want) fail(task, 'arithmetic');
+                if (!(correct >= 0 && correct <= hi)) fail(task, 'addSub answer out of 0..max');
+                if (!values.every(v => Number.isInteger(v) && v >= 0 && v <= hi)) fail(task, 'addSub option range');
+                if (!inRange(visual.left) || !inRange(visual.right)) fail(task, 'addSub operand range');
+                break;
+            }
+            default:
+                fail(task, 'unknown type');
+        }
+    }
+    return result;
+}"""
+
+
+def merge(total, batch):
+    """Fold one batch result into the running totals for a stage."""
+    total['n'] += batch['n']
+    total['ms'] += batch['ms']
+    total['violations'] += batch['violations']
+    total['examples'] = (total['examples'] + batch['examples'])[:5]
+    for key in ('types', 'answers', 'ops'):
+        for value, count in batch[key].items():
+            total[key][value] = total[key].get(value, 0) + count
+    return total
+
+
+def run_stage(page, stage, batches, batch_size, weak=None):
+    total = {'n': 0, 'ms': 0.0, 'types': {}, 'answers': {}, 'ops': {}, 'violations': 0, 'examples': []}
+    for _ in range(batches):
+        merge(total, page.evaluate(BATCH, {'stage': stage, 'n': batch_size, 'weak': weak}))
+    return total
+
+
+def coverage_problems(stage_types, total):
+    """Things every stage must produce at least once."""
+    problems = [f"never produced {t!r}" for t in stage_types if not total['types'].get(t)]
+    if 'addSub' in stage_types:
+        for op in ('+', '-'):
+            if not total['ops'].get(op):
+                problems.append(f"never produced {op} task")
+        if not total['answers'].get('0'):
+            problems.append("never produced a 0 answer")
+    return problems
+
+
+def _share(counts, n):
+    return '  '.join(f"{k}:{v / n:.1%}" for k, v in sorted(counts.items(), key=lambda kv: (len(kv[0]), kv[0])))
+
+
+def report(stage, name, total, problems):
+    rate = total['n'] / (total['ms'] / 1000) if total['ms'] else float('inf')
+    status = '[OK]' if not total['violations'] and not problems else '[FAIL]'
+    print(f"\n  {status} stage {stage} ({name}): {total['n']} tasks, {rate:,.0f} tasks/s, "
+          f"{total['violations']} violations")
+    print(f"    types    {_share(total['types'], total['n'])}")
+    print(f"    answers  {_share(total['answers'], total['n'])}")
+    if total['ops']:
+        print(f"    addSub   {_share(total['ops'], total['n'])}")
+    for problem in problems:
+        print(f"    [FAIL] {problem}")
+    for example in total['examples']:
+        print(f"    [FAIL] {example['why']}: {json.dumps(example, ensure_ascii=False)}")
+    return {'tasks': total['n'], 'tasks_per_s': round(rate), 'violations': total['violations'],
+            'types': total['types'], 'answers': total['answers'], 'ops': total['ops'],
+            'problems': problems}
+
+
+def run(base_url, batches, batch_size, weak=None, headless=True):
+    """Return ``(summary per stage, failed)``."""
+    summary, failed = {}, False
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            page = browser.new_page(base_url=base_url)
+            page.goto(race_url(profile_id=False), timeout=30000)
+            page.wait_for_function("() => !!window.__numberRacingTasks", timeout=30000)
+            stages = page.evaluate(
+                "() => Object.fromEntries(Object.entries(window.__numberRacingTasks.LEARNING_STAGES)"
+                ".map(([k, v]) => [k, { name: v.name, tasks: v.tasks }]))")
+            for stage, info in stages.items():
+                total = run_stage(page, int(stage), batches, batch_size)
+                problems = coverage_problems(info['tasks'], total)
+                summary[stage] = report(stage, info['name'], total, problems)
+                failed = failed or bool(total['violations'] or problems)
+                if weak is not None:
+                    weighted = run_stage(page, int(stage), batches, batch_size, weak)
+                    base_share = total['answers'].get(str(weak), 0) / total['n']
+                    weak_share = weighted['answers'].get(str(weak), 0) / weighted['n']
+                    print(f"    weak {weak} (3 mistakes): answer share {base_share:.1%} -> {weak_share:.1%}")
+                    summary[stage]['weak'] = {'number': weak, 'share_before': round(base_share, 4),
+                                              'share_after': round(weak_share, 4)}
+                    failed = failed or bool(weighted['violations'])
+        finally:
+            browser.close()
+    return summary, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--batches', type=int, default=3, help='batches per stage')
+    parser.add_argument('--batch', type=int, default=100_000, help='tasks per page.evaluate call')
+    parser.add_argument('--weak', type=int, help='also draw with 3 mistakes on this answer number')
+    parser.add_argument('--json', help='also write the per-stage results here')
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--base-url', default=config.APP_URL)
+    args = parser.parse_args(argv)
+
+    app = contextlib.nullcontext(args.base_url) if args.base_url else local_app()
+    with app as base_url:
+        print(f"Task generator: {args.batches} x {args.batch} tasks per stage against {base_url}")
+        print("=" * 70)
+        summary, failed = run(base_url, args.batches, args.batch, args.weak,
+                              headless=config.HEADLESS and not args.headed)
+        print("=" * 70)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""Visual regression on perceptual hashes and tiny reference thumbnails.
+
+The legacy scripts write full-resolution PNGs (screenshot_*.png,
+test_screenshots/*.png) that nobody compares. Here each named screenshot is
+stored in one small JSON file (``config.VISUAL_BASELINE``) as:
+
+    size     width x height of the capture
+    dhash    64-bit difference hash of a 9x8 grayscale version; it survives
+             anti-aliasing and tiny shifts, but a changed layout flips bits
+    thumb    36x32 RGB box-averaged thumbnail (base64, 3.4 KB), so colour
+             changes the grayscale hash cannot see still show up
+
+A capture fails when its hash is more than ``--max-distance`` bits away from
+the reference, or its thumbnail differs by more than ``--max-diff`` (mean
+absolute difference per channel, 0-255). Decoding a 1280x720 PNG in pure
+Python takes a while, so captures are checked in a process pool. Only
+failures are written to disk: the full-resolution capture plus the reference
+thumbnail scaled up, next to each other in ``--failures``.
+
+No imaging library is needed: the PNGs the browser writes (8-bit, not
+interlaced) are decoded with zlib.
+
+    python -m harness.visual update test_screenshots        # record references
+    python -m harness.visual check test_screenshots         # compare, exit 1 on a change
+    python -m harness.visual check test_screenshots --prune # and delete the passing PNGs
+
+The runner does the same for the scenarios' screenshots: ``capture`` keeps
+them in memory, and ``python -m harness`` checks them after the run
+(``--update-visual`` records them instead).
+"""
+import argparse
+import base64
+import glob
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from . import config
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}  # PNG colour type -> samples per pixel
+
+# 36x32 splits evenly into the 9x8 grid of the hash (4x4 cells per bit)
+THUMB_W, THUMB_H = 36, 32
+HASH_W, HASH_H = 9, 8
+
+# Every SAMPLE_STEP-th pixel of every SAMPLE_STEP-th row feeds the thumbnail;
+# a 1280-wide capture still gives ~100 samples per thumbnail cell.
+SAMPLE_STEP = 4
+
+
+# --- PNG ---
+
+def decode_png(data):
+    """``(width, height, rows)`` with rows as RGB ``bytearray``s."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError('not a PNG file')
+    pos, idat, header = len(PNG_SIGNATURE), [], None
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', chunk)
+        elif kind == b'IDAT':
+            idat.append(chunk)
+        elif kind == b'IEND':
+            break
+    width, height, depth, color, _, _, interlace = header
+    if depth != 8 or color not in CHANNELS or interlace:
+        raise ValueError(f'unsupported PNG (depth {depth}, colour type {color}, interlace {interlace})')
+    bpp = CHANNELS[color]
+    raw = zlib.decompress(b''.join(idat))
+    stride = width * bpp
+    rows, prev = [], bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        row = _unfilter(raw[start], bytearray(raw[start + 1:start + 1 + stride]), prev, bpp)
+        # The next row unfilters against this one with all its channels
+        rows.append(_to_rgb(row, color))
+        prev = row
+    return width, height, rows
+
+
+_masks = {}
+
+
+def _unfilter(kind, row, prev, bpp):
+    # Sub and Up (most rows of a UI screenshot) run at C speed: Sub is a
+    # running sum per channel, Up a bytewise add of two big integers with the
+    # carry out of each byte dropped. Average and Paeth need the Python loop.
+    if kind == 1:  # Sub
+        for c in range(bpp):
+            row[c::bpp] = bytes(map((0xFF).__and__, accumulate(row[c::bpp])))
+    elif kind == 2:  # Up
+        n = len(row)
+        if n not in _masks:
+            _masks[n] = (int.from_bytes(b'\x7f' * n, 'big'), int.from_bytes(b'\x80' * n, 'big'))
+        low, high = _masks[n]
+        a, b = int.from_bytes(row, 'big'), int.from_bytes(prev, 'big')
+        row[:] = (((a & low) + (b & low)) ^ ((a ^ b) & high)).to_bytes(n, 'big')
+    elif kind == 3:  # Average
+        for i in range(len(row)):
+            left = row[i - bpp] if i >= bpp else 0
+            row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+    elif kind == 4:  # Paeth
+        for i in range(len(row)):
+            a = row[i - bpp] if i >= bpp else 0
+            b = prev[i]
+            c = prev[i - bpp] if i >= bpp else 0
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+    return row
+
+
+def _to_rgb(row, color):
+    """RGB samples of an unfiltered row; ``row`` itself is never modified."""
+    if color == 2:
+        return row
+    if color == 6:
+        rgb = bytearray(len(row) // 4 * 3)
+        rgb[0::3], rgb[1::3], rgb[2::3] = row[0::4], row[1::4], row[2::4]
+        return rgb
+    gray = row[::2] if color == 4 else row
+    rgb = bytearray(len(gray) * 3)
+    rgb[0::3] = rgb[1::3] = rgb[2::3] = gray
+    return rgb
+
+
+def encode_png(width, height, rgb):
+    """RGB bytes -> PNG, for the failure report."""
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+    stride = width * 3
+    raw = b''.join(b'\x00' + bytes(rgb[y * stride:(y + 1) * stride]) for y in range(height))
+    return (PNG_SIGNATURE + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 9)) + chunk(b'IEND', b''))
+
+
+# --- Fingerprint ---
+
+def thumbnail(width, height, rows):
+    """36x32 RGB box average as ``bytes``."""
+    sums = [0] * (THUMB_W * THUMB_H * 3)
+    counts = [0] * (THUMB_W * THUMB_H)
+    cell_x = [x * THUMB_W // width for x in range(0, width, SAMPLE_STEP)]
+    for y in range(0, height, SAMPLE_STEP):
+        row, base = rows[y], (y * THUMB_H // height) * THUMB_W
+        for i, cx in enumerate(cell_x):
+            cell, px = base + cx, i * SAMPLE_STEP * 3
+            sums[cell * 3] += row[px]
+            sums[cell * 3 + 1] += row[px + 1]
+            sums[cell * 3 + 2] += row[px + 2]
+            counts[cell] += 1
+    return bytes(sums[i] // max(counts[i // 3], 1) for i in range(len(sums)))
+
+
+def dhash(thumb):
+    """64-bit difference hash: is each 9x8 gray cell brighter than its right neighbour?"""
+    bw, bh = THUMB_W // HASH_W, THUMB_H // HASH_H
+    gray = [[0] * HASH_W for _ in range(HASH_H)]
+    for y in range(THUMB_H):
+        for x in range(THUMB_W):
+            i = (y * THUMB_W + x) * 3
+            gray[y // bh][x // bw] += 299 * thumb[i] + 587 * thumb[i + 1] + 114 * thumb[i + 2]
+    bits = 0
+    for row in gray:
+        for x in range(HASH_W - 1):
+            bits = (bits << 1) | (row[x] > row[x + 1])
+    return bits
+
+
+def fingerprint(png):
+    """Reference entry for one PNG: size, hash and thumbnail."""
+    width, height, rows = decode_png(png)
+    thumb = thumbnail(width, height, rows)
+    return {'size': [width, height], 'dhash': f'{dhash(thumb):016x}',
+            'thumb': base64.b64encode(thumb).decode('ascii')}
+
+
+def compare(entry, reference):
+    """``(hash distance in bits, mean thumbnail difference)``."""
+    distance = bin(int(entry['dhash'], 16) ^ int(reference['dhash'], 16)).count('1')
+    a, b = base64.b64decode(entry['thumb']), base64.b64decode(reference['thumb'])
+    return distance, sum(abs(x - y) for x, y in zip(a, b)) / len(a)
+
+
+def _check_one(job):
+    """Pool worker: fingerprint a capture and compare it with its reference."""
+    name, png, reference, max_distance, max_diff = job
+    try:
+        entry = fingerprint(png)
+    except (ValueError, IndexError, zlib.error, struct.error) as error:
+        # A broken or truncated file is reported, not allowed to stop the pool
+        return {'name': name, 'status': 'error', 'error': str(error)}
+    if reference is None:
+        return {'name': name, 'status': 'new', 'entry': entry}
+    distance, diff = compare(entry, reference)
+    changed = distance > max_distance or diff > max_diff or entry['size'] != reference['size']
+    return {'name': name, 'status': 'changed' if changed else 'ok', 'entry': entry,
+            'distance': distance, 'diff': round(diff, 2)}
+
+
+# --- Store ---
+
+class VisualStore:
+    """Name -> reference entry, kept in one JSON file."""
+
+    def __init__(self, path=None):
+        self.path = path or config.VISUAL_BASELINE
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(self.entries.items())), f, indent=1)
+
+    def check(self, captures, max_distance=6, max_diff=8.0, workers=None):
+        """Check ``{name: png bytes}`` in a process pool; results in name order."""
+        jobs = [(name, png, self.entries.get(name), max_distance, max_diff)
+                for name, png in sorted(captures.items())]
+        if len(jobs) <= 1:
+            return [_check_one(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_check_one, jobs))
+
+    def record(self, results):
+        for result in results:
+            if 'entry' in result:
+                self.entries[result['name']] = result['entry']
+
+
+def write_failure(out_dir, name, png, reference):
+    """Full-resolution capture plus the reference thumbnail scaled up 8x."""
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, name.replace('/', '_'))
+    with open(f'{base}.actual.png', 'wb') as f:
+        f.write(png)
+    if reference:
+        thumb, scale = base64.b64decode(reference['thumb']), 8
+        rows = []
+        for y in range(THUMB_H * scale):
+            src = thumb[(y // scale) * THUMB_W * 3:(y // scale + 1) * THUMB_W * 3]
+            rows.append(b''.join(src[x * 3:x * 3 + 3] * scale for x in range(THUMB_W)))
+        with open(f'{base}.expected.png', 'wb') as f:
+            f.write(encode_png(THUMB_W * scale, THUMB_H * scale, b''.join(rows)))
+
+
+def report(results, captures, store, failures_dir):
+    """Print results, write failures; returns the number of failed captures."""
+    failed = 0
+    for result in results:
+        name, status = result['name'], result['status']
+        if status == 'ok':
+            print(f"  [OK]   {name:<40} {result['distance']:2d} bits, diff {result['diff']:5.2f}")
+        elif status == 'new':
+            print(f"  [NEW]  {name:<40} no reference yet (run update)")
+        else:
+            failed += 1
+            detail = result.get('error') or (f"{result['distance']} bits, diff {result['diff']:.2f}, "
+                                             f"size {result['entry']['size']}")
+            print(f"  [FAIL] {name:<40} {detail}")
+            write_failure(failures_dir, name, captures[name], store.entries.get(name))
+    if failed:
+        print(f"  {failed} changed; captures and references in {failures_dir}")
+    return failed
+
+
+# --- In-memory captures for the runner ---
+
+_captures = {}
+_captures_lock = threading.Lock()
+
+
+def capture(name, png):
+    """Keep a screenshot for the end-of-run check instead of writing it."""
+    with _captures_lock:
+        _captures[name] = png
+
+
+def take_captures():
+    with _captures_lock:
+        captured = dict(_captures)
+        _captures.clear()
+    return captured
+
+
+def check_captures(update=False, failures_dir=None):
+    """Runner hook: check (or record) the scenarios' screenshots; True if all pass."""
+    captures = take_captures()
+    if not captures:
+        return True
+    store = VisualStore()
+    results = store.check(captures)
+    print("\n" + "=" * 70)
+    print(f"VISUAL ({len(captures)} screenshots against {store.path})")
+    print("=" * 70)
+    if update:
+        store.record(results)
+        store.save()
+        print(f"  recorded {len(results)} references")
+        return True
+    return report(results, captures, store, failures_dir or _failures_dir()) == 0
+
+
+def _failures_dir():
+    return os.path.join(config.SCREENSHOT_DIR, 'visual_failures')
+
+
+def read_pngs(paths):
+    """``{name: bytes}`` for PNG files and directories of them; name = file stem."""
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, '*.png'))) if os.path.isdir(path) else [path])
+    captures = {}
+    for file in files:
+        with open(file, 'rb') as f:
+            captures[os.path.splitext(os.path.basename(file))[0]] = f.read()
+    return captures, files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=('update', 'check'))
+    parser.add_argument('paths', nargs='+', help='PNG files or directories of them')
+    parser.add_argument('--baseline', default=config.VISUAL_BASELINE)
+    parser.add_argument('--max-distance', type=int, default=6, help='hash bits that may differ')
+    parser.add_argument('--max-diff', type=float, default=8.0,
+                        help='mean thumbnail difference per channel (0-255)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='processes (default: CPUs)')
+    parser.add_argument('--failures', default=_failures_dir())
+    parser.add_argument('--prune', action='store_true', help='delete PNGs that passed')
+    args = parser.parse_args(argv)
+
+    captures, files = read_pngs(args.paths)
+    store = VisualStore(args.baseline)
+    print(f"Visual {args.command}: {len(captures)} screenshots against {store.path}")
+    print("=" * 70)
+    results = store.check(captures, args.max_distance, args.max_diff, args.workers)
+    if args.command == 'update':
+        store.record(results)
+        store.save()
+        for result in results:
+            print(f"  [{'OK' if 'entry' in result else 'FAIL'}] {result['name']}")
+        print("=" * 70)
+        return 0 if all('entry' in r for r in results) else 1
+
+    failed = report(results, captures, store, args.failures)
+    print("=" * 70)
+    if args.prune:
+        passed = {r['name'] for r in results if r['status'] == 'ok'}
+        for file in files:
+            if os.path.splitext(os.path.basename(file))[0] in passed:
+                os.remove(file)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
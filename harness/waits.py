@@ -0,0 +1,135 @@
+"""Event-driven waits for the games' UI states.
+
+The legacy scripts pause with ``time.sleep(2)`` or ``page.wait_for_timeout(3000)``
+after every step ("wait for React", "wait for Babel compilation"). A
+``Waiter`` instead polls a named DOM predicate on every animation frame and
+returns as soon as the app reaches that state. Each call can pass the fixed
+sleep it replaces as ``legacy_ms`` so a run reports how much time was saved.
+
+    w = Waiter(page)
+    page.goto('/games-number-racing.html')
+    w.until('menu', legacy_ms=3000)
+    page.locator('button:has-text("▶️")').first.click()
+    w.until('race_task', legacy_ms=2000)
+    print(w.summary())
+"""
+import time
+
+# JS predicates evaluated in the page; each must return a truthy value once the
+# state is reached. Kept free of app internals so they work on any build.
+STATES = {
+    # React rendered something other than the static loading placeholder.
+    'react_mounted': """() => {
+        const root = document.getElementById('root');
+        return !!root && root.children.length > 0 && !root.textContent.startsWith('Загрузка');
+    }""",
+    # Marketplace: profile cards or the "new player" button are on screen.
+    'marketplace': """() => Array.from(document.querySelectorAll('button')).some(
+        b => b.textContent.includes('Играть') || b.textContent.includes('Новый игрок'))""",
+    # Number Racing menu with the start button.
+    'menu': """() => Array.from(document.querySelectorAll('button')).some(
+        b => b.textContent.includes('▶️') && b.textContent.includes('🚦'))""",
+    # A race task is shown and accepts answers (no 🎉/🙈 overlay).
+    'race_task': """() => document.querySelectorAll('.grid.grid-cols-3 button').length > 0""",
+    # Answer feedback (🎉 correct or 🙈 wrong) is shown in the task card.
+    'answer_feedback': """() => {
+        const el = document.querySelector('.text-8xl');
+        return !!el && (el.textContent.includes('🎉') || el.textContent.includes('🙈'));
+    }""",
+    # Feedback finished: either the next task, the finish or the failed screen.
+    'feedback_settled': """() => {
+        const t = document.body.textContent;
+        if (t.includes('ПОБЕДА') || t.includes('💔')) return true;
+        const el = document.querySelector('.text-8xl');
+        const feedback = !!el && (el.textContent.includes('🎉') || el.textContent.includes('🙈'));
+        return !feedback && document.querySelectorAll('.grid.grid-cols-3 button').length > 0;
+    }""",
+    'pause_menu': """() => document.body.textContent.includes('Пауза')""",
+    'race_resumed': """() => !document.body.textContent.includes('Пауза')""",
+    'continue_dialog': """() => document.body.textContent.includes('Продолжить гонку?')""",
+    'finish': """() => document.body.textContent.includes('ПОБЕДА')""",
+    'race_autosaved': """() => localStorage.getItem('raceInProgress') !== null""",
+    'garage': """() => document.body.textContent.includes('🔒')""",
+}
+
+
+class StateTimeout(AssertionError):
+    """Raised when the page does not reach a named state in time."""
+
+
+class _WaitLog:
+    """Bookkeeping shared by the sync and async waiters."""
+
+    def __init__(self, page, timeout=15000, polling='raf'):
+        self.page = page
+        self.timeout = timeout
+        self.polling = polling
+        self.log = []
+
+    def _record(self, state, started, legacy_ms):
+        elapsed = time.perf_counter() - started
+        self.log.append((state, elapsed, legacy_ms / 1000.0))
+        return elapsed
+
+    @property
+    def waited_seconds(self):
+        return sum(e for _, e, _ in self.log)
+
+    @property
+    def legacy_seconds(self):
+        return sum(legacy for _, _, legacy in self.log)
+
+    @property
+    def saved_seconds(self):
+        return sum(max(legacy - elapsed, 0.0) for _, elapsed, legacy in self.log if legacy)
+
+    def summary(self):
+        return {
+            'waits': len(self.log),
+            'waited_s': round(self.waited_seconds, 2),
+            'legacy_s': round(self.legacy_seconds, 2),
+            'saved_s': round(self.saved_seconds, 2),
+        }
+
+    def print_summary(self, label='Waits'):
+        s = self.summary()
+        print(f"\n[{label}] {s['waits']} waits took {s['waited_s']:.2f}s "
+              f"vs {s['legacy_s']:.2f}s of fixed sleeps (saved {s['saved_s']:.2f}s)")
+
+
+def _timeout_error(state, error):
+    return StateTimeout(f"state '{state}' not reached: {str(error).splitlines()[0]}")
+
+
+class Waiter(_WaitLog):
+    """Waits on named UI states for one page and records time saved."""
+
+    def until(self, state, legacy_ms=0, timeout=None, arg=None):
+        """Block until ``state`` holds; returns the elapsed seconds."""
+        started = time.perf_counter()
+        try:
+            self.page.wait_for_function(STATES.get(state, state), arg=arg,
+                                        polling=self.polling, timeout=timeout or self.timeout)
+        except Exception as e:
+            raise _timeout_error(state, e) from None
+        return self._record(state, started, legacy_ms)
+
+    def reached(self, state):
+        """Non-blocking check of a named state."""
+        return bool(self.page.evaluate(STATES.get(state, state)))
+
+
+class AsyncWaiter(_WaitLog):
+    """``Waiter`` for pages from ``playwright.async_api``."""
+
+    async def until(self, state, legacy_ms=0, timeout=None, arg=None):
+        started = time.perf_counter()
+        try:
+            await self.page.wait_for_function(STATES.get(state, state), arg=arg,
+                                              polling=self.polling, timeout=timeout or self.timeout)
+        except Exception as e:
+            raise _timeout_error(state, e) from None
+        return self._record(state, started, legacy_ms)
+
+    async def reached(self, state):
+        return bool(await self.page.evaluate(STATES.get(state, state)))
@@ -11,7 +11,12 @@ const fetchAPI = async (endpoint, options = {}) => {
   return response.json();
 };
 const getProfiles = () => fetchAPI('/profiles');
-const updateProfileAPI = (id, profile) => fetchAPI(`/profiles/${id}`, { method: 'PUT', body: JSON.stringify(profile) });
+// createMergePatch — общий помощник из profile-patch.js (подключается страницей)
+const patchProfileAPI = (id, patch) => fetchAPI(`/profiles/${id}`, {
+  method: 'PATCH',
+  headers: { 'Content-Type': 'application/merge-patch+json' },
+  body: JSON.stringify(patch),
+});
 
 // ============ GAME DATA ============
 
@@ -956,7 +961,10 @@ function NumberIsland() {
           numberIslandData: newState,
           stars: (currentProfile.stars || 0) + (newState.shells - gameState.shells),
         };
-        await updateProfileAPI(currentProfile.id, updatedProfile);
+        const patch = createMergePatch(currentProfile, updatedProfile);
+        if (Object.keys(patch).length > 0) {
+          await patchProfileAPI(currentProfile.id, patch);
+        }
         setCurrentProfile(updatedProfile);
       } catch (e) {
         console.error('Error saving:', e);
@@ -1,5 +1,5 @@
 // React hooks from global React (loaded via CDN)
-const { useState, useCallback, useEffect, useRef } = React;
+const { useState, useCallback, useEffect, useLayoutEffect, useMemo, useRef } = React;
 
 // API для работы с профилями
 const API_URL = '/api';
@@ -12,124 +12,197 @@ const fetchAPI = async (endpoint, options = {}) => {
   return response.json();
 };
 
-const getProfiles = () => fetchAPI('/profiles');
-const updateProfileAPI = (id, profile) => fetchAPI(`/profiles/${id}`, { method: 'PUT', body: JSON.stringify(profile) });
-
-// Enhanced Sound System
-const useSound = () => {
-  const audioCtx = useRef(null);
-  const musicOsc = useRef(null);
-  const musicGain = useRef(null);
-  
-  const getCtx = () => {
-    if (!audioCtx.current) audioCtx.current = new (window.AudioContext || window.webkitAudioContext)();
-    return audioCtx.current;
-  };
+// Test-only hook: with ?test=1 in the URL the current task is published on
+// window.__numberRacing so the Python harness (harness/oracle.py) can answer
+// without brute-forcing the option buttons.
+const TEST_HOOK = new URLSearchParams(window.location.search).has('test');
 
-  const playNote = (freq, duration, delay = 0, type = 'sine', vol = 0.2) => {
-    try {
-      const ctx = getCtx();
-      const o = ctx.createOscillator();
-      const g = ctx.createGain();
-      o.type = type;
-      o.connect(g);
-      g.connect(ctx.destination);
-      o.frequency.setValueAtTime(freq, ctx.currentTime + delay);
-      g.gain.setValueAtTime(vol, ctx.currentTime + delay);
-      g.gain.setValueAtTime(0.01, ctx.currentTime + delay + duration);
-      o.start(ctx.currentTime + delay);
-      o.stop(ctx.currentTime + delay + duration);
-    } catch(e) {}
-  };
-
-  const playCorrect = () => {
-    playNote(523, 0.15, 0, 'sine', 0.3);
-    playNote(659, 0.15, 0.1, 'sine', 0.3);
-    playNote(784, 0.2, 0.2, 'sine', 0.3);
-  };
+const getProfiles = () => fetchAPI('/profiles');
+// createMergePatch — общий помощник из profile-patch.js (подключается страницей)
+const patchProfileAPI = (id, patch) => fetchAPI(`/profiles/${id}`, {
+  method: 'PATCH',
+  headers: { 'Content-Type': 'application/merge-patch+json' },
+  body: JSON.stringify(patch),
+});
 
-  const playWrong = () => {
-    playNote(200, 0.15, 0, 'sawtooth', 0.2);
-    playNote(150, 0.2, 0.15, 'sawtooth', 0.2);
-  };
+// События ответов уходят в журнал пачками — общий помощник из answer-events.js
+const logAnswerEvent = createAnswerLogger('number-racing');
 
-  const playClick = () => playNote(800, 0.05, 0, 'sine', 0.15);
+// Enhanced Sound System
+//
+// Every effect is a fixed list of notes, so it is rendered once into an
+// AudioBuffer with an OfflineAudioContext and then only replayed: a play is
+// one AudioBufferSourceNode on one of a few reusable voice gains instead of a
+// fresh oscillator + gain per note. The engine hum and the race melody are
+// looped buffers, so no timers run during a race.
+
+// Notes: [frequency Hz, duration s, delay s, waveform, volume]
+const MELODY = [262, 294, 330, 294, 262, 330, 392, 330];
+const MELODY_STEP = 0.4;
+
+const SOUND_EFFECTS = {
+  correct: { notes: [[523, 0.15, 0, 'sine', 0.3], [659, 0.15, 0.1, 'sine', 0.3], [784, 0.2, 0.2, 'sine', 0.3]] },
+  wrong: { notes: [[200, 0.15, 0, 'sawtooth', 0.2], [150, 0.2, 0.15, 'sawtooth', 0.2]] },
+  click: { notes: [[800, 0.05, 0, 'sine', 0.15]] },
+  win: { notes: [523, 659, 784, 880, 1047].map((n, i) => [n, 0.2, i * 0.12, 'sine', 0.25]) },
+  unlock: { notes: [[400, 0.1, 0, 'triangle', 0.3], [600, 0.1, 0.1, 'triangle', 0.3], [800, 0.2, 0.2, 'triangle', 0.3]] },
+  start: { notes: [[440, 0.25, 0, 'square', 0.2], [440, 0.25, 0.4, 'square', 0.2], [880, 0.4, 0.8, 'square', 0.25]] },
+  // One 80-120-80 Hz pulse followed by silence, looped every 200 ms
+  engine: { notes: [[80, 0.05, 0, 'sawtooth', 0.08], [120, 0.05, 0.05, 'sawtooth', 0.08], [80, 0.05, 0.1, 'sawtooth', 0.08]], length: 0.2 },
+  music: { notes: MELODY.map((n, i) => [n, 0.3, i * MELODY_STEP, 'sine', 0.08]), length: MELODY.length * MELODY_STEP },
+};
 
-  const playWin = () => {
-    const notes = [523, 659, 784, 880, 1047];
-    notes.forEach((n, i) => playNote(n, 0.2, i * 0.12, 'sine', 0.25));
-  };
+const SOUND_SAMPLE_RATE = 44100;
+const MAX_VOICES = 6; // one-shot effects playing at once; the oldest is cut off
+
+const renderSound = ({ notes, length }) => {
+  const Offline = window.OfflineAudioContext || window.webkitOfflineAudioContext;
+  const duration = length || Math.max(...notes.map(([, d, delay]) => delay + d));
+  const ctx = new Offline(1, Math.ceil(duration * SOUND_SAMPLE_RATE), SOUND_SAMPLE_RATE);
+  for (const [freq, d, delay, type, vol] of notes) {
+    const o = ctx.createOscillator();
+    const g = ctx.createGain();
+    o.type = type;
+    o.frequency.value = freq;
+    g.gain.value = vol;
+    o.connect(g);
+    g.connect(ctx.destination);
+    o.start(delay);
+    o.stop(delay + d);
+  }
+  // Older WebKit only fires oncomplete and returns nothing from startRendering
+  return new Promise((resolve, reject) => {
+    ctx.oncomplete = e => resolve(e.renderedBuffer);
+    const rendering = ctx.startRendering();
+    if (rendering) rendering.then(resolve, reject);
+  });
+};
 
-  const playUnlock = () => {
-    playNote(400, 0.1, 0, 'triangle', 0.3);
-    playNote(600, 0.1, 0.1, 'triangle', 0.3);
-    playNote(800, 0.2, 0.2, 'triangle', 0.3);
-  };
+const soundEngine = {
+  ctx: null,
+  buffers: {},   // name → AudioBuffer once rendered
+  rendering: null,
+  voices: [],    // { gain, source, startedAt }
+  loops: {},     // name → AudioBufferSourceNode
+  wanted: {},    // name → true between startLoop and stopLoop
+
+  // Rendering needs no user gesture, so it starts as soon as the script loads
+  prerender() {
+    if (this.rendering || !(window.OfflineAudioContext || window.webkitOfflineAudioContext)) return;
+    this.rendering = Promise.all(Object.entries(SOUND_EFFECTS).map(([name, spec]) =>
+      renderSound(spec).then(buffer => { this.buffers[name] = buffer; })
+    )).catch(() => {});
+  },
 
-  const playStart = () => {
-    playNote(440, 0.25, 0, 'square', 0.2);
-    playNote(440, 0.25, 0.4, 'square', 0.2);
-    playNote(880, 0.4, 0.8, 'square', 0.25);
-  };
+  getCtx() {
+    if (!this.ctx) {
+      this.ctx = new (window.AudioContext || window.webkitAudioContext)();
+      for (let i = 0; i < MAX_VOICES; i++) {
+        const gain = this.ctx.createGain();
+        gain.connect(this.ctx.destination);
+        this.voices.push({ gain, source: null, startedAt: 0 });
+      }
+    }
+    if (this.ctx.state === 'suspended') this.ctx.resume();
+    return this.ctx;
+  },
 
-  const playEngine = () => {
+  play(name) {
     try {
-      const ctx = getCtx();
-      const o = ctx.createOscillator();
-      const g = ctx.createGain();
-      o.type = 'sawtooth';
-      o.connect(g);
-      g.connect(ctx.destination);
-      o.frequency.setValueAtTime(80, ctx.currentTime);
-      o.frequency.setValueAtTime(120, ctx.currentTime + 0.05);
-      o.frequency.setValueAtTime(80, ctx.currentTime + 0.1);
-      g.gain.setValueAtTime(0.08, ctx.currentTime);
-      g.gain.setValueAtTime(0.01, ctx.currentTime + 0.15);
-      o.start();
-      o.stop(ctx.currentTime + 0.15);
+      const ctx = this.getCtx();
+      const buffer = this.buffers[name];
+      if (!buffer) return; // still rendering — skip rather than wait
+      const voice = this.voices.find(v => !v.source) ||
+        this.voices.reduce((oldest, v) => (v.startedAt < oldest.startedAt ? v : oldest));
+      if (voice.source) voice.source.stop();
+      const source = ctx.createBufferSource();
+      source.buffer = buffer;
+      source.connect(voice.gain);
+      source.onended = () => {
+        if (voice.source === source) voice.source = null;
+        source.disconnect();
+      };
+      voice.source = source;
+      voice.startedAt = ctx.currentTime;
+      source.start();
     } catch(e) {}
-  };
+  },
 
-  const speakNumber = (num) => {
-    if ('speechSynthesis' in window) {
-      const words = ['', 'один', 'два', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять', 'десять'];
-      const utterance = new SpeechSynthesisUtterance(words[num] || String(num));
-      utterance.lang = 'ru-RU';
-      utterance.rate = 0.9;
-      utterance.pitch = 1.2;
-      speechSynthesis.speak(utterance);
+  // A loop asked for before its buffer is rendered starts once rendering
+  // finishes, unless stopLoop() was called in the meantime
+  startLoop(name) {
+    if (this.loops[name]) return;
+    this.wanted[name] = true;
+    try {
+      this.getCtx(); // create/resume inside the user gesture that asked for it
+    } catch(e) {
+      return;
     }
-  };
+    if (this.buffers[name]) {
+      this.beginLoop(name);
+    } else if (this.rendering) {
+      this.rendering.then(() => {
+        if (this.wanted[name] && !this.loops[name]) this.beginLoop(name);
+      });
+    }
+  },
 
-  const startMusic = () => {
+  beginLoop(name) {
     try {
-      const ctx = getCtx();
-      if (musicOsc.current) return;
-      
-      const melody = [262, 294, 330, 294, 262, 330, 392, 330];
-      let noteIndex = 0;
-      
-      const playMelody = () => {
-        if (!musicOsc.current) return;
-        playNote(melody[noteIndex], 0.3, 0, 'sine', 0.08);
-        noteIndex = (noteIndex + 1) % melody.length;
-      };
-      
-      musicOsc.current = setInterval(playMelody, 400);
-      playMelody();
+      const ctx = this.getCtx();
+      const buffer = this.buffers[name];
+      if (!buffer) return;
+      const source = ctx.createBufferSource();
+      source.buffer = buffer;
+      source.loop = true;
+      source.connect(ctx.destination);
+      source.start();
+      this.loops[name] = source;
     } catch(e) {}
-  };
+  },
 
-  const stopMusic = () => {
-    if (musicOsc.current) {
-      clearInterval(musicOsc.current);
-      musicOsc.current = null;
-    }
-  };
+  stopLoop(name) {
+    delete this.wanted[name];
+    const source = this.loops[name];
+    if (!source) return;
+    delete this.loops[name];
+    try {
+      source.stop();
+      source.disconnect();
+    } catch(e) {}
+  },
+};
 
-  return { playCorrect, playWrong, playClick, playWin, playUnlock, playStart, playEngine, speakNumber, startMusic, stopMusic };
+soundEngine.prerender();
+
+const speakNumber = (num) => {
+  if ('speechSynthesis' in window) {
+    const words = ['', 'один', 'два', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять', 'десять'];
+    const utterance = new SpeechSynthesisUtterance(words[num] || String(num));
+    utterance.lang = 'ru-RU';
+    utterance.rate = 0.9;
+    utterance.pitch = 1.2;
+    speechSynthesis.speak(utterance);
+  }
 };
 
+// Same object on every render, so effects can depend on it without re-running
+const SOUND_API = {
+  playCorrect: () => soundEngine.play('correct'),
+  playWrong: () => soundEngine.play('wrong'),
+  playClick: () => soundEngine.play('click'),
+  playWin: () => soundEngine.play('win'),
+  playUnlock: () => soundEngine.play('unlock'),
+  playStart: () => soundEngine.play('start'),
+  startEngine: () => soundEngine.startLoop('engine'),
+  stopEngine: () => soundEngine.stopLoop('engine'),
+  speakNumber,
+  startMusic: () => soundEngine.startLoop('music'),
+  stopMusic: () => soundEngine.stopLoop('music'),
+};
+
+const useSound = () => SOUND_API;
+
 // Task Icons
 const TaskIcons = {
   compare: <svg viewBox="0 0 100 60" className="w-20 h-12"><rect x="5" y="10" width="35" height="40" rx="8" fill="#EC4899"/><rect x="60" y="10" width="35" height="40" rx="8" fill="#3B82F6"/><path d="M42 25 L50 30 L42 35" fill="none" stroke="#FCD34D" strokeWidth="3"/><path d="M58 25 L50 30 L58 35" fill="none" stroke="#FCD34D" strokeWidth="3"/></svg>,
@@ -219,6 +292,195 @@ const LEARNING_STAGES = {
   4: { range: [1, 10], tasks: ['count', 'compare', 'sequence', 'addSub'], name: 'Сложение и вычитание' },
 };
 
+// Task bank: every distinct task of a stage is enumerated once, so generating a
+// task is a weighted O(1) pick plus a few array writes — no rejection loops.
+// Random parts that don't change the answer (emoji, option order, order of the
+// numbers in bigger/smaller) are filled in when the task is made.
+const COUNT_EMOJIS = ['⭐', '🍎', '🚗', '🐸', '🌸', '⚽', '🍕', '🎈'];
+
+// Weak topics get a bigger share: a task's weight is multiplied by
+// (1 + WEAK_NUMBER_BOOST × mistakes on its answer number) and by
+// (1 + WEAK_TYPE_BOOST × mistakes on its task type), counting at most
+// WEAK_BOOST_CAP mistakes. Three mistakes on 7 make it the answer of ~28%
+// of stage 3 tasks instead of ~8%.
+const WEAK_NUMBER_BOOST = 1;
+const WEAK_TYPE_BOOST = 0.5;
+const WEAK_BOOST_CAP = 3;
+
+// Options around the answer: answer-1, answer, answer+1 (as the old generator)
+const neighbourOptions = (answer, low, high) => {
+  const values = [answer];
+  if (answer > low) values.push(answer - 1);
+  if (answer < high) values.push(answer + 1);
+  return values;
+};
+
+const enumerateStageTasks = (stage) => {
+  const { tasks, range: [minNum, maxNum] } = LEARNING_STAGES[stage];
+  const byType = {};
+  for (const type of tasks) byType[type] = [];
+  for (let n = minNum; n <= maxNum; n++) {
+    if (byType.count) byType.count.push({ type: 'count', correct: n, values: neighbourOptions(n, minNum, maxNum) });
+    for (let m = minNum; m <= maxNum; m++) {
+      if (byType.compare && m !== n) {
+        byType.compare.push({ type: 'compare', left: n, right: m, correct: n > m ? 'left' : 'right' });
+      }
+      // Three distinct numbers n < m < k; shown in random order
+      for (let k = m + 1; m > n && k <= maxNum; k++) {
+        if (byType.bigger) byType.bigger.push({ type: 'bigger', nums: [n, m, k], correct: k });
+        if (byType.smaller) byType.smaller.push({ type: 'smaller', nums: [n, m, k], correct: n });
+      }
+    }
+  }
+  if (byType.sequence) {
+    const maxStart = Math.max(minNum, maxNum - 3);
+    for (let start = minNum; start <= maxStart; start++) {
+      for (let missingIdx = 0; missingIdx < 4; missingIdx++) {
+        const answer = start + missingIdx;
+        // answer+1 may go past the range, as it always did
+        const values = neighbourOptions(answer, minNum, Infinity);
+        byType.sequence.push({ type: 'sequence', start, missingIdx, correct: answer, values });
+      }
+    }
+  }
+  if (byType.addSub) {
+    for (let a = minNum; a <= maxNum; a++) {
+      for (let b = minNum; a + b <= maxNum; b++) {
+        byType.addSub.push({ type: 'addSub', op: '+', left: a, right: b, correct: a + b, values: neighbourOptions(a + b, 0, maxNum) });
+      }
+      for (let b = minNum; b <= a; b++) {
+        byType.addSub.push({ type: 'addSub', op: '-', left: a, right: b, correct: a - b, values: neighbourOptions(a - b, 0, maxNum) });
+      }
+    }
+  }
+  // Every type of the stage gets the same share, as with the old "pick a type,
+  // then a task"; within addSub, + and - get half each (the old coin flip)
+  const bank = [];
+  const usedTypes = tasks.filter(type => byType[type].length > 0);
+  for (const type of usedTypes) {
+    const groups = {};
+    for (const spec of byType[type]) (groups[spec.op || ''] = groups[spec.op || ''] || []).push(spec);
+    const groupList = Object.values(groups);
+    for (const group of groupList) {
+      const share = 1 / (usedTypes.length * groupList.length * group.length);
+      for (const spec of group) {
+        spec.baseWeight = share;
+        bank.push(spec);
+      }
+    }
+  }
+  return bank;
+};
+
+const taskBanks = {};
+const getTaskBank = (stage) => taskBanks[stage] || (taskBanks[stage] = enumerateStageTasks(stage));
+
+// Vose's alias method: O(n) to build, O(1) per sample
+const buildAliasTable = (weights) => {
+  const n = weights.length;
+  const prob = new Float64Array(n);
+  const alias = new Int32Array(n);
+  const total = weights.reduce((sum, w) => sum + w, 0);
+  const scaled = weights.map(w => (w * n) / total);
+  const small = [];
+  const large = [];
+  scaled.forEach((w, i) => (w < 1 ? small : large).push(i));
+  while (small.length > 0 && large.length > 0) {
+    const s = small.pop();
+    const l = large[large.length - 1];
+    prob[s] = scaled[s];
+    alias[s] = l;
+    scaled[l] -= 1 - scaled[s];
+    if (scaled[l] < 1) small.push(large.pop());
+  }
+  for (const i of large) prob[i] = 1;
+  for (const i of small) prob[i] = 1; // only rounding leftovers end up here
+  return { prob, alias };
+};
+
+const weakBoost = (spec, weakTopics) => {
+  const numbers = weakTopics?.numbers || {};
+  const types = weakTopics?.operations || {};
+  const numberMistakes = typeof spec.correct === 'number' ? Math.min(WEAK_BOOST_CAP, numbers[spec.correct] || 0) : 0;
+  const typeMistakes = Math.min(WEAK_BOOST_CAP, types[spec.type] || 0);
+  return (1 + WEAK_NUMBER_BOOST * numberMistakes) * (1 + WEAK_TYPE_BOOST * typeMistakes);
+};
+
+// Sampler over a stage's bank weighted towards the child's weak topics
+const createTaskSampler = (stage, weakTopics) => {
+  const bank = getTaskBank(LEARNING_STAGES[stage] ? stage : 1);
+  const { prob, alias } = buildAliasTable(bank.map(spec => spec.baseWeight * weakBoost(spec, weakTopics)));
+  return {
+    bank,
+    sample: () => {
+      const i = Math.floor(Math.random() * bank.length);
+      return bank[Math.random() < prob[i] ? i : alias[i]];
+    },
+  };
+};
+
+// In-place Fisher–Yates
+const shuffle = (items) => {
+  for (let i = items.length - 1; i > 0; i--) {
+    const j = Math.floor(Math.random() * (i + 1));
+    const t = items[i];
+    items[i] = items[j];
+    items[j] = t;
+  }
+  return items;
+};
+
+const numberOptions = (values) => shuffle(values.map(n => ({ value: n, display: n })));
+
+const addSubIcons = {
+  '+': (
+    <svg viewBox="0 0 100 60" className="w-20 h-12">
+      <circle cx="22" cy="30" r="18" fill="#EC4899"/>
+      <text x="50" y="36" textAnchor="middle" fill="#FCD34D" fontSize="20" fontWeight="bold">+</text>
+      <circle cx="78" cy="30" r="18" fill="#8B5CF6"/>
+    </svg>
+  ),
+  '-': (
+    <svg viewBox="0 0 100 60" className="w-20 h-12">
+      <circle cx="22" cy="30" r="18" fill="#EC4899"/>
+      <text x="50" y="36" textAnchor="middle" fill="#FCD34D" fontSize="20" fontWeight="bold">-</text>
+      <circle cx="78" cy="30" r="18" fill="#8B5CF6"/>
+    </svg>
+  ),
+};
+
+const COMPARE_OPTIONS = [{ value: 'left', display: '👈' }, { value: 'right', display: '👉' }];
+
+// Bank entry → the task shape the race screen renders
+const makeTask = (spec) => {
+  switch (spec.type) {
+    case 'compare':
+      return { visual: { type: 'compare', left: spec.left, right: spec.right }, options: COMPARE_OPTIONS, correct: spec.correct, icon: TaskIcons.compare };
+    case 'bigger':
+    case 'smaller': {
+      const nums = shuffle(spec.nums.slice());
+      return { visual: { type: spec.type, nums }, options: nums.map(n => ({ value: n, display: n })), correct: spec.correct, icon: TaskIcons[spec.type] };
+    }
+    case 'sequence': {
+      const seq = [spec.start, spec.start + 1, spec.start + 2, spec.start + 3];
+      seq[spec.missingIdx] = '?';
+      return { visual: { type: 'sequence', seq }, options: numberOptions(spec.values), correct: spec.correct, icon: TaskIcons.sequence };
+    }
+    case 'count': {
+      const emoji = COUNT_EMOJIS[Math.floor(Math.random() * COUNT_EMOJIS.length)];
+      return { visual: { type: 'count', count: spec.correct, emoji }, options: numberOptions(spec.values), correct: spec.correct, icon: TaskIcons.count };
+    }
+    default:
+      return { visual: { type: 'addSub', left: spec.left, right: spec.right, op: spec.op }, options: numberOptions(spec.values), correct: spec.correct, icon: addSubIcons[spec.op] };
+  }
+};
+
+// With ?test=1 the generator itself is published too, so harness/taskgen.py can
+// draw hundreds of thousands of tasks in the page without playing races
+if (TEST_HOOK) {
+  window.__numberRacingTasks = { LEARNING_STAGES, getTaskBank, createTaskSampler, makeTask };
+}
+
 // Achievements system
 const ACHIEVEMENTS = [
   // Beginner achievements
@@ -320,11 +582,22 @@ function NumberRacing({ screenProp, setScreenProp }) {
   const [newAchievement, setNewAchievement] = useState(null); // New achievement notification
   const [answerStartTime, setAnswerStartTime] = useState(0); // Track answer time
   const taskQueueRef = useRef([]);
-  const engineInterval = useRef(null);
   const autoSaveInterval = useRef(null);
 
   const sound = useSound();
 
+  // Layout effect so the hook is updated in the same task as the DOM commit
+  useLayoutEffect(() => {
+    if (!TEST_HOOK) return;
+    window.__numberRacing = {
+      screen,
+      learningStage: gameState.learningStage,
+      raceProgress,
+      streak,
+      task: task ? { visual: task.visual, options: task.options, correct: task.correct } : null,
+    };
+  }, [screen, gameState.learningStage, raceProgress, streak, task]);
+
   // Check for new achievements
   const checkAchievements = useCallback((updatedStats) => {
     const newlyUnlocked = [];
@@ -365,134 +638,21 @@ function NumberRacing({ screenProp, setScreenProp }) {
     }
   }, [gameState.achievements, gameState.stars, gameState.unlockedCars, gameState.soundOn, sound]);
 
-  // Local task generator with learning stages
-  const generateLocalTask = useCallback((diff) => {
-    // Ensure stage is valid (1-4)
-    let stage = gameState.learningStage || 1;
-    if (stage < 1 || stage > 4) {
-      console.warn(`Invalid learning stage ${stage}, defaulting to 1`);
-      stage = 1;
-    }
-
-    const stageConfig = LEARNING_STAGES[stage];
-    const types = stageConfig.tasks;
-    const [minNum, maxNum] = stageConfig.range;
-
-    // 30% chance to repeat weak topics if any exist
-    const hasWeakTopics = Object.keys(gameState.weakTopics?.numbers || {}).length > 0;
-    const shouldPrioritizeWeak = hasWeakTopics && Math.random() < 0.3;
-
-    const type = types[Math.floor(Math.random() * types.length)];
-    
-    let visual, options, correct;
-    
-    switch(type) {
-      case 'compare': {
-        const n1 = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-        let n2 = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-        while (n2 === n1) n2 = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-        visual = { type: 'compare', left: n1, right: n2 };
-        options = [{ value: 'left', display: '👈' }, { value: 'right', display: '👉' }];
-        correct = n1 > n2 ? 'left' : 'right';
-        break;
-      }
-      case 'bigger': {
-        const nums = [];
-        while (nums.length < 3) {
-          const n = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-          if (!nums.includes(n)) nums.push(n);
-        }
-        visual = { type: 'bigger', nums };
-        options = nums.map(n => ({ value: n, display: n }));
-        correct = Math.max(...nums);
-        break;
-      }
-      case 'smaller': {
-        const nums = [];
-        while (nums.length < 3) {
-          const n = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-          if (!nums.includes(n)) nums.push(n);
-        }
-        visual = { type: 'smaller', nums };
-        options = nums.map(n => ({ value: n, display: n }));
-        correct = Math.min(...nums);
-        break;
-      }
-      case 'sequence': {
-        const maxStart = Math.max(minNum, maxNum - 3);
-        const start = Math.floor(Math.random() * (maxStart - minNum + 1)) + minNum;
-        const seq = [start, start + 1, start + 2, start + 3];
-        const missingIdx = Math.floor(Math.random() * 4);
-        const answer = seq[missingIdx];
-        const displaySeq = seq.map((n, i) => i === missingIdx ? '?' : n);
-        visual = { type: 'sequence', seq: displaySeq };
-        const seqOpts = [answer];
-        if (answer > minNum) seqOpts.push(answer - 1);
-        if (answer <= maxNum) seqOpts.push(answer + 1);
-        options = [...new Set(seqOpts)].slice(0, 3).sort(() => Math.random() - 0.5).map(n => ({ value: n, display: n }));
-        correct = answer;
-        break;
-      }
-      case 'count': {
-        const count = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-        const emojis = ['⭐', '🍎', '🚗', '🐸', '🌸', '⚽', '🍕', '🎈'];
-        visual = { type: 'count', count, emoji: emojis[Math.floor(Math.random() * emojis.length)] };
-        const countOpts = [count];
-        if (count > minNum) countOpts.push(count - 1);
-        if (count < maxNum) countOpts.push(count + 1);
-        options = [...new Set(countOpts)].slice(0, 3).sort(() => Math.random() - 0.5).map(n => ({ value: n, display: n }));
-        correct = count;
-        break;
-      }
-      case 'addSub': {
-        const isAdd = Math.random() > 0.5;
-        let a, b, result, left, right;
-
-        if (isAdd) {
-          // For addition: ensure a + b <= maxNum
-          result = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-          a = Math.floor(Math.random() * Math.min(result - minNum + 1, maxNum - minNum + 1)) + minNum;
-          b = result - a;
-          // Ensure b is in valid range
-          if (b < minNum || b > maxNum) {
-            b = Math.floor(Math.random() * (result - minNum + 1)) + minNum;
-            a = result - b;
-          }
-          left = a;
-          right = b;
-        } else {
-          // For subtraction: ensure a - b >= minNum and a <= maxNum
-          a = Math.floor(Math.random() * (maxNum - minNum + 1)) + minNum;
-          b = Math.floor(Math.random() * (a - minNum + 1)) + minNum;
-          result = a - b;
-          left = a;
-          right = b;
-        }
+  // Local task generator with learning stages: a weighted pick from the
+  // stage's task bank. The sampler is rebuilt only when the stage or the weak
+  // topics change.
+  const taskSampler = useMemo(() => {
+    const stage = gameState.learningStage || 1;
+    if (!LEARNING_STAGES[stage]) console.warn(`Invalid learning stage ${stage}, defaulting to 1`);
+    return createTaskSampler(stage, gameState.weakTopics);
+  }, [gameState.learningStage, gameState.weakTopics]);
 
-        visual = { type: 'addSub', left, right, op: isAdd ? '+' : '-' };
-        const addOpts = [result];
-        // For options, allow 0 for subtraction (minNum might be 1, but 0 is valid answer)
-        const minAllowed = 0; // Allow 0 as answer for subtraction
-        if (result > minAllowed) addOpts.push(result - 1);
-        if (result < maxNum) addOpts.push(result + 1);
-        options = [...new Set(addOpts)].filter(n => n >= minAllowed && n <= maxNum).slice(0, 3).sort(() => Math.random() - 0.5).map(n => ({ value: n, display: n }));
-        correct = result;
-
-        // Create dynamic icon based on operation
-        const icon = (
-          <svg viewBox="0 0 100 60" className="w-20 h-12">
-            <circle cx="22" cy="30" r="18" fill="#EC4899"/>
-            <text x="50" y="36" textAnchor="middle" fill="#FCD34D" fontSize="20" fontWeight="bold">{isAdd ? '+' : '-'}</text>
-            <circle cx="78" cy="30" r="18" fill="#8B5CF6"/>
-          </svg>
-        );
-
-        return { visual, options, correct, icon };
-      }
-    }
+  const generateLocalTask = useCallback((diff) => makeTask(taskSampler.sample()), [taskSampler]);
 
-    return { visual, options, correct, icon: TaskIcons[type] };
-  }, [gameState.learningStage, gameState.weakTopics]);
+  // Queued tasks were drawn with the old weights: new ones apply from the next task
+  useEffect(() => {
+    taskQueueRef.current.length = 0;
+  }, [taskSampler]);
 
   const fillQueue = useCallback((diff) => {
     while (taskQueueRef.current.length < 10) {
@@ -585,9 +745,9 @@ function NumberRacing({ screenProp, setScreenProp }) {
   // Engine sound effect during race
   useEffect(() => {
     if (screen === 'race' && gameState.soundOn && isMoving && !isPaused) {
-      engineInterval.current = setInterval(() => sound.playEngine(), 200);
+      sound.startEngine();
     }
-    return () => { if (engineInterval.current) clearInterval(engineInterval.current); };
+    return () => sound.stopEngine();
   }, [screen, gameState.soundOn, isMoving, isPaused, sound]);
 
   // Music control
@@ -638,7 +798,10 @@ function NumberRacing({ screenProp, setScreenProp }) {
           stars: persistentData.stars,
           numberRacingData: persistentData
         };
-        await updateProfileAPI(currentProfile.id, updatedProfile);
+        const patch = createMergePatch(currentProfile, updatedProfile);
+        if (Object.keys(patch).length > 0) {
+          await patchProfileAPI(currentProfile.id, patch);
+        }
         setCurrentProfile(updatedProfile);
       } else {
         // Fallback на localStorage
@@ -708,6 +871,16 @@ function NumberRacing({ screenProp, setScreenProp }) {
     if (isPaused) return;
 
     const isCorrect = answer === task.correct;
+    // ms — time since the previous attempt at this task (or since it was
+    // shown), the same meaning as in reading-game; see server/events.js
+    const now = Date.now();
+    logAnswerEvent(currentProfile?.id, {
+      k: `${task.visual.type}:${task.correct}`,
+      ok: isCorrect,
+      ms: now - answerStartTime,
+      a: wrongAttempts,
+    });
+    if (!isCorrect) setAnswerStartTime(now);
     setShowResult(isCorrect ? 'correct' : 'wrong');
     setCarBounce(true);
     setIsMoving(false);
@@ -0,0 +1,31 @@
+// Частичное сохранение профиля (JSON Merge Patch, RFC 7396) — общий помощник игр.
+//   <script src="./profile-patch.js"></script>  (до game-loader.js)
+// createMergePatch(before, after) возвращает только изменившиеся поля:
+// вложенные объекты сравниваются рекурсивно, массивы заменяются целиком,
+// удалённое поле становится null. Пустой объект — изменений нет.
+(function() {
+  function isPlainObject(v) {
+    return v !== null && typeof v === 'object' && !Array.isArray(v);
+  }
+
+  function createMergePatch(before, after) {
+    var patch = {};
+    Object.keys(before).forEach(function(key) {
+      if (after[key] === undefined && before[key] !== undefined) patch[key] = null;
+    });
+    Object.keys(after).forEach(function(key) {
+      var value = after[key];
+      if (value === undefined) return;
+      var old = before[key];
+      if (isPlainObject(value) && isPlainObject(old)) {
+        var nested = createMergePatch(old, value);
+        if (Object.keys(nested).length > 0) patch[key] = nested;
+      } else if (old !== value && JSON.stringify(old) !== JSON.stringify(value)) {
+        patch[key] = value;
+      }
+    });
+    return patch;
+  }
+
+  window.createMergePatch = createMergePatch;
+})();
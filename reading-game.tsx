@@ -14,9 +14,12 @@ const fetchAPI = async (endpoint, options = {}) => {
 
 const getProfiles = () => fetchAPI('/profiles');
 const createProfile = (profile) => fetchAPI('/profiles', { method: 'POST', body: JSON.stringify(profile) });
-const updateProfileAPI = (id, profile) => fetchAPI(`/profiles/${id}`, { method: 'PUT', body: JSON.stringify(profile) });
+// createMergePatch — общий помощник из profile-patch.js (подключается страницей)
 const deleteProfileAPI = (id) => fetchAPI(`/profiles/${id}`, { method: 'DELETE' });
 
+// События ответов уходят в журнал пачками — общий помощник из answer-events.js
+const logAnswerEvent = createAnswerLogger('reading-game');
+
 // Структура островов по методике Зайцева (оптимальная последовательность)
 const ISLANDS = {
   1: {
@@ -1010,32 +1013,203 @@ const getToday = () => new Date().toISOString().split('T')[0];
 // Интервалы повторения (в днях) для каждого уровня мастерства
 const REVIEW_INTERVALS = [1, 3, 7, 14, 30]; // День 1, 3, 7, 14, 30
 
-// Вычислить следующую дату повторения на основе уровня мастерства
-const calculateNextReview = (masteryLevel) => {
-  const interval = REVIEW_INTERVALS[Math.min(masteryLevel, REVIEW_INTERVALS.length - 1)];
-  const nextDate = new Date();
-  nextDate.setDate(nextDate.getDate() + interval);
-  return nextDate.toISOString().split('T')[0];
+// Даты повторения хранятся в профиле строками 'YYYY-MM-DD' (UTC, как getToday),
+// а планировщик работает с номером дня — целым числом дней от 1970-01-01
+const DAY_MS = 24 * 60 * 60 * 1000;
+const getTodayDay = () => Math.floor(Date.now() / DAY_MS);
+const parseDay = (isoDate) => {
+  const [y, m, d] = String(isoDate).split('-').map(Number);
+  return Math.floor(Date.UTC(y, m - 1, d) / DAY_MS);
+};
+const formatDay = (day) => new Date(day * DAY_MS).toISOString().split('T')[0];
+
+// Срочность повторения (0-100, где 100 = очень срочно) по дням просрочки
+const reviewUrgency = (dueDay, today) => {
+  const overdue = today - dueDay;
+  if (overdue < 0) return 0; // Еще не время
+  if (overdue === 0) return 50; // Сегодня
+  if (overdue <= 2) return 75; // Просрочено на 1-2 дня
+  return 100; // Просрочено больше 2 дней
 };
 
-// Проверить нужно ли повторить букву сегодня
-const needsReview = (reviewData) => {
-  if (!reviewData || !reviewData.nextReview) return false;
-  const today = getToday();
-  return reviewData.nextReview <= today;
+// Планировщик повторений: min-куча букв по дню повторения плюс позиция каждой
+// буквы в куче. Строится из reviewData один раз на профиль (каждая дата
+// разбирается один раз), дальше обновляется по одной букве при занятии.
+// «Что повторить сегодня» — обход только верхушки кучи: буквы, до которых
+// ещё не дошла очередь, не просматриваются.
+class ReviewScheduler {
+  constructor() {
+    this.heap = [];          // { key, letter, islandNum, due, data }
+    this.index = new Map();  // key → позиция в heap
+  }
+
+  static key(islandNum, letter) {
+    return `${islandNum}:${letter}`;
+  }
+
+  static fromIslands(islands) {
+    const scheduler = new ReviewScheduler();
+    for (const islandNum of Object.keys(islands || {})) {
+      const island = ISLANDS[islandNum];
+      const reviewData = islands[islandNum].reviewData;
+      if (!island || !reviewData) continue;
+      for (const letter of [...island.vowels, ...island.consonants]) {
+        const data = reviewData[letter];
+        if (data && data.nextReview) scheduler.schedule(islandNum, letter, data);
+      }
+    }
+    return scheduler;
+  }
+
+  // Добавить букву или перенести её на новый день (data.nextReview)
+  schedule(islandNum, letter, data, due = parseDay(data.nextReview)) {
+    const key = ReviewScheduler.key(islandNum, letter);
+    const at = this.index.get(key);
+    if (at === undefined) {
+      this.heap.push({ key, letter, islandNum: String(islandNum), due, data });
+      this.index.set(key, this.heap.length - 1);
+      this.siftUp(this.heap.length - 1);
+      return;
+    }
+    const item = this.heap[at];
+    const earlier = due < item.due;
+    item.due = due;
+    item.data = data;
+    if (earlier) this.siftUp(at);
+    else this.siftDown(at);
+  }
+
+  // До k букв, которые пора повторить (день повторения <= today), самые
+  // просроченные первыми. isActive отсекает, например, закрытые острова.
+  // Кандидаты — дети уже выданных узлов: O(k log k), а не обход всех букв.
+  due(today, k = Infinity, isActive = () => true) {
+    const result = [];
+    const frontier = this.heap.length > 0 && this.heap[0].due <= today ? [0] : [];
+    while (frontier.length > 0 && result.length < k) {
+      const at = this.popCandidate(frontier);
+      const item = this.heap[at];
+      if (isActive(item)) result.push({ ...item, urgency: reviewUrgency(item.due, today) });
+      for (const child of [2 * at + 1, 2 * at + 2]) {
+        if (child < this.heap.length && this.heap[child].due <= today) this.pushCandidate(frontier, child);
+      }
+    }
+    return result;
+  }
+
+  // --- куча кандидатов (индексы в heap, упорядочены по due) ---
+
+  pushCandidate(frontier, at) {
+    frontier.push(at);
+    let i = frontier.length - 1;
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (this.heap[frontier[parent]].due <= this.heap[frontier[i]].due) break;
+      [frontier[parent], frontier[i]] = [frontier[i], frontier[parent]];
+      i = parent;
+    }
+  }
+
+  popCandidate(frontier) {
+    const top = frontier[0];
+    const last = frontier.pop();
+    if (frontier.length > 0) {
+      frontier[0] = last;
+      let i = 0;
+      for (;;) {
+        let smallest = i;
+        for (const child of [2 * i + 1, 2 * i + 2]) {
+          if (child < frontier.length && this.heap[frontier[child]].due < this.heap[frontier[smallest]].due) smallest = child;
+        }
+        if (smallest === i) break;
+        [frontier[smallest], frontier[i]] = [frontier[i], frontier[smallest]];
+        i = smallest;
+      }
+    }
+    return top;
+  }
+
+  // --- сама куча ---
+
+  swap(a, b) {
+    const heap = this.heap;
+    [heap[a], heap[b]] = [heap[b], heap[a]];
+    this.index.set(heap[a].key, a);
+    this.index.set(heap[b].key, b);
+  }
+
+  siftUp(i) {
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (this.heap[parent].due <= this.heap[i].due) break;
+      this.swap(parent, i);
+      i = parent;
+    }
+  }
+
+  siftDown(i) {
+    for (;;) {
+      let smallest = i;
+      for (const child of [2 * i + 1, 2 * i + 2]) {
+        if (child < this.heap.length && this.heap[child].due < this.heap[smallest].due) smallest = child;
+      }
+      if (smallest === i) return;
+      this.swap(smallest, i);
+      i = smallest;
+    }
+  }
+}
+
+// Планировщик на профиль: id → { revision, scheduler }. Ревизия
+// (progress.reviewRevision) растёт с каждым practiceLetter и сохраняется вместе
+// с профилем: другой объект того же профиля с той же ревизией получает готовый
+// планировщик, профиль с другой ревизией — перестроенный из reviewData.
+const reviewSchedulers = new Map();
+const getReviewScheduler = (profile) => {
+  const islands = profile?.progress?.islands;
+  if (!islands) return new ReviewScheduler();
+  if (!profile.id) return ReviewScheduler.fromIslands(islands);
+  const revision = profile.progress.reviewRevision || 0;
+  const cached = reviewSchedulers.get(profile.id);
+  if (cached && cached.revision === revision) return cached.scheduler;
+  const scheduler = ReviewScheduler.fromIslands(islands);
+  reviewSchedulers.set(profile.id, { revision, scheduler });
+  return scheduler;
 };
 
-// Вычислить срочность повторения (0-100, где 100 = очень срочно)
-const getReviewUrgency = (reviewData) => {
-  if (!reviewData || !reviewData.nextReview) return 0;
-  const today = new Date(getToday());
-  const nextReview = new Date(reviewData.nextReview);
-  const daysDiff = Math.floor((today - nextReview) / (1000 * 60 * 60 * 24));
+// Буквы к повторению сегодня на открытых островах, самые срочные первыми
+const getLettersToReview = (profile, k = Infinity) => {
+  const islands = profile?.progress?.islands || {};
+  return getReviewScheduler(profile).due(getTodayDay(), k, item => islands[item.islandNum]?.unlocked);
+};
 
-  if (daysDiff < 0) return 0; // Еще не время
-  if (daysDiff === 0) return 50; // Сегодня
-  if (daysDiff <= 2) return 75; // Просрочено на 1-2 дня
-  return 100; // Просрочено больше 2 дней
+// Буква пройдена: уровень мастерства растёт, следующее повторение — через
+// REVIEW_INTERVALS[уровень] дней. Ревизия повторений профиля растёт, а
+// актуальный планировщик профиля обновляется только для этой буквы.
+const practiceLetter = (profile, islandNum, letter, today) => {
+  const progress = profile.progress;
+  const reviewData = progress.islands[islandNum].reviewData;
+  const prev = reviewData[letter];
+  const data = prev
+    ? {
+        ...prev,
+        reviewCount: prev.reviewCount + 1,
+        successCount: prev.successCount + 1, // Считаем что завершили успешно
+        totalAttempts: prev.totalAttempts + 1,
+        lastPracticed: today,
+        masteryLevel: Math.min(prev.masteryLevel + 1, REVIEW_INTERVALS.length - 1),
+      }
+    : { masteryLevel: 0, reviewCount: 0, successCount: 0, totalAttempts: 0, lastPracticed: today };
+  const due = parseDay(today) + REVIEW_INTERVALS[Math.min(data.masteryLevel, REVIEW_INTERVALS.length - 1)];
+  data.nextReview = formatDay(due);
+  reviewData[letter] = data;
+  const revision = progress.reviewRevision || 0;
+  progress.reviewRevision = revision + 1;
+  const cached = reviewSchedulers.get(profile.id);
+  if (cached && cached.revision === revision) {
+    cached.scheduler.schedule(islandNum, letter, data, due);
+    cached.revision = progress.reviewRevision;
+  }
+  return data;
 };
 
 // Получить визуальное состояние "цветочка" для буквы
@@ -1060,6 +1234,76 @@ const Confetti = ({ active }) => {
   );
 };
 
+// ============ ИГРОВОЙ ЦИКЛ МИНИ-ИГР ============
+// Один requestAnimationFrame на все движущиеся мини-игры вместо пары
+// setInterval на каждую. Шаг получает прошедшее время (мс), поэтому скорость
+// не зависит от частоты кадров. Спрайты — объекты из пула в ref: координаты
+// меняются на месте и пишутся прямо в style узла, а React перерисовывается
+// только когда спрайт появился или исчез.
+
+const MAX_FRAME_MS = 100; // после паузы вкладки не «прыгаем» на всё пропущенное время
+
+const gameLoop = { steps: new Set(), frame: null, last: 0 };
+
+const runGameLoop = (now) => {
+  const dt = Math.min(MAX_FRAME_MS, now - gameLoop.last);
+  gameLoop.last = now;
+  gameLoop.steps.forEach(step => step(dt, now));
+  gameLoop.frame = gameLoop.steps.size > 0 ? requestAnimationFrame(runGameLoop) : null;
+};
+
+// Вызывать step(dt, now) каждый кадр, пока active; step может меняться между рендерами
+const useGameLoop = (step, active = true) => {
+  const stepRef = useRef(step);
+  stepRef.current = step;
+  useEffect(() => {
+    if (!active) return;
+    const run = (dt, now) => stepRef.current(dt, now);
+    gameLoop.steps.add(run);
+    if (gameLoop.frame === null) {
+      gameLoop.last = performance.now();
+      gameLoop.frame = requestAnimationFrame(runGameLoop);
+    }
+    return () => {
+      gameLoop.steps.delete(run);
+      if (gameLoop.steps.size === 0 && gameLoop.frame !== null) {
+        cancelAnimationFrame(gameLoop.frame);
+        gameLoop.frame = null;
+      }
+    };
+  }, [active]);
+};
+
+// Пул спрайтов: active — живые (порядок = порядок отрисовки), free — готовые
+// к переиспользованию. id новый при каждой выдаче — это key для React.
+const useSpritePool = () => {
+  const ref = useRef(null);
+  if (!ref.current) ref.current = { active: [], free: [], nextId: 1 };
+  return ref.current;
+};
+
+const acquireSprite = (pool, props) => {
+  const sprite = pool.free.pop() || {};
+  Object.assign(sprite, props, { id: pool.nextId++, node: null });
+  pool.active.push(sprite);
+  return sprite;
+};
+
+const releaseSprite = (pool, sprite) => {
+  const i = pool.active.indexOf(sprite);
+  if (i === -1) return false;
+  pool.active.splice(i, 1);
+  sprite.node = null;
+  pool.free.push(sprite);
+  return true;
+};
+
+// Перерисовать компонент после появления/исчезновения спрайтов
+const useCommit = () => {
+  const [, setVersion] = useState(0);
+  return useCallback(() => setVersion(v => v + 1), []);
+};
+
 // ============ МИНИ-ИГРЫ ДЛЯ МАШИНОК ============
 
 const ALL_LETTERS = [...VOWELS_HARD, ...VOWELS_SOFT, ...CONSONANTS];
@@ -1734,8 +1978,13 @@ const DeliveryGame = ({ car, onComplete, onBack }) => {
 };
 
 // 🏎️ Игра 8: Гонка - собирай буквы на скорость
+const RACE_SPAWN_MS = 2000;
+const RACE_SPEED = 0.08; // % высоты трассы за мс (было 8% каждые 100 мс)
+
 const RaceGame = ({ car, onComplete, onBack }) => {
-  const [letters, setLetters] = useState([]);
+  const letters = useSpritePool();
+  const spawnTimer = useRef(0);
+  const commit = useCommit();
   const [carPos, setCarPos] = useState(1);
   const [score, setScore] = useState(0);
   const [timeLeft, setTimeLeft] = useState(20);
@@ -1745,48 +1994,46 @@ const RaceGame = ({ car, onComplete, onBack }) => {
   const speak = useSpeak();
   const sounds = useSounds();
 
-  const spawnLetters = useCallback(() => {
+  const spawnLetters = () => {
     const correct = ALL_LETTERS[Math.floor(Math.random() * ALL_LETTERS.length)];
-    const lanes = [0, 1, 2].map(lane => ({
-      id: Date.now() + lane,
-      lane,
-      letter: lane === Math.floor(Math.random() * 3) ? correct : ALL_LETTERS[Math.floor(Math.random() * ALL_LETTERS.length)],
-      y: -10,
-      isCorrect: false,
-    }));
-    lanes[Math.floor(Math.random() * 3)].isCorrect = true;
-    lanes[Math.floor(Math.random() * 3)].letter = correct;
-    setLetters(prev => [...prev, ...lanes.map(l => ({ ...l, isCorrect: l.letter === correct }))]);
+    const correctLane = Math.floor(Math.random() * 3);
+    for (let lane = 0; lane < 3; lane++) {
+      const letter = lane === correctLane ? correct : ALL_LETTERS[Math.floor(Math.random() * ALL_LETTERS.length)];
+      acquireSprite(letters, { lane, letter, y: -10, isCorrect: letter === correct });
+    }
     speak(correct);
-  }, [speak]);
-
-  useEffect(() => {
-    if (gameOver) return;
-    const spawn = setInterval(spawnLetters, 2000);
-    return () => clearInterval(spawn);
-  }, [spawnLetters, gameOver]);
+  };
 
-  useEffect(() => {
-    if (gameOver) return;
-    const move = setInterval(() => {
-      setLetters(prev => {
-        const updated = prev.map(l => ({ ...l, y: l.y + 8 })).filter(l => l.y < 100);
-        // Check collision
-        updated.forEach(l => {
-          if (l.y > 70 && l.y < 90 && l.lane === carPos) {
-            if (l.isCorrect) {
-              sounds.playCorrect();
-              setScore(s => s + 1);
-            } else {
-              sounds.playWrong();
-            }
-          }
-        });
-        return updated.filter(l => l.y < 80 || l.lane !== carPos);
-      });
-    }, 100);
-    return () => clearInterval(move);
-  }, [carPos, gameOver]);
+  useGameLoop((dt) => {
+    let changed = false;
+    spawnTimer.current += dt;
+    if (spawnTimer.current >= RACE_SPAWN_MS) {
+      spawnTimer.current -= RACE_SPAWN_MS;
+      spawnLetters();
+      changed = true;
+    }
+    for (let i = letters.active.length - 1; i >= 0; i--) {
+      const l = letters.active[i];
+      l.y += RACE_SPEED * dt;
+      // Буква в полосе машинки доехала до неё — засчитываем один раз
+      if (l.y > 70 && l.y < 90 && l.lane === carPos) {
+        if (l.isCorrect) {
+          sounds.playCorrect();
+          setScore(s => s + 1);
+        } else {
+          sounds.playWrong();
+        }
+        releaseSprite(letters, l);
+        changed = true;
+      } else if (l.y >= 100) {
+        releaseSprite(letters, l);
+        changed = true;
+      } else if (l.node) {
+        l.node.style.top = `${l.y}%`;
+      }
+    }
+    if (changed) commit();
+  }, !gameOver);
 
   useEffect(() => {
     if (gameOver) return;
@@ -1832,13 +2079,14 @@ const RaceGame = ({ car, onComplete, onBack }) => {
         </div>
 
         {/* Letters */}
-        {letters.map(l => (
+        {letters.active.map(l => (
           <div
             key={l.id}
-            className={`absolute w-12 h-12 rounded-full flex items-center justify-center text-xl font-bold transition-all ${
+            ref={node => { l.node = node; }}
+            className={`absolute w-12 h-12 rounded-full flex items-center justify-center text-xl font-bold ${
               l.isCorrect ? 'bg-green-500 text-white' : 'bg-red-500 text-white'
             }`}
-            style={{ left: `${15 + l.lane * 33}%`, top: `${l.y}%` }}
+            style={{ left: `${15 + l.lane * 33}%`, top: `${l.y}%`, willChange: 'top' }}
           >
             {l.letter}
           </div>
@@ -2647,22 +2895,8 @@ const ParentDashboard = ({ profile, onBack }) => {
     return sum + (island.stories || []).length;
   }, 0);
 
-  // Подсчет букв для повторения
-  const lettersNeedingReview = [];
-  Object.keys(profile.progress.islands || {}).forEach(islandNum => {
-    const islandProg = profile.progress.islands[islandNum];
-    if (!islandProg.unlocked) return;
-
-    const island = ISLANDS[islandNum];
-    const allLetters = [...island.vowels, ...island.consonants];
-
-    allLetters.forEach(letter => {
-      const reviewData = islandProg.reviewData?.[letter];
-      if (reviewData && needsReview(reviewData)) {
-        lettersNeedingReview.push({ letter, islandNum, reviewData, urgency: getReviewUrgency(reviewData) });
-      }
-    });
-  });
+  // Буквы для повторения (уже по убыванию срочности)
+  const lettersNeedingReview = getLettersToReview(profile);
 
   // Статистика активности
   const stats = Object.entries(profile.stats || {}).sort((a, b) => b[0].localeCompare(a[0])).slice(0, 7);
@@ -2840,7 +3074,7 @@ const ParentDashboard = ({ profile, onBack }) => {
               </div>
             ) : (
               <div className="space-y-2">
-                {lettersNeedingReview.sort((a, b) => b.urgency - a.urgency).map(({ letter, islandNum, reviewData, urgency }) => {
+                {lettersNeedingReview.map(({ letter, islandNum, data: reviewData, urgency }) => {
                   const island = ISLANDS[islandNum];
                   const flower = getFlowerState(urgency);
                   const daysSince = Math.floor((new Date() - new Date(reviewData.lastPracticed)) / (1000 * 60 * 60 * 24));
@@ -3267,8 +3501,13 @@ const SyllableTable = ({ consonant, onComplete, onBack }) => {
   );
 };
 
+const BUBBLE_SPAWN_MS = 900;
+const BUBBLE_MAX = 6;
+
 const BubbleGame = ({ target: targetProp, pool, onComplete, onBack, profile, onLetterAttempt }) => {
-  const [bubbles, setBubbles] = useState([]);
+  const bubbles = useSpritePool();
+  const spawnTimer = useRef(0);
+  const commit = useCommit();
   const [score, setScore] = useState(0);
   const [showConfetti, setShowConfetti] = useState(false);
   const [wrongAttempts, setWrongAttempts] = useState(0);
@@ -3310,27 +3549,40 @@ const BubbleGame = ({ target: targetProp, pool, onComplete, onBack, profile, onL
     ? adaptivePool.current.filter(l => l !== target)
     : pool;
 
-  useEffect(() => {
-    const i = setInterval(() => {
-      if (bubbles.length < 6) {
+  useGameLoop((dt) => {
+    let changed = false;
+    spawnTimer.current += dt;
+    if (spawnTimer.current >= BUBBLE_SPAWN_MS) {
+      spawnTimer.current -= BUBBLE_SPAWN_MS;
+      if (bubbles.active.length < BUBBLE_MAX) {
         const poolSrc = effectivePool.length ? effectivePool : pool;
         const v = Math.random() > 0.5 ? target : poolSrc[Math.floor(Math.random() * poolSrc.length)];
-        setBubbles(p => [...p, { id: Date.now() + Math.random(), value: v, x: 8 + Math.random() * 78, y: 105, speed: 0.3 + Math.random() * 0.25 }]);
+        // speed — % высоты за 50 мс, как у прежнего интервала
+        acquireSprite(bubbles, { value: v, x: 8 + Math.random() * 78, y: 105, speed: 0.3 + Math.random() * 0.25 });
+        changed = true;
       }
-    }, 900);
-    return () => clearInterval(i);
-  }, [bubbles.length, target, pool, effectivePool]);
-
-  useEffect(() => {
-    const i = setInterval(() => setBubbles(p => p.map(b => ({ ...b, y: b.y - b.speed })).filter(b => b.y > -10)), 50);
-    return () => clearInterval(i);
-  }, []);
+    }
+    for (let i = bubbles.active.length - 1; i >= 0; i--) {
+      const b = bubbles.active[i];
+      b.y -= b.speed * dt / 50;
+      if (b.y <= -10) {
+        releaseSprite(bubbles, b);
+        changed = true;
+      } else if (b.node) {
+        b.node.style.top = `${b.y}%`;
+      }
+    }
+    if (changed) commit();
+  });
 
-  const pop = (b) => {
+  const pop = (id, value) => {
     if (busyRef.current) return;
-    speak(b.value);
-    setBubbles(p => p.filter(x => x.id !== b.id));
-    if (b.value === target) {
+    const sprite = bubbles.active.find(x => x.id === id);
+    if (!sprite) return; // уже улетел
+    speak(value);
+    releaseSprite(bubbles, sprite);
+    commit();
+    if (value === target) {
       // Статистика: правильно лопнули target
       if (onLetterAttempt && typeof target === 'string' && target.length === 1) {
         onLetterAttempt(target, true);
@@ -3375,21 +3627,23 @@ const BubbleGame = ({ target: targetProp, pool, onComplete, onBack, profile, onL
         <span className="text-white bg-white/30 rounded-full px-3 py-2 text-sm">⭐{score}/{targetScore}</span>
       </div>
       <div className="absolute inset-0 top-16">
-        {bubbles.map(b => {
-          const isTarget = b.value === target;
+        {bubbles.active.map(b => {
+          const { id, value } = b;
+          const isTarget = value === target;
           const shouldHighlight = showHint && isTarget;
 
           return (
             <button
-              key={b.id}
-              onClick={() => pop(b)}
-              className={`absolute w-20 h-20 rounded-full flex items-center justify-center text-xl font-bold shadow-lg transition-all ${
+              key={id}
+              ref={node => { b.node = node; }}
+              onClick={() => pop(id, value)}
+              className={`absolute w-20 h-20 rounded-full flex items-center justify-center text-xl font-bold shadow-lg transition ${
                 shouldHighlight ? 'bg-green-400 text-white animate-pulse ring-4 ring-green-300 scale-125' :
                 'bg-white/90 hover:scale-110'
               }`}
-              style={{ left: `${b.x}%`, top: `${b.y}%`, transform: 'translate(-50%, -50%)' }}
+              style={{ left: `${b.x}%`, top: `${b.y}%`, transform: 'translate(-50%, -50%)', willChange: 'top' }}
             >
-              {b.value}
+              {value}
             </button>
           );
         })}
@@ -4466,33 +4720,14 @@ const ReviewScreen = ({ profile, onReviewLetter, onBack }) => {
     speak('Сад букв');
   }, [speak]);
 
-  // Собираем все буквы для повторения из всех островов
-  const lettersToReview = [];
-  Object.keys(profile.progress.islands || {}).forEach(islandNum => {
-    const islandProgress = profile.progress.islands[islandNum];
-    if (!islandProgress.unlocked) return;
-
-    const island = ISLANDS[islandNum];
-    const allLetters = [...island.vowels, ...island.consonants];
-
-    allLetters.forEach(letter => {
-      const reviewData = islandProgress.reviewData?.[letter];
-      if (reviewData && needsReview(reviewData)) {
-        const urgency = getReviewUrgency(reviewData);
-        const flower = getFlowerState(urgency);
-        lettersToReview.push({
-          letter,
-          islandNum,
-          urgency,
-          flower,
-          reviewData,
-        });
-      }
-    });
-  });
-
-  // Сортируем по срочности (самые срочные первые)
-  lettersToReview.sort((a, b) => b.urgency - a.urgency);
+  // Буквы для повторения со всех открытых островов, самые срочные первыми
+  const lettersToReview = getLettersToReview(profile).map(item => ({
+    letter: item.letter,
+    islandNum: item.islandNum,
+    urgency: item.urgency,
+    flower: getFlowerState(item.urgency),
+    reviewData: item.data,
+  }));
 
   return (
     <div className="min-h-screen bg-gradient-to-b from-green-100 to-green-300 p-4">
@@ -4594,22 +4829,8 @@ const MapScreen = ({ profile, onSelect, onEvolution, onStats, onReview, onParent
     5: { unlocked: false, completed: false, letters: {}, stories: [] },
   };
 
-  // Вычисляем количество букв для повторения
-  let reviewCount = 0;
-  Object.keys(profile.progress.islands || {}).forEach(islandNum => {
-    const islandProg = profile.progress.islands[islandNum];
-    if (!islandProg.unlocked) return;
-
-    const island = ISLANDS[islandNum];
-    const allLetters = [...island.vowels, ...island.consonants];
-
-    allLetters.forEach(letter => {
-      const reviewData = islandProg.reviewData?.[letter];
-      if (reviewData && needsReview(reviewData)) {
-        reviewCount++;
-      }
-    });
-  });
+  // Количество букв для повторения
+  const reviewCount = getLettersToReview(profile).length;
 
   return (
     <div className="min-h-screen bg-gradient-to-b from-sky-400 to-indigo-500 p-3 flex flex-col">
@@ -4970,15 +5191,50 @@ function ReadingGame() {
     load();
   }, []);
 
+  // Версия профиля, которая уже есть на сервере: сохраняем только разницу с ней.
+  // Первое сохранение после выбора профиля уходит через PUT: сервер заменяет
+  // каждое присланное поле верхнего уровня целиком ({ ...old, ...changes }),
+  // поэтому progress, дополненный локально (см. загрузку профилей), ложится
+  // как есть. Merge patch слил бы вложенные объекты с серверными, и ключи,
+  // которых у клиента уже нет, остались бы на сервере.
+  const savedProfileRef = useRef(null);
+  // Сохранения идут строго по одному: каждое считает разницу от снимка,
+  // отправленного предыдущим, и запросы не обгоняют друг друга
+  const syncQueueRef = useRef(Promise.resolve());
+
+  const sendProfile = async (profile) => {
+    const saved = savedProfileRef.current;
+    const first = !saved || saved.id !== profile.id;
+    const body = first ? profile : createMergePatch(saved, profile);
+    if (!first && Object.keys(body).length === 0) return;
+    // Снимок, а не ссылка: следующий профиль делит с этим вложенные объекты
+    // (progress и др.), и со ссылкой разница с ним выходила бы пустой
+    savedProfileRef.current = JSON.parse(JSON.stringify(profile));
+    try {
+      const response = await fetch(`/api/profiles/${profile.id}`, {
+        method: first ? 'PUT' : 'PATCH',
+        headers: { 'Content-Type': first ? 'application/json' : 'application/merge-patch+json' },
+        body: JSON.stringify(body),
+      });
+      if (!response.ok) throw new Error(`${first ? 'PUT' : 'PATCH'} failed: ${response.status}`);
+    } catch (e) {
+      // Что дошло до сервера — неизвестно: следующее сохранение уйдёт целиком
+      savedProfileRef.current = null;
+      throw e;
+    }
+  };
+
+  const syncProfile = (profile) => {
+    const run = syncQueueRef.current.then(() => sendProfile(profile));
+    syncQueueRef.current = run.catch(() => {});
+    return run;
+  };
+
   // Debounced persistence прогресса (страховка + localStorage fallback)
   useEffect(() => {
     if (!currentProfile?.id) return;
     const t = setTimeout(() => {
-      fetch(`/api/profiles/${currentProfile.id}`, {
-        method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(currentProfile),
-      }).catch(() => {
+      syncProfile(currentProfile).catch(() => {
         try { localStorage.setItem(`chitayka-profile-${currentProfile.id}`, JSON.stringify(currentProfile)); } catch {}
       });
     }, 500);
@@ -5007,7 +5263,7 @@ function ReadingGame() {
   // Обновление профиля через API
   const updateProfile = async (updated) => {
     try {
-      await updateProfileAPI(updated.id, updated);
+      await syncProfile(updated);
       const np = profiles.map(p => p.id === updated.id ? updated : p);
       setProfiles(np);
       setCurrentProfile(updated);
@@ -5016,9 +5272,20 @@ function ReadingGame() {
     }
   };
 
+  // Для событий ответов: чей ответ, сколько он занял (с показа экрана или
+  // с прошлого ответа) и сколько ошибок было до него
+  const profileIdRef = useRef(null);
+  const lastAttemptRef = useRef({ at: Date.now(), wrong: 0 });
+  useEffect(() => { profileIdRef.current = currentProfile?.id || null; }, [currentProfile?.id]);
+  useEffect(() => { lastAttemptRef.current = { at: Date.now(), wrong: 0 }; }, [screen]);
+
   // Adaptive repetition: запись попытки по букве. Персистится через debounced useEffect на currentProfile.
   const handleLetterAttempt = useCallback((letter, isCorrect) => {
     if (!letter || typeof letter !== 'string' || letter.length !== 1) return;
+    const now = Date.now();
+    const last = lastAttemptRef.current;
+    logAnswerEvent(profileIdRef.current, { k: letter, ok: isCorrect, ms: now - last.at, a: last.wrong });
+    lastAttemptRef.current = { at: now, wrong: isCorrect ? 0 : last.wrong + 1 };
     setCurrentProfile(p => {
       if (!p) return p;
       return { ...p, letterStats: recordLetterAttempt(p.letterStats || {}, letter, isCorrect) };
@@ -5120,24 +5387,7 @@ function ReadingGame() {
       islandProgress.letters[data] = true;
 
       // Обновление данных для spaced repetition
-      if (!islandProgress.reviewData[data]) {
-        islandProgress.reviewData[data] = {
-          masteryLevel: 0,
-          reviewCount: 0,
-          successCount: 0,
-          totalAttempts: 0,
-          lastPracticed: today,
-          nextReview: calculateNextReview(0),
-        };
-      } else {
-        const reviewData = islandProgress.reviewData[data];
-        reviewData.reviewCount += 1;
-        reviewData.successCount += 1; // Считаем что завершили успешно
-        reviewData.totalAttempts += 1;
-        reviewData.lastPracticed = today;
-        reviewData.masteryLevel = Math.min(reviewData.masteryLevel + 1, REVIEW_INTERVALS.length - 1);
-        reviewData.nextReview = calculateNextReview(reviewData.masteryLevel);
-      }
+      practiceLetter(updated, islandNum, data, today);
     } else if (activityType === 'word') {
       const wordData = island.words[data];
       if (!islandProgress.words.includes(wordData.display)) {
@@ -5303,13 +5553,7 @@ function ReadingGame() {
 
     // Обновление reviewData
     if (islandProgress.reviewData && islandProgress.reviewData[letter]) {
-      const reviewData = islandProgress.reviewData[letter];
-      reviewData.reviewCount += 1;
-      reviewData.successCount += 1;
-      reviewData.totalAttempts += 1;
-      reviewData.lastPracticed = today;
-      reviewData.masteryLevel = Math.min(reviewData.masteryLevel + 1, REVIEW_INTERVALS.length - 1);
-      reviewData.nextReview = calculateNextReview(reviewData.masteryLevel);
+      practiceLetter(updated, islandNum, letter, today);
     }
 
     await updateProfile(updated);
@@ -0,0 +1,69 @@
+// Сборка игр: JSX/TSX → минифицированный JS с хэшем содержимого в имени.
+// Результат кладётся в dist/, а dist/manifest.json связывает исходник с бандлом:
+//   { "number-racing.tsx": "/dist/number-racing.3f9c2a71be.js", ... }
+// game-loader.js читает манифест; без него игры компилируются Babel в браузере.
+// Рядом с бандлом кладутся сжатые версии .br и .gz — сервер отдаёт их как есть.
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+const babel = require('@babel/core');
+const { minify } = require('terser');
+const { compress, ENCODINGS } = require('./compress');
+
+const ROOT = path.join(__dirname, '..');
+const DIST = path.join(ROOT, 'dist');
+const GAMES = ['number-racing.tsx', 'reading-game.tsx', 'number-island.tsx'];
+
+// Те же настройки, что и у Babel standalone в браузере (iOS Safari 12+)
+const BABEL_OPTIONS = {
+  babelrc: false,
+  configFile: false,
+  sourceType: 'script',
+  presets: [
+    require.resolve('@babel/preset-react'),
+    [require.resolve('@babel/preset-env'), { targets: { safari: '12' } }],
+  ],
+};
+
+async function buildGame(source) {
+  const file = path.join(ROOT, source);
+  const code = fs.readFileSync(file, 'utf8');
+
+  const compiled = await babel.transformAsync(code, { ...BABEL_OPTIONS, filename: file });
+  // Игры — обычные скрипты с глобальными именами, поэтому toplevel не трогаем
+  const minified = await minify(compiled.code, { compress: true, mangle: true, toplevel: false });
+
+  const hash = crypto.createHash('sha256').update(minified.code).digest('hex').slice(0, 10);
+  const base = path.basename(source, path.extname(source));
+  const outName = `${base}.${hash}.js`;
+
+  // Удаляем старые бандлы этой игры вместе со сжатыми версиями
+  for (const old of fs.readdirSync(DIST)) {
+    if (old.startsWith(`${base}.`) && /\.js(\.br|\.gz)?$/.test(old) && !old.startsWith(outName)) {
+      fs.unlinkSync(path.join(DIST, old));
+    }
+  }
+  const out = path.join(DIST, outName);
+  fs.writeFileSync(out, minified.code);
+  const sizes = await Promise.all(ENCODINGS.map(async ({ name, ext }) => {
+    const body = await compress(name, Buffer.from(minified.code));
+    fs.writeFileSync(out + ext, body);
+    return `${name} ${(body.length / 1024).toFixed(0)} KB`;
+  }));
+
+  console.log(`  ${source} → dist/${outName} (${(code.length / 1024).toFixed(0)} KB → ${(minified.code.length / 1024).toFixed(0)} KB, ${sizes.join(', ')})`);
+  return [source, `/dist/${outName}`];
+}
+
+async function main() {
+  fs.mkdirSync(DIST, { recursive: true });
+  console.log('📦 Сборка игр...');
+  const manifest = Object.fromEntries(await Promise.all(GAMES.map(buildGame)));
+  fs.writeFileSync(path.join(DIST, 'manifest.json'), JSON.stringify(manifest, null, 2));
+  console.log('✅ dist/manifest.json обновлён');
+}
+
+main().catch(err => {
+  console.error('❌ Ошибка сборки:', err);
+  process.exit(1);
+});
@@ -0,0 +1,30 @@
+// Сжатие статики Brotli и gzip с максимальным уровнем.
+// Общее для сборки (scripts/build-games.js кладёт .br/.gz рядом с бандлом)
+// и сервера (server/precompressed.js), поэтому лежит в scripts/ — каталог
+// есть и на стадии сборки Docker-образа, и в итоговом образе.
+// Сжатие асинхронное: Brotli q11 идёт в пуле потоков libuv и не держит
+// цикл событий сервера.
+const util = require('util');
+const zlib = require('zlib');
+
+const brotliCompress = util.promisify(zlib.brotliCompress);
+const gzip = util.promisify(zlib.gzip);
+
+const ENCODINGS = [
+  { name: 'br', ext: '.br' },
+  { name: 'gzip', ext: '.gz' },
+];
+
+function compress(encoding, data) {
+  if (encoding === 'br') {
+    return brotliCompress(data, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+      },
+    });
+  }
+  return gzip(data, { level: zlib.constants.Z_BEST_COMPRESSION });
+}
+
+module.exports = { compress, ENCODINGS };
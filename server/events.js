@@ -0,0 +1,174 @@
+// Журнал событий ответов (append-only, по строке JSON на событие).
+//
+// Игры копят события ответов у себя и присылают их пачками
+// (POST /api/events). Приём дешёвый: события только дописываются в конец
+// файла, пачки, пришедшие во время записи, уходят следующим одним append
+// (group commit). Профиль при этом не трогается.
+//
+// Сводки по профилю (ответы, ошибки, среднее время, слабые темы) строятся из
+// журнала по запросу. Журнал читается инкрементально: сводки всех профилей
+// держатся в памяти вместе со смещением, до которого файл уже прочитан,
+// и каждый следующий запрос дочитывает только новый хвост.
+//
+// Строка журнала:
+//   {"p":"<id профиля>","t":1700000000000,"g":"number-racing","k":"count:5","ok":0,"ms":2300,"a":1}
+//   p — профиль, t — время ответа, g — игра, k — тема (задание, буква),
+//   ok — верно/неверно, a — номер попытки (0 — первая),
+//   ms — время на эту попытку: от показа задания для первой попытки,
+//   от предыдущей попытки для повторных (одинаково во всех играх)
+const fs = require('fs').promises;
+
+const MAX_BATCH = 500;
+const MAX_KEY_LENGTH = 64;
+const MAX_ANSWER_MS = 10 * 60 * 1000;
+const WEAK_TOPICS_LIMIT = 10;
+
+const isShortString = v => typeof v === 'string' && v.length > 0 && v.length <= MAX_KEY_LENGTH;
+
+// Событие от клиента → строка журнала; null — событие отброшено
+function normalizeEvent(profileId, event, now) {
+  if (!event || typeof event !== 'object' || !isShortString(event.g) || !isShortString(event.k)) {
+    return null;
+  }
+  const line = {
+    p: profileId,
+    t: Number.isFinite(event.t) && event.t > 0 && event.t <= now + 60000 ? Math.round(event.t) : now,
+    g: event.g,
+    k: event.k,
+    ok: event.ok ? 1 : 0,
+  };
+  if (Number.isFinite(event.ms) && event.ms >= 0 && event.ms <= MAX_ANSWER_MS) line.ms = Math.round(event.ms);
+  if (Number.isInteger(event.a) && event.a >= 0) line.a = event.a;
+  return line;
+}
+
+const emptyCounters = () => ({ answers: 0, correct: 0, wrong: 0, timed: 0, totalMs: 0 });
+
+function count(counters, event) {
+  counters.answers += 1;
+  if (event.ok) counters.correct += 1;
+  else counters.wrong += 1;
+  if (event.ms !== undefined) {
+    counters.timed += 1;
+    counters.totalMs += event.ms;
+  }
+}
+
+const publicCounters = ({ answers, correct, wrong, timed, totalMs }) => ({
+  answers, correct, wrong, avgMs: timed ? Math.round(totalMs / timed) : null,
+});
+
+class EventLog {
+  constructor(file) {
+    this.file = file;
+    this.pending = [];      // строки, ждущие записи
+    this.waiters = [];      // { resolve, reject } пачек из pending
+    this.writing = null;    // Promise текущей записи
+    this.offset = 0;        // до этого байта журнал уже учтён в сводках
+    this.profiles = new Map(); // id → игра → { ...счётчики, topics, lastAt }
+    this.reading = null;    // Promise текущего дочитывания
+  }
+
+  // Дописать пачку; промис выполняется, когда она на диске
+  append(profileId, events) {
+    const now = Date.now();
+    const lines = [];
+    for (const event of events) {
+      const line = normalizeEvent(String(profileId), event, now);
+      if (line) lines.push(JSON.stringify(line));
+    }
+    if (lines.length === 0) return Promise.resolve(0);
+    this.pending.push(...lines);
+    const written = new Promise((resolve, reject) => this.waiters.push({ resolve, reject }))
+      .then(() => lines.length);
+    if (!this.writing) this.writing = this.writePending();
+    return written;
+  }
+
+  async writePending() {
+    while (this.pending.length > 0) {
+      const lines = this.pending;
+      const waiters = this.waiters;
+      this.pending = [];
+      this.waiters = [];
+      try {
+        await fs.appendFile(this.file, lines.join('\n') + '\n');
+        waiters.forEach(w => w.resolve());
+      } catch (error) {
+        waiters.forEach(w => w.reject(error));
+      }
+    }
+    this.writing = null;
+  }
+
+  // Дождаться записи всего принятого (при остановке сервера)
+  async flush() {
+    while (this.writing) await this.writing;
+  }
+
+  // Сводка по профилю: { games: { <игра>: { answers, correct, wrong, avgMs, weakTopics, lastAt } } }
+  async summary(profileId) {
+    await this.catchUp();
+    const games = {};
+    for (const [game, stats] of this.profiles.get(String(profileId)) || []) {
+      const weakTopics = Array.from(stats.topics)
+        .filter(([, t]) => t.wrong > 0)
+        .sort((a, b) => b[1].wrong - a[1].wrong || b[1].answers - a[1].answers)
+        .slice(0, WEAK_TOPICS_LIMIT)
+        .map(([key, t]) => ({ key, ...publicCounters(t) }));
+      games[game] = { ...publicCounters(stats), weakTopics, lastAt: stats.lastAt };
+    }
+    return { profileId: String(profileId), games };
+  }
+
+  // Дочитать хвост журнала после offset и учесть его в сводках
+  async catchUp() {
+    await this.flush();
+    while (this.reading) await this.reading;
+    this.reading = this.readTail().finally(() => { this.reading = null; });
+    await this.reading;
+  }
+
+  async readTail() {
+    let handle;
+    try {
+      handle = await fs.open(this.file, 'r');
+    } catch (error) {
+      if (error.code === 'ENOENT') return;
+      throw error;
+    }
+    try {
+      const { size } = await handle.stat();
+      if (size <= this.offset) return;
+      const buffer = Buffer.alloc(size - this.offset);
+      await handle.read(buffer, 0, buffer.length, this.offset);
+      // Учитываем только целые строки; недописанная останется на следующий раз
+      const end = buffer.lastIndexOf(0x0a) + 1;
+      for (const text of buffer.toString('utf8', 0, end).split('\n')) {
+        if (text) this.apply(text);
+      }
+      this.offset += end;
+    } finally {
+      await handle.close();
+    }
+  }
+
+  apply(text) {
+    let event;
+    try {
+      event = JSON.parse(text);
+    } catch (error) {
+      return; // битая строка (например, после падения посреди записи)
+    }
+    if (!this.profiles.has(event.p)) this.profiles.set(event.p, new Map());
+    const games = this.profiles.get(event.p);
+    if (!games.has(event.g)) games.set(event.g, { ...emptyCounters(), topics: new Map(), lastAt: 0 });
+    const stats = games.get(event.g);
+    count(stats, event);
+    if (!stats.topics.has(event.k)) stats.topics.set(event.k, emptyCounters());
+    count(stats.topics.get(event.k), event);
+    stats.lastAt = Math.max(stats.lastAt, event.t);
+  }
+}
+
+module.exports = { EventLog, MAX_BATCH };
@@ -0,0 +1,182 @@
+// Раздача заранее сжатых версий статики (Brotli и gzip).
+//
+// Исходники игр (.tsx) и бандлы весят сотни килобайт, а сжимать их на каждый
+// запрос — лишняя работа процессора. Поэтому сжатые версии готовятся один раз:
+//   - npm run build кладёт рядом с бандлом <файл>.br и <файл>.gz;
+//   - для остальных файлов (или если сборка устарела) версии сжимаются
+//     асинхронно при старте (warm) или после первого запроса и живут в памяти,
+//     пока не изменится mtime файла. Пока версии нет, запрос уходит дальше
+//     к express.static и получает файл без сжатия.
+// Кэш ограничен по объёму (maxBytes), давно не запрошенные файлы вытесняются.
+// Раздаются только файлы, подходящие под match; пути с сегментами на точку
+// (.git, .env, ..) отклоняются всегда, как dotfiles: 'ignore' у express.static.
+// Кодировка выбирается по Accept-Encoding (br, затем gzip, иначе — как есть),
+// ответ всегда помечается Vary: Accept-Encoding, у каждой кодировки свой ETag.
+const fs = require('fs');
+const path = require('path');
+const { compress, ENCODINGS } = require('../scripts/compress');
+
+const COMPRESSIBLE = /\.(tsx|ts|jsx|js|json|css|svg)$/;
+const MIN_SIZE = 1024; // мельче — заголовки дороже выигрыша
+const MAX_BYTES = 64 * 1024 * 1024; // все версии всех файлов в памяти
+
+// q-значения из Accept-Encoding: { br: 1, gzip: 0.8, '*': 0 }
+function parseAcceptEncoding(header) {
+  const weights = {};
+  for (const part of String(header || '').split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    if (!name) continue;
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+    weights[name] = q ? parseFloat(q.slice(2)) || 0 : 1;
+  }
+  return weights;
+}
+
+function chooseEncoding(header) {
+  const weights = parseAcceptEncoding(header);
+  let best = null;
+  let bestQ = 0;
+  for (const { name } of ENCODINGS) {
+    const q = name in weights ? weights[name] : weights['*'] || 0;
+    if (q > bestQ) {
+      best = name;
+      bestQ = q;
+    }
+  }
+  return best;
+}
+
+// Кэш сжатых версий: путь → { mtimeMs, bytes, variants: { identity, br, gzip } }.
+// Порядок Map — порядок последнего обращения, первым вытесняется самый старый.
+class VariantCache {
+  constructor({ maxBytes = MAX_BYTES } = {}) {
+    this.maxBytes = maxBytes;
+    this.bytes = 0;
+    this.entries = new Map();
+    this.pending = new Map(); // путь → Promise сборки
+  }
+
+  // Готовая запись для актуальной версии файла или null. Если записи нет
+  // или файл изменился, она собирается в фоне — этот запрос её не ждёт.
+  async get(file) {
+    const stat = await fs.promises.stat(file).catch(() => null);
+    if (!stat || !stat.isFile() || stat.size < MIN_SIZE) return null;
+    const cached = this.entries.get(file);
+    if (cached && cached.mtimeMs === stat.mtimeMs) {
+      this.entries.delete(file);
+      this.entries.set(file, cached);
+      return cached;
+    }
+    this.load(file, stat).catch(error => console.error(`Error compressing ${file}:`, error));
+    return null;
+  }
+
+  load(file, stat) {
+    const running = this.pending.get(file);
+    if (running) return running;
+    const promise = this.build(file, stat).finally(() => this.pending.delete(file));
+    this.pending.set(file, promise);
+    return promise;
+  }
+
+  async build(file, stat) {
+    const data = await fs.promises.readFile(file);
+    const tag = `${stat.size.toString(16)}-${Math.floor(stat.mtimeMs).toString(16)}`;
+    const variants = { identity: { body: data, etag: `"${tag}"` } };
+    let bytes = data.length;
+    for (const { name, ext } of ENCODINGS) {
+      const body = (await this.readPrebuilt(file + ext, stat)) || (await compress(name, data));
+      variants[name] = { body, etag: `"${tag}-${name}"` };
+      bytes += body.length;
+    }
+    const entry = { mtimeMs: stat.mtimeMs, bytes, variants };
+    this.set(file, entry);
+    return entry;
+  }
+
+  set(file, entry) {
+    const old = this.entries.get(file);
+    if (old) {
+      this.entries.delete(file);
+      this.bytes -= old.bytes;
+    }
+    if (entry.bytes > this.maxBytes) return;
+    this.entries.set(file, entry);
+    this.bytes += entry.bytes;
+    for (const [oldest, { bytes }] of this.entries) {
+      if (this.bytes <= this.maxBytes) break;
+      this.entries.delete(oldest);
+      this.bytes -= bytes;
+    }
+  }
+
+  // Версия из npm run build, если она не старше исходного файла
+  async readPrebuilt(file, sourceStat) {
+    const stat = await fs.promises.stat(file).catch(() => null);
+    if (!stat || stat.mtimeMs < sourceStat.mtimeMs) return null;
+    return fs.promises.readFile(file);
+  }
+
+  // Сжать заранее, чтобы первый посетитель не ждал Brotli. Файлы идут по
+  // одному, чтобы не занять весь пул потоков libuv
+  async warm(files) {
+    for (const file of files) {
+      try {
+        const stat = await fs.promises.stat(file);
+        if (stat.isFile() && stat.size >= MIN_SIZE) await this.load(file, stat);
+      } catch (error) {
+        console.error(`Error compressing ${file}:`, error);
+      }
+    }
+  }
+}
+
+// Middleware поверх каталога: как express.static, но только для файлов,
+// подходящих под match (путь относительно root, без ведущего /), и всегда
+// целиком (Range отдаёт следующий за ним express.static).
+// setHeaders(res, filePath) — те же правила кэширования, что и у express.static.
+function precompressed(root, { cache = new VariantCache(), match = COMPRESSIBLE, setHeaders } = {}) {
+  const serve = (req, res, file, entry) => {
+    const encoding = chooseEncoding(req.headers['accept-encoding']);
+    const variant = entry.variants[encoding || 'identity'];
+
+    res.setHeader('Vary', 'Accept-Encoding');
+    res.type(path.extname(file));
+    if (setHeaders) setHeaders(res, file);
+    res.setHeader('ETag', variant.etag);
+    res.setHeader('Last-Modified', new Date(entry.mtimeMs).toUTCString());
+    if (req.fresh) {
+      return res.status(304).end();
+    }
+    if (encoding) res.setHeader('Content-Encoding', encoding);
+    res.setHeader('Content-Length', variant.body.length);
+    if (req.method === 'HEAD') return res.end();
+    res.end(variant.body);
+  };
+
+  const middleware = (req, res, next) => {
+    if ((req.method !== 'GET' && req.method !== 'HEAD') || req.headers.range) return next();
+    let pathname;
+    try {
+      pathname = decodeURIComponent(req.path);
+    } catch (error) {
+      return next();
+    }
+    const segments = pathname.split('/').filter(Boolean);
+    if (segments.length === 0 || segments.some(segment => segment.startsWith('.') || segment.includes('\\'))) {
+      return next();
+    }
+    const relative = segments.join('/');
+    if (!COMPRESSIBLE.test(relative) || !match.test(relative)) return next();
+    const file = path.join(root, relative);
+    if (!file.startsWith(root + path.sep)) return next();
+
+    cache.get(file)
+      .then(entry => (entry ? serve(req, res, file, entry) : next()))
+      .catch(next);
+  };
+  middleware.cache = cache;
+  return middleware;
+}
+
+module.exports = { precompressed, VariantCache, chooseEncoding };
@@ -1,55 +1,219 @@
 const express = require('express');
 const cors = require('cors');
-const fs = require('fs').promises;
+const crypto = require('crypto');
+const fs = require('fs');
 const path = require('path');
+const { ProfileStore } = require('./store');
+const { precompressed } = require('./precompressed');
+const { EventLog, MAX_BATCH } = require('./events');
 
 const app = express();
 const PORT = process.env.PORT || 8081;
-const DATA_FILE = path.join(__dirname, 'data', 'profiles.json');
+const ROOT_DIR = path.join(__dirname, '..');
+// PROFILES_FILE позволяет тестам запускать сервер на временном файле данных
+const DATA_FILE = process.env.PROFILES_FILE
+  ? path.resolve(process.env.PROFILES_FILE)
+  : path.join(__dirname, 'data', 'profiles.json');
+// Профили хранятся по файлу на профиль; старый profiles.json переносится сюда
+// автоматически при первом запуске
+const DATA_DIR = process.env.PROFILES_DIR
+  ? path.resolve(process.env.PROFILES_DIR)
+  : path.join(path.dirname(DATA_FILE), 'profiles');
+
+// Окно долговечности: изменения попадают на диск не позже чем через FLUSH_DELAY_MS
+const FLUSH_DELAY_MS = Number(process.env.FLUSH_DELAY_MS || 1000);
+
+const store = new ProfileStore(DATA_DIR, { legacyFile: DATA_FILE, flushDelayMs: FLUSH_DELAY_MS });
+// Журнал событий ответов лежит рядом с данными профилей
+const EVENTS_FILE = process.env.EVENTS_FILE
+  ? path.resolve(process.env.EVENTS_FILE)
+  : path.join(path.dirname(DATA_FILE), 'events.ndjson');
+const events = new EventLog(EVENTS_FILE);
+
+// Отличает версии хранилища разных запусков сервера в ETag
+const BOOT_ID = crypto.randomBytes(4).toString('hex');
 
 // Middleware
+app.set('etag', 'strong');
 app.use(cors());
-app.use(express.json());
+// Игры присылают частичные обновления как application/merge-patch+json
+app.use(express.json({ type: ['application/json', 'application/merge-patch+json'] }));
+
+// Предсобранные бандлы игр (npm run build): имя содержит хэш содержимого,
+// поэтому файл можно кэшировать навсегда. manifest.json всегда перепроверяется.
+// Сжатые версии (.br/.gz) отдаёт precompressed, остальное — express.static.
+const DIST_DIR = path.join(ROOT_DIR, 'dist');
+const distHeaders = (res, filePath) => {
+  if (path.basename(filePath) === 'manifest.json') {
+    res.setHeader('Cache-Control', 'no-cache');
+  } else {
+    res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+  }
+};
+const DIST_FILES = /^[\w.-]+\.(js|json)$/;
+const distCompressed = precompressed(DIST_DIR, { match: DIST_FILES, setHeaders: distHeaders });
+app.use('/dist', distCompressed, express.static(DIST_DIR, { setHeaders: distHeaders }));
+
+// Отпечаток файла — хэш содержимого. Отпечатки и переписанные страницы
+// считаются один раз (страницы — при старте) и сбрасываются, когда файл в корне
+// меняется (watchRoot), поэтому запрос страницы или скрипта не трогает диск.
+// Без fs.watch кэши не используются и всё читается заново на каждый запрос.
+let rootWatched = false;
+const fingerprints = new Map(); // путь → хэш (null — нет такого файла)
+function fingerprint(file) {
+  if (path.dirname(file) !== ROOT_DIR) return null;
+  if (rootWatched && fingerprints.has(file)) return fingerprints.get(file);
+  let hash = null;
+  try {
+    hash = crypto.createHash('sha256').update(fs.readFileSync(file)).digest('hex').slice(0, 10);
+  } catch (error) {
+    if (error.code !== 'ENOENT' && error.code !== 'EISDIR') throw error;
+  }
+  fingerprints.set(file, hash);
+  return hash;
+}
+
+// HTML-страницы: у локальных скриптов в адрес добавляется ?v=<отпечаток>,
+// такие адреса кэшируются навсегда. Сама страница перепроверяется по ETag,
+// повторный визит — это 304 без тела.
+const LOCAL_SCRIPT = /(<script\b[^>]*\bsrc=")((?:\.\/)?)([\w.-]+\.js)(")/g;
+const pages = new Map(); // путь → переписанная страница (только существующие)
+function renderPage(file) {
+  if (rootWatched && pages.has(file)) return pages.get(file);
+  let html;
+  try {
+    html = fs.readFileSync(file, 'utf8');
+  } catch (error) {
+    if (error.code === 'ENOENT') return null;
+    throw error;
+  }
+  html = html.replace(LOCAL_SCRIPT, (match, before, prefix, name, after) => {
+    const hash = fingerprint(path.join(ROOT_DIR, name));
+    return hash ? `${before}${prefix}${name}?v=${hash}${after}` : match;
+  });
+  pages.set(file, html);
+  return html;
+}
+
+// Изменился файл в корне: сбрасываем его отпечаток и все страницы —
+// в них вписаны отпечатки скриптов
+function watchRoot() {
+  try {
+    fs.watch(ROOT_DIR, { persistent: false }, (event, name) => {
+      if (name) fingerprints.delete(path.join(ROOT_DIR, name));
+      else fingerprints.clear();
+      pages.clear();
+    }).on('error', (error) => {
+      console.warn('⚠️ Слежение за файлами остановлено, страницы читаются с диска:', error.message);
+      rootWatched = false;
+    });
+    rootWatched = true;
+  } catch (error) {
+    console.warn('⚠️ fs.watch недоступен, страницы читаются с диска:', error.message);
+  }
+}
+
+app.get(/^\/(?:[\w.-]+\.html)?$/, (req, res, next) => {
+  let html;
+  try {
+    html = renderPage(path.join(ROOT_DIR, req.path === '/' ? 'index.html' : req.path));
+  } catch (error) {
+    return next(error);
+  }
+  if (html === null) return next();
+  res.setHeader('Cache-Control', 'no-cache');
+  res.type('html').send(html);
+});
 
 // Раздача статических файлов
 // Принудительный MIME для .tsx: Express по умолчанию отдаёт application/octet-stream,
 // что блокируется iOS Safari при fetch/babel load.
-app.use(express.static(path.join(__dirname, '..'), {
-  setHeaders: (res, filePath) => {
-    if (filePath.endsWith('.tsx') || filePath.endsWith('.ts') || filePath.endsWith('.jsx')) {
-      res.setHeader('Content-Type', 'application/javascript; charset=utf-8');
-    }
-  },
-}));
+const rootHeaders = (res, filePath) => {
+  if (filePath.endsWith('.tsx') || filePath.endsWith('.ts') || filePath.endsWith('.jsx')) {
+    res.setHeader('Content-Type', 'application/javascript; charset=utf-8');
+  }
+  // ?v= совпадает с отпечатком содержимого — по этому адресу файл не изменится
+  const { v } = res.req.query;
+  if (v && v === fingerprint(filePath)) {
+    res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+  } else {
+    res.setHeader('Cache-Control', 'no-cache');
+  }
+};
+// Исходники игр и скрипты из корня уходят сжатыми (Brotli/gzip по
+// Accept-Encoding). Остальное, включая вложенные каталоги, — express.static
+const ROOT_FILES = /^[\w.-]+\.(tsx|js)$/;
+const rootCompressed = precompressed(ROOT_DIR, { match: ROOT_FILES, setHeaders: rootHeaders });
+app.use(rootCompressed, express.static(ROOT_DIR, { setHeaders: rootHeaders }));
 
-// Создаём файл данных если его нет
-async function ensureDataFile() {
-  try {
-    await fs.access(DATA_FILE);
-  } catch {
-    await fs.mkdir(path.dirname(DATA_FILE), { recursive: true });
-    await fs.writeFile(DATA_FILE, JSON.stringify({ profiles: [], currentProfileId: null }));
+// API Routes
+// Все обращения к профилям идут через индексы ProfileStore (server/store.js)
+
+// Ответ с сильным ETag из версии хранилища. Если у клиента актуальная копия
+// (If-None-Match), отвечаем 304 и даже не сериализуем профиль.
+function sendVersioned(req, res, tag, produce) {
+  res.setHeader('ETag', `"${BOOT_ID}-${tag}"`);
+  res.setHeader('Cache-Control', 'no-cache');
+  if (req.fresh) {
+    return res.status(304).end();
   }
+  res.json(produce());
 }
 
-// Читаем данные
-async function readData() {
-  const data = await fs.readFile(DATA_FILE, 'utf8');
-  return JSON.parse(data);
-}
+// Поля для выбора профиля (?summary=1): без прогресса и статистики игр
+const SUMMARY_FIELDS = ['id', 'name', 'character', 'group', 'stars', 'totalStars'];
+const MAX_PAGE_SIZE = 500;
 
-// Записываем данные
-async function writeData(data) {
-  await fs.writeFile(DATA_FILE, JSON.stringify(data, null, 2));
+function pickFields(profile, fields) {
+  const result = {};
+  for (const field of fields) {
+    if (profile[field] !== undefined) result[field] = profile[field];
+  }
+  return result;
 }
 
-// API Routes
+// Курсор непрозрачный для клиента: id последнего профиля страницы
+const encodeCursor = id => Buffer.from(String(id)).toString('base64url');
+const decodeCursor = cursor => Buffer.from(String(cursor), 'base64url').toString();
 
-// Получить все профили
+// Получить профили
+//   ?group=2Б              только профили группы
+//   ?summary=1             только поля для выбора профиля (SUMMARY_FIELDS)
+//   ?fields=id,name,stars  только перечисленные поля (id всегда включён)
+//   ?limit=50&cursor=...   постранично: { profiles, nextCursor }; без limit — массив
 app.get('/api/profiles', async (req, res) => {
   try {
-    const data = await readData();
-    res.json(data.profiles);
+    const { group, fields, summary, limit, cursor } = req.query;
+
+    let profiles;
+    let nextCursor = null;
+    if (limit !== undefined) {
+      const size = Math.min(Math.max(parseInt(limit, 10) || 1, 1), MAX_PAGE_SIZE);
+      const page = store.page({ group, after: cursor ? decodeCursor(cursor) : null, limit: size });
+      if (!page) {
+        return res.status(400).json({ error: 'Invalid cursor' });
+      }
+      profiles = page.items;
+      nextCursor = page.next && encodeCursor(page.next);
+    } else {
+      profiles = group ? store.listGroup(group) : store.list();
+    }
+
+    let projection = null;
+    if (fields) {
+      projection = ['id', ...String(fields).split(',').map(f => f.trim()).filter(f => f && f !== 'id')];
+    } else if (summary === '1' || summary === 'true') {
+      projection = SUMMARY_FIELDS;
+    }
+
+    // ETag — версия всего хранилища: разные запросы браузер и так кэширует
+    // по разным адресам. Проекция строится, только если ответ не 304.
+    sendVersioned(req, res, `v${store.version}`, () => {
+      if (projection) {
+        profiles = profiles.map(p => pickFields(p, projection));
+      }
+      return limit !== undefined ? { profiles, nextCursor } : profiles;
+    });
   } catch (error) {
     console.error('Error reading profiles:', error);
     res.status(500).json({ error: 'Failed to read profiles' });
@@ -59,18 +223,17 @@ app.get('/api/profiles', async (req, res) => {
 // Создать профиль
 app.post('/api/profiles', async (req, res) => {
   try {
-    const { name, character } = req.body;
+    const { name, character, group } = req.body;
 
     if (!name || !character) {
       return res.status(400).json({ error: 'Name and character are required' });
     }
 
-    const data = await readData();
-
     const newProfile = {
       id: Date.now().toString(),
       name,
       character,
+      ...(group ? { group: String(group) } : {}),
       stars: 0,
       totalStars: 0,
       gameProgress: {},
@@ -78,8 +241,7 @@ app.post('/api/profiles', async (req, res) => {
       createdAt: new Date().toISOString(),
     };
 
-    data.profiles.push(newProfile);
-    await writeData(data);
+    store.create(newProfile);
 
     res.status(201).json(newProfile);
   } catch (error) {
@@ -91,14 +253,13 @@ app.post('/api/profiles', async (req, res) => {
 // Получить профиль по ID
 app.get('/api/profiles/:id', async (req, res) => {
   try {
-    const data = await readData();
-    const profile = data.profiles.find(p => p.id === req.params.id);
+    const profile = store.get(req.params.id);
 
     if (!profile) {
       return res.status(404).json({ error: 'Profile not found' });
     }
 
-    res.json(profile);
+    sendVersioned(req, res, `p${store.revision(profile.id)}`, () => profile);
   } catch (error) {
     console.error('Error reading profile:', error);
     res.status(500).json({ error: 'Failed to read profile' });
@@ -108,42 +269,46 @@ app.get('/api/profiles/:id', async (req, res) => {
 // Обновить профиль
 app.put('/api/profiles/:id', async (req, res) => {
   try {
-    const data = await readData();
-    const index = data.profiles.findIndex(p => p.id === req.params.id);
+    const profile = store.update(req.params.id, req.body);
 
-    if (index === -1) {
+    if (!profile) {
       return res.status(404).json({ error: 'Profile not found' });
     }
 
-    data.profiles[index] = { ...data.profiles[index], ...req.body };
-    await writeData(data);
-
-    res.json(data.profiles[index]);
+    res.json(profile);
   } catch (error) {
     console.error('Error updating profile:', error);
     res.status(500).json({ error: 'Failed to update profile' });
   }
 });
 
-// Удалить профиль
-app.delete('/api/profiles/:id', async (req, res) => {
+// Частично обновить профиль (JSON Merge Patch, RFC 7396):
+// присылаются только изменившиеся поля, null удаляет поле.
+// В ответ — без профиля целиком, чтобы не гонять его обратно.
+app.patch('/api/profiles/:id', async (req, res) => {
   try {
-    const data = await readData();
-    const index = data.profiles.findIndex(p => p.id === req.params.id);
+    if (!req.body || typeof req.body !== 'object' || Array.isArray(req.body)) {
+      return res.status(400).json({ error: 'Merge patch must be a JSON object' });
+    }
 
-    if (index === -1) {
+    if (!store.patch(req.params.id, req.body)) {
       return res.status(404).json({ error: 'Profile not found' });
     }
 
-    data.profiles.splice(index, 1);
+    res.json({ success: true });
+  } catch (error) {
+    console.error('Error patching profile:', error);
+    res.status(500).json({ error: 'Failed to patch profile' });
+  }
+});
 
-    // Если удаляем текущий профиль, сбрасываем его
-    if (data.currentProfileId === req.params.id) {
-      data.currentProfileId = null;
+// Удалить профиль (если он текущий, текущий профиль сбрасывается)
+app.delete('/api/profiles/:id', async (req, res) => {
+  try {
+    if (!store.remove(req.params.id)) {
+      return res.status(404).json({ error: 'Profile not found' });
     }
 
-    await writeData(data);
-
     res.json({ success: true });
   } catch (error) {
     console.error('Error deleting profile:', error);
@@ -151,17 +316,52 @@ app.delete('/api/profiles/:id', async (req, res) => {
   }
 });
 
-// Получить текущий профиль
-app.get('/api/current-profile', async (req, res) => {
+// Сводка ответов профиля, собранная из журнала событий
+app.get('/api/profiles/:id/answers', async (req, res) => {
   try {
-    const data = await readData();
+    if (!store.get(req.params.id)) {
+      return res.status(404).json({ error: 'Profile not found' });
+    }
 
-    if (!data.currentProfileId) {
-      return res.json(null);
+    res.setHeader('Cache-Control', 'no-cache');
+    res.json(await events.summary(req.params.id));
+  } catch (error) {
+    console.error('Error reading answers:', error);
+    res.status(500).json({ error: 'Failed to read answers' });
+  }
+});
+
+// Принять пачку событий ответов: { profileId, events: [{ t, g, k, ok, ms, a }] }
+// События дописываются в журнал, профиль не меняется
+app.post('/api/events', async (req, res) => {
+  try {
+    const { profileId, events: batch } = req.body || {};
+
+    if ((typeof profileId !== 'string' && typeof profileId !== 'number') || profileId === '') {
+      return res.status(400).json({ error: 'profileId is required' });
+    }
+    if (!Array.isArray(batch) || batch.length > MAX_BATCH) {
+      return res.status(400).json({ error: `events must be an array of at most ${MAX_BATCH}` });
     }
+    if (!store.get(profileId)) {
+      return res.status(404).json({ error: 'Profile not found' });
+    }
+
+    const accepted = await events.append(profileId, batch);
 
-    const profile = data.profiles.find(p => p.id === data.currentProfileId);
-    res.json(profile || null);
+    res.status(202).json({ accepted });
+  } catch (error) {
+    console.error('Error appending events:', error);
+    res.status(500).json({ error: 'Failed to append events' });
+  }
+});
+
+// Получить текущий профиль
+app.get('/api/current-profile', async (req, res) => {
+  try {
+    const current = store.getCurrent();
+    const tag = current ? `c${current.id}.${store.revision(current.id)}` : 'c';
+    sendVersioned(req, res, tag, () => current);
   } catch (error) {
     console.error('Error reading current profile:', error);
     res.status(500).json({ error: 'Failed to read current profile' });
@@ -172,17 +372,12 @@ app.get('/api/current-profile', async (req, res) => {
 app.post('/api/current-profile', async (req, res) => {
   try {
     const { profileId } = req.body;
-    const data = await readData();
 
-    if (profileId) {
-      const profile = data.profiles.find(p => p.id === profileId);
-      if (!profile) {
-        return res.status(404).json({ error: 'Profile not found' });
-      }
+    if (profileId && !store.get(profileId)) {
+      return res.status(404).json({ error: 'Profile not found' });
     }
 
-    data.currentProfileId = profileId;
-    await writeData(data);
+    store.setCurrent(profileId);
 
     res.json({ success: true, currentProfileId: profileId });
   } catch (error) {
@@ -198,12 +393,37 @@ app.get('/api/health', (req, res) => {
 
 // Запуск сервера
 async function startServer() {
-  await ensureDataFile();
+  await store.load();
+
+  // Страницы с отпечатками скриптов готовим заранее
+  watchRoot();
+  if (rootWatched) {
+    for (const name of fs.readdirSync(ROOT_DIR).filter(name => name.endsWith('.html'))) {
+      renderPage(path.join(ROOT_DIR, name));
+    }
+  }
+
+  // Самые тяжёлые файлы сжимаем в фоне, не откладывая запуск: пока версии
+  // нет, файл уходит без сжатия
+  const warm = (cache, dir, match) => cache.warm(fs.readdirSync(dir)
+    .filter(name => match.test(name) && !name.startsWith('.'))
+    .map(name => path.join(dir, name)));
+  warm(rootCompressed.cache, ROOT_DIR, ROOT_FILES)
+    .then(() => fs.existsSync(DIST_DIR) && warm(distCompressed.cache, DIST_DIR, DIST_FILES));
+
+  // При остановке дописываем несохранённые изменения
+  for (const signal of ['SIGINT', 'SIGTERM']) {
+    process.once(signal, () => {
+      Promise.all([store.flush(), events.flush()])
+        .catch(error => console.error('Error flushing profiles:', error))
+        .finally(() => process.exit(0));
+    });
+  }
 
   app.listen(PORT, () => {
     console.log(`🚀 Сервер запущен на http://localhost:${PORT}`);
     console.log(`📊 API доступен на http://localhost:${PORT}/api`);
-    console.log(`💾 Данные сохраняются в: ${DATA_FILE}`);
+    console.log(`💾 Данные сохраняются в: ${DATA_DIR} (раз в ${FLUSH_DELAY_MS} мс)`);
   });
 }
 
@@ -0,0 +1,378 @@
+// Хранилище профилей в памяти с отложенной записью на диск (write-behind).
+//
+// На диске каждый профиль лежит в своём файле, плюс маленький index.json
+// с порядком профилей и текущим профилем:
+//
+//   data/profiles/index.json            { profiles: [id, ...], currentProfileId }
+//   data/profiles/p-<id>.json           профиль
+//
+// Префикс p- не даёт профилю с id "index" совпасть с файлом индекса.
+// Файлы ранней раскладки (<id>.json без префикса) переименовываются при старте.
+//
+// Каталог читается один раз при старте, все запросы работают с памятью.
+// Изменения применяются к памяти по порядку прихода запросов и только помечают
+// профиль как несохранённый: в течение окна долговечности (flushDelayMs) все
+// они сливаются, и на диск пишутся только затронутые профили (и индекс, если
+// менялся состав или текущий профиль).
+// У каждого файла один писатель: пока профиль пишется, новые изменения не
+// запускают параллельную запись, а сливаются в одну следующую — с последней
+// версией профиля. Медленная запись одного профиля не задерживает остальные.
+// Каждый файл пишется во временный, fsync, затем rename поверх основного —
+// на диске всегда лежит либо старая, либо новая версия целиком.
+//
+// Старый единый profiles.json переносится в каталог при первом запуске и
+// остаётся рядом как profiles.json.migrated.
+//
+// Профили проиндексированы: id → профиль и группа (класс) → множество id.
+// Индексы обновляются при создании, изменении и удалении, поэтому поиск
+// по id и выборка класса не зависят от числа профилей.
+const fs = require('fs').promises;
+const path = require('path');
+
+const INDEX_FILE = 'index.json';
+const PROFILE_PREFIX = 'p-';
+const INDEX = Symbol('index'); // ключ писателя индекса
+
+// JSON Merge Patch (RFC 7396): вложенные объекты сливаются, null удаляет поле,
+// массивы и прочие значения заменяются целиком. Копируются только объекты
+// на пути изменений, остальное переиспользуется.
+function applyMergePatch(target, patch) {
+  if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) {
+    return patch;
+  }
+  const isObject = target !== null && typeof target === 'object' && !Array.isArray(target);
+  const result = isObject ? { ...target } : {};
+  for (const [key, value] of Object.entries(patch)) {
+    if (key === '__proto__') continue;
+    if (value === null) {
+      delete result[key];
+    } else {
+      result[key] = applyMergePatch(result[key], value);
+    }
+  }
+  return result;
+}
+
+// Временный файл + fsync + rename: читатель видит либо старую, либо новую версию
+async function writeFileAtomic(file, contents) {
+  const tmp = `${file}.${process.pid}.tmp`;
+  const handle = await fs.open(tmp, 'w');
+  try {
+    await handle.writeFile(contents);
+    await handle.sync();
+  } finally {
+    await handle.close();
+  }
+  await fs.rename(tmp, file);
+}
+
+class ProfileStore {
+  constructor(dir, { legacyFile = null, flushDelayMs = 1000 } = {}) {
+    this.dir = dir;
+    this.legacyFile = legacyFile;
+    this.flushDelayMs = flushDelayMs;
+    this.profiles = new Map(); // id → профиль (порядок вставки сохраняется)
+    this.groups = new Map();   // группа → Set(id)
+    this.currentProfileId = null;
+    this.version = 0;            // растёт при любом изменении (для ETag)
+    this.revisions = new Map();  // id → version последнего изменения профиля
+    this.dirtyIds = new Set();   // профили, файлы которых отстают от памяти
+    this.indexDirty = false;
+    this.timer = null;
+    this.writers = new Map();    // id | INDEX → { running, next }
+  }
+
+  profileFile(id) {
+    return path.join(this.dir, `${PROFILE_PREFIX}${encodeURIComponent(id)}.json`);
+  }
+
+  async load() {
+    await fs.mkdir(this.dir, { recursive: true });
+
+    let index = await this.readJSON(path.join(this.dir, INDEX_FILE));
+    if (!index) {
+      await this.migrateLegacyFile();
+      index = await this.readJSON(path.join(this.dir, INDEX_FILE));
+    }
+
+    // Файлы профилей — источник истины: индекс задаёт только порядок.
+    // Профиль, созданный прямо перед падением, мог не успеть попасть в индекс.
+    const loaded = new Map();
+    const names = (await fs.readdir(this.dir)).filter(n => n.endsWith('.json') && n !== INDEX_FILE);
+    const files = await Promise.all(names.map(async name => [name, await this.readJSON(path.join(this.dir, name))]));
+    const stray = [];
+    for (const [name, profile] of files) {
+      if (!profile || profile.id === undefined) continue;
+      if (name === path.basename(this.profileFile(profile.id))) {
+        loaded.set(String(profile.id), profile);
+      } else {
+        stray.push([name, profile]);
+      }
+    }
+    // Файл не под своим именем (ранняя раскладка): переносим, если профиля
+    // под правильным именем ещё нет, иначе он устарел и удаляется
+    for (const [name, profile] of stray) {
+      const file = path.join(this.dir, name);
+      if (loaded.has(String(profile.id))) {
+        await fs.unlink(file);
+      } else {
+        await fs.rename(file, this.profileFile(profile.id));
+        loaded.set(String(profile.id), profile);
+      }
+    }
+    for (const id of index.profiles) {
+      if (loaded.has(String(id))) this.add(loaded.get(String(id)));
+    }
+    for (const [id, profile] of loaded) {
+      if (!this.profiles.has(id)) this.add(profile);
+    }
+    this.currentProfileId = index.currentProfileId || null;
+    return this;
+  }
+
+  async readJSON(file) {
+    try {
+      return JSON.parse(await fs.readFile(file, 'utf8'));
+    } catch (error) {
+      if (error.code === 'ENOENT') return null;
+      throw error;
+    }
+  }
+
+  // Перенос из единого profiles.json; индекс пишется последним, поэтому
+  // прерванная миграция просто повторится при следующем запуске
+  async migrateLegacyFile() {
+    const legacy = this.legacyFile ? await this.readJSON(this.legacyFile) : null;
+    const profiles = legacy ? legacy.profiles || [] : [];
+    for (const profile of profiles) {
+      await writeFileAtomic(this.profileFile(profile.id), JSON.stringify(profile, null, 2));
+    }
+    await writeFileAtomic(path.join(this.dir, INDEX_FILE), JSON.stringify({
+      profiles: profiles.map(p => String(p.id)),
+      currentProfileId: legacy ? legacy.currentProfileId || null : null,
+    }, null, 2));
+    if (legacy) {
+      await fs.rename(this.legacyFile, `${this.legacyFile}.migrated`);
+      console.log(`📦 ${profiles.length} профилей перенесено из ${this.legacyFile} в ${this.dir}`);
+    }
+  }
+
+  // --- Чтение ---
+
+  list() {
+    return Array.from(this.profiles.values());
+  }
+
+  get(id) {
+    return this.profiles.get(String(id)) || null;
+  }
+
+  listGroup(group) {
+    const ids = this.groups.get(String(group));
+    return ids ? Array.from(ids, id => this.profiles.get(id)) : [];
+  }
+
+  // Страница в порядке хранения после профиля с id after (курсор).
+  // null — курсор не найден (профиль удалили или курсор испорчен)
+  page({ group, after, limit }) {
+    const ids = group ? this.groups.get(String(group)) || new Set() : this.profiles.keys();
+    const items = [];
+    let found = after === undefined || after === null;
+    for (const id of ids) {
+      if (!found) {
+        found = id === String(after);
+        continue;
+      }
+      if (items.length === limit) {
+        return { items, next: String(items[items.length - 1].id) };
+      }
+      items.push(this.profiles.get(id));
+    }
+    return found ? { items, next: null } : null;
+  }
+
+  getCurrent() {
+    return this.currentProfileId ? this.get(this.currentProfileId) : null;
+  }
+
+  // Версия профиля: меняется при каждом его изменении
+  revision(id) {
+    return this.revisions.get(String(id)) || 0;
+  }
+
+  // --- Изменения ---
+
+  create(profile) {
+    this.add(profile);
+    this.indexDirty = true;
+    this.dirtyIds.add(String(profile.id));
+    this.changed(profile.id);
+    return profile;
+  }
+
+  // Слияние полей; id менять нельзя, иначе индекс разойдётся с данными
+  update(id, changes) {
+    const old = this.get(id);
+    if (!old) return null;
+    return this.replace(old, { ...old, ...changes, id: old.id });
+  }
+
+  // Частичное обновление по JSON Merge Patch
+  patch(id, patch) {
+    const old = this.get(id);
+    if (!old) return null;
+    return this.replace(old, { ...applyMergePatch(old, patch), id: old.id });
+  }
+
+  remove(id) {
+    const old = this.get(id);
+    if (!old) return false;
+    const key = String(old.id);
+    this.unindexGroup(old);
+    this.profiles.delete(key);
+    this.dirtyIds.add(key);
+    if (this.currentProfileId === key) {
+      this.currentProfileId = null;
+    }
+    this.indexDirty = true;
+    this.changed(key);
+    return true;
+  }
+
+  setCurrent(id) {
+    this.currentProfileId = id ? String(id) : null;
+    this.indexDirty = true;
+    this.changed();
+  }
+
+  add(profile) {
+    const key = String(profile.id);
+    this.profiles.set(key, profile);
+    this.indexGroup(profile);
+  }
+
+  replace(old, updated) {
+    this.unindexGroup(old);
+    this.profiles.set(String(old.id), updated);
+    this.indexGroup(updated);
+    this.dirtyIds.add(String(old.id));
+    this.changed(old.id);
+    return updated;
+  }
+
+  indexGroup(profile) {
+    if (profile.group === undefined || profile.group === null || profile.group === '') return;
+    const key = String(profile.group);
+    if (!this.groups.has(key)) this.groups.set(key, new Set());
+    this.groups.get(key).add(String(profile.id));
+  }
+
+  unindexGroup(profile) {
+    const ids = this.groups.get(String(profile.group));
+    if (!ids) return;
+    ids.delete(String(profile.id));
+    if (ids.size === 0) this.groups.delete(String(profile.group));
+  }
+
+  changed(id) {
+    this.version += 1;
+    if (id !== undefined) this.revisions.set(String(id), this.version);
+    this.markDirty();
+  }
+
+  // --- Запись на диск ---
+
+  // Запланировать запись; изменения внутри окна попадут в ту же запись
+  markDirty() {
+    if (this.timer) return;
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.flush().catch(error => console.error('Error flushing profiles:', error));
+    }, this.flushDelayMs);
+  }
+
+  isDirty() {
+    return this.dirtyIds.size > 0 || this.indexDirty;
+  }
+
+  // Записать всё несохранённое прямо сейчас (используется и при остановке)
+  async flush() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    const dirtyIds = this.dirtyIds;
+    const indexDirty = this.indexDirty;
+    this.dirtyIds = new Set();
+    this.indexDirty = false;
+
+    try {
+      // Сначала профили, потом индекс: при падении посередине новый профиль
+      // подхватится по файлу, а удалённый не воскреснет
+      const results = await Promise.allSettled(Array.from(dirtyIds, id => this.persist(id)));
+      const failed = Array.from(dirtyIds).filter((id, i) => results[i].status === 'rejected');
+      if (failed.length > 0) {
+        failed.forEach(id => this.dirtyIds.add(id));
+        this.indexDirty = this.indexDirty || indexDirty;
+        throw results.find(r => r.status === 'rejected').reason;
+      }
+      if (indexDirty) {
+        await this.persist(INDEX).catch(error => {
+          this.indexDirty = true;
+          throw error;
+        });
+      }
+      // Записи, начатые раньше (по таймеру), тоже должны закончиться
+      await Promise.all(Array.from(this.writers.values(), w => (w.next || w.running).catch(() => {})));
+    } catch (error) {
+      // Не потеряли изменения: повторим в следующем окне
+      this.markDirty();
+      throw error;
+    }
+  }
+
+  // Очередь из одного писателя на файл. Если файл уже пишется, следующая
+  // запись ставится за ней; все изменения, пришедшие до её старта, попадут
+  // в неё (снимок берётся в момент старта), так что запись всегда одна.
+  persist(key) {
+    let writer = this.writers.get(key);
+    if (!writer) {
+      writer = { running: null, next: null };
+      this.writers.set(key, writer);
+    }
+    if (!writer.running) {
+      writer.running = this.writeFile(key).finally(() => {
+        writer.running = null;
+        if (!writer.next) this.writers.delete(key);
+      });
+      return writer.running;
+    }
+    if (!writer.next) {
+      writer.next = writer.running.catch(() => {}).then(() => {
+        writer.next = null;
+        return this.persist(key);
+      });
+    }
+    return writer.next;
+  }
+
+  // Привести файл к состоянию памяти; снимок берётся синхронно
+  async writeFile(key) {
+    if (key === INDEX) {
+      const index = JSON.stringify({
+        profiles: Array.from(this.profiles.keys()),
+        currentProfileId: this.currentProfileId,
+      }, null, 2);
+      return writeFileAtomic(path.join(this.dir, INDEX_FILE), index);
+    }
+    const profile = this.profiles.get(key);
+    if (profile) {
+      return writeFileAtomic(this.profileFile(key), JSON.stringify(profile, null, 2));
+    }
+    return fs.unlink(this.profileFile(key)).catch(error => {
+      if (error.code !== 'ENOENT') throw error;
+    });
+  }
+}
+
+module.exports = { ProfileStore, applyMergePatch };
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useCallback } from 'react';
-import { PlayerProfile, storage } from '../utils/storage';
+import { ProfileSummary, storage } from '../utils/storage';
 
 const CHARACTERS = [
   { id: 'fox', name: 'Лисёнок', emoji: '🦊', color: '#FF9F43' },
@@ -21,8 +21,8 @@ const useSpeak = () => useCallback((text: string, rate = 0.75) => {
 }, []);
 
 interface ProfileSelectProps {
-  profiles: PlayerProfile[];
-  onSelect: (profile: PlayerProfile) => void;
+  profiles: ProfileSummary[];
+  onSelect: (profile: ProfileSummary) => void;
   onCreate: () => void;
   onDelete: (id: string) => void;
 }
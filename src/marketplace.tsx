@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useCallback } from 'react';
-import { PlayerProfile, storage } from './utils/storage';
+import { PlayerProfile, ProfileSummary, storage } from './utils/storage';
 import { ProfileSelect, CreateProfile } from './components/ProfileManager';
 
 // Импортируем игры (они будут загружаться динамически)
@@ -210,25 +210,24 @@ const StatsScreen: React.FC<StatsScreenProps> = ({ profile, onBack }) => {
 // Главный компонент маркетплейса
 export default function Marketplace() {
   const [screen, setScreen] = useState<'loading' | 'profiles' | 'create' | 'menu' | 'stats' | 'game'>('loading');
-  const [profiles, setProfiles] = useState<PlayerProfile[]>([]);
+  const [profiles, setProfiles] = useState<ProfileSummary[]>([]);
   const [currentProfile, setCurrentProfile] = useState<PlayerProfile | null>(null);
   const [selectedGame, setSelectedGame] = useState<string | null>(null);
 
   // Загрузка профилей
   useEffect(() => {
     const loadProfiles = async () => {
-      const loadedProfiles = await storage.getProfiles();
+      // Для выбора игрока хватает сводки; текущий профиль приходит целиком
+      const [loadedProfiles, current] = await Promise.all([
+        storage.getProfileSummaries(),
+        storage.getCurrentProfile(),
+      ]);
       setProfiles(loadedProfiles);
 
-      // Проверяем, есть ли текущий профиль
-      const currentProfileId = await storage.getCurrentProfile();
-      if (currentProfileId && loadedProfiles.length > 0) {
-        const profile = loadedProfiles.find(p => p.id === currentProfileId.id);
-        if (profile) {
-          setCurrentProfile(profile);
-          setScreen('menu');
-          return;
-        }
+      if (current && loadedProfiles.some(p => p.id === current.id)) {
+        setCurrentProfile(current);
+        setScreen('menu');
+        return;
       }
 
       setScreen('profiles');
@@ -238,9 +237,13 @@ export default function Marketplace() {
   }, []);
 
   // Выбор профиля
-  const handleSelectProfile = async (profile: PlayerProfile) => {
-    setCurrentProfile(profile);
-    await storage.setCurrentProfile(profile.id);
+  const handleSelectProfile = async (profile: ProfileSummary) => {
+    const [full] = await Promise.all([
+      storage.getProfile(profile.id),
+      storage.setCurrentProfile(profile.id),
+    ]);
+    if (!full) return;
+    setCurrentProfile(full);
     setScreen('menu');
   };
 
@@ -274,8 +277,10 @@ export default function Marketplace() {
   // Возврат из игры
   const handleBackFromGame = async () => {
     // Перезагружаем профиль, чтобы получить обновленные данные
-    const updatedProfiles = await storage.getProfiles();
-    const updatedProfile = updatedProfiles.find(p => p.id === currentProfile?.id);
+    const [updatedProfiles, updatedProfile] = await Promise.all([
+      storage.getProfileSummaries(),
+      currentProfile ? storage.getProfile(currentProfile.id) : null,
+    ]);
     if (updatedProfile) {
       setCurrentProfile(updatedProfile);
     }
@@ -15,6 +15,11 @@ export interface PlayerProfile {
   createdAt: string;
 }
 
+// Лёгкая версия профиля для выбора игрока (GET /api/profiles?summary=1)
+export type ProfileSummary = Pick<PlayerProfile, 'id' | 'name' | 'character' | 'stars' | 'totalStars'> & {
+  group?: string;
+};
+
 // Конфигурация API
 const API_URL = '/api';
 
@@ -50,6 +55,25 @@ export const storage = {
     }
   },
 
+  // Только поля для экрана выбора, без прогресса и статистики игр
+  async getProfileSummaries(): Promise<ProfileSummary[]> {
+    try {
+      return await fetchAPI('/profiles?summary=1');
+    } catch (e) {
+      console.error('Error loading profiles:', e);
+      return [];
+    }
+  },
+
+  async getProfile(profileId: string): Promise<PlayerProfile | null> {
+    try {
+      return await fetchAPI(`/profiles/${profileId}`);
+    } catch (e) {
+      console.error('Error loading profile:', e);
+      return null;
+    }
+  },
+
   async getCurrentProfile(): Promise<PlayerProfile | null> {
     try {
       return await fetchAPI('/current-profile');
@@ -81,6 +105,19 @@ export const storage = {
     }
   },
 
+  async patchProfile(profileId: string, patch: Record<string, any>): Promise<void> {
+    if (Object.keys(patch).length === 0) return;
+    try {
+      await fetchAPI(`/profiles/${profileId}`, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/merge-patch+json' },
+        body: JSON.stringify(patch),
+      });
+    } catch (e) {
+      console.error('Error patching profile:', e);
+    }
+  },
+
   async createProfile(name: string, character: string): Promise<PlayerProfile> {
     try {
       return await fetchAPI('/profiles', {
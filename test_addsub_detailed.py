@@ -1,15 +1,20 @@
 from playwright.sync_api import sync_playwright
-import time
 import sys
 
+from harness import config
+from harness.oracle import RaceOracle, race_url
+from harness.server import local_app
+from harness.waits import Waiter
+
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_addsub_detailed():
+def test_addsub_detailed(app_url):
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=500)
+        browser = p.chromium.launch(headless=config.HEADLESS)
         page = browser.new_page()
+        waiter = Waiter(page)
 
         console = []
         page.on('console', lambda msg: console.append(f"[{msg.type}] {msg.text}"))
@@ -19,72 +24,66 @@ def test_addsub_detailed():
         print("=" * 70)
 
         # Load game
-        page.goto('http://83.222.23.107:8081/games-number-racing.html?profile=1764998591846', timeout=30000)
-        page.wait_for_timeout(3000)
+        page.goto(f'{app_url}{race_url()}', timeout=30000)
+        waiter.until('menu', legacy_ms=3000)
 
         print(f"\n[1] Starting race...")
-        start_btn = page.locator('button:has-text("▶️")').first
-        start_btn.click()
-        page.wait_for_timeout(2000)
+        oracle = RaceOracle(page, waiter)
+        oracle.start()
 
-        print(f"\n[2] Answering questions to progress through stages...")
-        print(f"    Looking for addition/subtraction tasks...\n")
+        print(f"\n[2] Answering correctly until stage 4 (addition/subtraction)...")
+        try:
+            answers = oracle.reach_stage(4)
+            print(f"    Reached stage 4 after {answers} answers ({oracle.clicks} clicks)\n")
+        except AssertionError as e:
+            print(f"\n   Could not reach stage 4: {str(e)[:100]}")
 
         found_addition = False
         found_subtraction = False
         found_zero_option = False
         question_num = 0
 
-        # Answer many questions correctly to progress through stages
-        for attempt in range(50):  # More attempts to reach stage 4
+        # Stage 4 mixes addSub with other task types; answer until both ops were seen
+        for attempt in range(40):
             try:
                 question_num = attempt + 1
 
-                # Wait a bit for the question to render
-                page.wait_for_timeout(800)
-
-                # Get the full page content
-                full_html = page.content()
-
-                # Check if this looks like an addSub task
-                # Look for the task icon area (should have two circles and text between)
-                # The icon SVG has viewBox="0 0 100 60" for addSub tasks
-                if 'viewBox="0 0 100 60"' in full_html:
-                    print(f"   Question {question_num}: Found addSub task!")
-
-                    # Extract the operator from the SVG
-                    if '>+<' in full_html:
+                state = oracle.state()
+                if state['screen'] != 'race':
+                    oracle.start()
+                elif state['raceProgress'] >= 100:
+                    waiter.until('finish')
+                    oracle.start()
+
+                task = oracle.task()
+                visual = task['visual']
+                if visual['type'] == 'addSub':
+                    print(f"   Question {question_num}: {visual['left']} {visual['op']} {visual['right']}")
+
+                    # The icon SVG has viewBox="0 0 100 60" and must show the same operator
+                    icon = page.locator('svg[viewBox="0 0 100 60"] text').first.text_content()
+                    if visual['op'] == '+' and icon == '+':
                         print(f"      ✅ Addition task detected (+ icon in SVG)")
                         found_addition = True
-                    elif '>-<' in full_html or '>−<' in full_html:
+                    elif visual['op'] == '-' and icon == '-':
                         print(f"      ✅ Subtraction task detected (- icon in SVG)")
                         found_subtraction = True
+                    else:
+                        print(f"      ❌ Icon shows '{icon}' for a '{visual['op']}' task")
 
-                    # Check answer buttons
-                    buttons = page.locator('.grid.grid-cols-3 button').all()
-                    answer_texts = [btn.text_content().strip() for btn in buttons]
-                    print(f"      Answer options: {answer_texts}")
-
-                    # Check for zero
-                    if '0' in answer_texts:
+                    values = [opt['value'] for opt in task['options']]
+                    print(f"      Answer options: {values}")
+                    if 0 in values:
                         print(f"      ✅ Zero is available as an answer!")
                         found_zero_option = True
 
-                    # Take screenshot
                     screenshot_name = f'test_screenshots/addsub_detailed_{question_num}.png'
                     page.screenshot(path=screenshot_name)
                     print(f"      📸 Screenshot: {screenshot_name}\n")
 
-                # Try to answer correctly
-                if not page.locator('.grid.grid-cols-3 button').first.is_visible(timeout=2000):
-                    print(f"\n   Race ended after {question_num} questions")
+                if found_addition and found_subtraction and found_zero_option:
                     break
-
-                # Click first button to continue
-                buttons = page.locator('.grid.grid-cols-3 button').all()
-                if len(buttons) > 0:
-                    buttons[0].click(force=True)
-                    page.wait_for_timeout(1000)
+                oracle.answer(True)
 
             except Exception as e:
                 print(f"\n   Error on question {question_num}: {str(e)[:100]}")
@@ -112,10 +111,10 @@ def test_addsub_detailed():
         for msg in console[-5:]:
             print(f"   {msg}")
 
-        time.sleep(3)
         browser.close()
 
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_addsub_detailed()
+    with local_app() as app_url:
+        test_addsub_detailed(app_url)
@@ -2,11 +2,14 @@ from playwright.sync_api import sync_playwright
 import time
 import sys
 
+from harness.config import PROFILE_ID
+from harness.server import local_app
+
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_addsub_icons():
+def test_addsub_icons(app_url):
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False, slow_mo=300)
         page = browser.new_page()
@@ -19,7 +22,7 @@ def test_addsub_icons():
         print("=" * 70)
 
         # Load with profile to get to stage 4 (addSub tasks)
-        page.goto('http://83.222.23.107:8081/games-number-racing.html?profile=1764998591846', timeout=30000)
+        page.goto(f'{app_url}/games-number-racing.html?profile={PROFILE_ID}', timeout=30000)
         page.wait_for_timeout(3000)
 
         print(f"\n[1] Starting race...")
@@ -114,4 +117,5 @@ def test_addsub_icons():
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_addsub_icons()
+    with local_app() as app_url:
+        test_addsub_icons(app_url)
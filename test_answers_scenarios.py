@@ -2,11 +2,13 @@ from playwright.sync_api import sync_playwright
 import time
 import sys
 
+from harness.server import local_app
+
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_scenarios():
+def test_scenarios(app_url):
     """Test different answer scenarios"""
 
     print("Testing Different Answer Scenarios")
@@ -22,7 +24,7 @@ def test_scenarios():
 
         try:
             # Load game
-            page.goto('http://83.222.23.107:8081/games-number-racing.html', timeout=30000)
+            page.goto(f'{app_url}/games-number-racing.html', timeout=30000)
             page.wait_for_load_state('networkidle')
             page.wait_for_timeout(2000)
             print("[OK] Game loaded\n")
@@ -95,4 +97,5 @@ def test_scenarios():
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_scenarios()
+    with local_app() as app_url:
+        test_scenarios(app_url)
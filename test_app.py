@@ -1,13 +1,15 @@
 from playwright.sync_api import sync_playwright
-import time
 
-APP_URL = "http://83.222.23.107:8081"
+from harness.config import PROFILE_ID
+from harness.server import local_app
+from harness.waits import Waiter
 
-def test_app():
+def test_app(app_url):
     with sync_playwright() as p:
         print("[START] Launching browser...")
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
+        waiter = Waiter(page, timeout=30000)
 
         # Log console errors
         errors = []
@@ -17,9 +19,8 @@ def test_app():
         try:
             # Test 1: Main page
             print("\n[TEST 1] Loading main page...")
-            page.goto(APP_URL, timeout=30000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-            time.sleep(2)  # Wait for React
+            page.goto(app_url, timeout=30000)
+            waiter.until("marketplace", legacy_ms=2000)
 
             # Take screenshot
             page.screenshot(path="screenshot_main.png", full_page=True)
@@ -36,7 +37,7 @@ def test_app():
             # Test 2: API Health
             print("\n[TEST 2] Checking API...")
             api_page = browser.new_page()
-            api_page.goto(f"{APP_URL}/api/health", timeout=10000)
+            api_page.goto(f"{app_url}/api/health", timeout=10000)
             api_content = api_page.content()
             if "ok" in api_content:
                 print("  [OK] API is working")
@@ -47,7 +48,7 @@ def test_app():
             # Test 3: Check profiles
             print("\n[TEST 3] Checking profiles...")
             profiles_page = browser.new_page()
-            profiles_page.goto(f"{APP_URL}/api/profiles", timeout=10000)
+            profiles_page.goto(f"{app_url}/api/profiles", timeout=10000)
             profiles_content = profiles_page.content()
             # Count profiles instead of printing content to avoid encoding issues
             import json
@@ -84,9 +85,8 @@ def test_app():
 
             # Test 5: Check game page
             print("\n[TEST 5] Loading game page...")
-            page.goto(f"{APP_URL}/games-number-racing.html", timeout=30000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-            time.sleep(3)  # Wait for Babel compilation
+            page.goto(f"{app_url}/games-number-racing.html", timeout=30000)
+            waiter.until("menu", legacy_ms=3000)
 
             page.screenshot(path="screenshot_game.png", full_page=True)
             print("  Screenshot: screenshot_game.png")
@@ -99,9 +99,8 @@ def test_app():
 
             # Test 6: Click on game from main page (with profile)
             print("\n[TEST 6] Testing navigation from main page...")
-            page.goto(APP_URL, timeout=30000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-            time.sleep(2)
+            page.goto(app_url, timeout=30000)
+            waiter.until("marketplace", legacy_ms=2000)
 
             # Click on Number Racing game
             play_buttons = page.locator("button").all()
@@ -117,7 +116,7 @@ def test_app():
                     pass
 
             if game_clicked:
-                time.sleep(3)
+                waiter.until("react_mounted", legacy_ms=3000)
                 page.screenshot(path="screenshot_game_from_main.png", full_page=True)
                 print("  Screenshot: screenshot_game_from_main.png")
 
@@ -130,9 +129,8 @@ def test_app():
 
             # Test 7: Check Number Island game
             print("\n[TEST 7] Loading Number Island game...")
-            page.goto(f"{APP_URL}/games-number-island.html?profile=1764998591846", timeout=30000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-            time.sleep(3)
+            page.goto(f"{app_url}/games-number-island.html?profile={PROFILE_ID}", timeout=30000)
+            waiter.until("react_mounted", legacy_ms=3000)
 
             page.screenshot(path="screenshot_island.png", full_page=True)
             print("  Screenshot: screenshot_island.png")
@@ -145,9 +143,8 @@ def test_app():
 
             # Test 8: Check reading game with profile
             print("\n[TEST 8] Loading reading game with profile...")
-            page.goto(f"{APP_URL}/games-reading.html?profile=1764998591846", timeout=30000)
-            page.wait_for_load_state("networkidle", timeout=30000)
-            time.sleep(3)  # Wait for Babel compilation
+            page.goto(f"{app_url}/games-reading.html?profile={PROFILE_ID}", timeout=30000)
+            waiter.until("react_mounted", legacy_ms=3000)
 
             page.screenshot(path="screenshot_reading.png", full_page=True)
             print("  Screenshot: screenshot_reading.png")
@@ -170,8 +167,10 @@ def test_app():
             else:
                 print("[OK] No JavaScript errors detected")
 
+            waiter.print_summary()
+
             print(f"\nScreenshots saved to current directory")
-            print(f"App URL: {APP_URL}")
+            print(f"App URL: {app_url}")
 
         except Exception as e:
             print(f"\n[ERROR] {e}")
@@ -186,4 +185,5 @@ def test_app():
             print("\n[END] Testing complete")
 
 if __name__ == "__main__":
-    test_app()
+    with local_app() as app_url:
+        test_app(app_url)
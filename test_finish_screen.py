@@ -1,15 +1,20 @@
 from playwright.sync_api import sync_playwright
-import time
 import sys
 
+from harness import config
+from harness.oracle import RaceOracle, race_url
+from harness.server import local_app
+from harness.waits import StateTimeout, Waiter
+
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_finish_and_stage():
+def test_finish_and_stage(app_url):
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=300)
+        browser = p.chromium.launch(headless=config.HEADLESS)
         page = browser.new_page()
+        waiter = Waiter(page)
 
         console = []
         page.on('console', lambda msg: console.append(f"[{msg.type}] {msg.text}"))
@@ -19,8 +24,8 @@ def test_finish_and_stage():
         print("=" * 70)
 
         # Load with profile
-        page.goto('http://83.222.23.107:8081/games-number-racing.html?profile=1764998591846', timeout=30000)
-        page.wait_for_timeout(3000)
+        page.goto(f'{app_url}{race_url()}', timeout=30000)
+        waiter.until('menu', legacy_ms=3000)
 
         # Check learning stage indicator
         print(f"\n[1] Checking learning stage on menu...")
@@ -42,40 +47,21 @@ def test_finish_and_stage():
         print(f"\n[2] Starting race...")
         start_btn = page.locator('button:has-text("▶️")').first
         start_btn.click()
-        page.wait_for_timeout(2000)
+        waiter.until('race_task', legacy_ms=2000)
 
         # Answer questions correctly until finish (need 6 correct answers to reach 100%)
         print(f"\n[3] Answering questions to win...")
-        for i in range(10):  # Try up to 10 answers
-            try:
-                # Check if we're still in race
-                if not page.locator('.grid.grid-cols-3 button').first.is_visible(timeout=2000):
-                    print(f"   Race ended after {i} answers")
-                    break
-
-                # Find correct answer by checking number line highlight
-                # Or just click first button and hope for the best
-                buttons = page.locator('.grid.grid-cols-3 button').all()
-                if len(buttons) > 0:
-                    # Try each button until we get correct
-                    for btn in buttons:
-                        btn.click(force=True)
-                        page.wait_for_timeout(1200)
-
-                        # Check if celebration emoji appeared (correct answer)
-                        if page.locator('text=🎉').is_visible():
-                            print(f"   ✅ Answer {i+1} correct!")
-                            break
-                        elif page.locator('text=🙈').is_visible():
-                            # Wrong, already clicked, wait and continue
-                            page.wait_for_timeout(800)
-                            continue
-                        break  # Move to next question
-            except Exception as e:
-                print(f"   Error on question {i+1}: {str(e)[:50]}")
-                break
-
-        page.wait_for_timeout(3000)
+        oracle = RaceOracle(page, waiter)
+        try:
+            answers = oracle.finish_race()
+            print(f"   ✅ Race finished after {answers} correct answers ({oracle.clicks} clicks)")
+        except AssertionError as e:
+            print(f"   Error while answering: {str(e)[:80]}")
+
+        try:
+            waiter.until('finish', legacy_ms=3000)
+        except StateTimeout:
+            pass
 
         # Check for finish screen
         print(f"\n[4] Checking for finish screen...")
@@ -96,16 +82,18 @@ def test_finish_and_stage():
 
         page.screenshot(path='test_screenshots/final_state.png')
 
+        waiter.print_summary()
+
         # Show console
         print(f"\n[Console] Last 5 messages:")
         for msg in console[-5:]:
             print(f"   {msg}")
 
         print("\n" + "=" * 70)
-        time.sleep(3)
         browser.close()
 
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_finish_and_stage()
+    with local_app() as app_url:
+        test_finish_and_stage(app_url)
@@ -2,12 +2,14 @@ from playwright.sync_api import sync_playwright
 import time
 import sys
 
+from harness.server import local_app
+
 # Set UTF-8 encoding for console output
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_first_task():
+def test_first_task(app_url):
     """Test completing the first task to reproduce white screen bug"""
 
     print("Testing First Task Completion Bug")
@@ -25,7 +27,7 @@ def test_first_task():
         try:
             # Load the game
             print("\n[Test 1] Loading Number Racing game...")
-            page.goto('http://83.222.23.107:8081/games-number-racing.html', timeout=30000)
+            page.goto(f'{app_url}/games-number-racing.html', timeout=30000)
             page.wait_for_load_state('networkidle')
             page.wait_for_timeout(2000)
             print("[OK] Number Racing loaded")
@@ -91,4 +93,5 @@ def test_first_task():
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_first_task()
+    with local_app() as app_url:
+        test_first_task(app_url)
@@ -1,26 +1,29 @@
 from playwright.sync_api import sync_playwright
-import time
 import sys
 
+from harness.server import local_app
+from harness.waits import Waiter
+
 # Set UTF-8 encoding for console output
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_marketplace():
+def test_marketplace(app_url):
     """Test the deployed Education Games marketplace"""
 
-    print("Testing Education Games Marketplace at http://83.222.23.107:8081/")
+    print(f"Testing Education Games Marketplace at {app_url}/")
     print("=" * 70)
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
+        waiter = Waiter(page)
 
         try:
             # Test 1: Main marketplace loads
             print("\n[Test 1] Loading main marketplace page...")
-            page.goto('http://83.222.23.107:8081/', timeout=30000)
+            page.goto(f'{app_url}/', timeout=30000)
             page.wait_for_load_state('networkidle')
             print(f"[OK] Page loaded: {page.title()}")
 
@@ -57,7 +60,7 @@ def test_marketplace():
 
             # Test 4: API Health Check
             print("\n[Test 4] Testing API endpoints...")
-            response = page.goto('http://83.222.23.107:8081/api/health')
+            response = page.goto(f'{app_url}/api/health')
             if response.status == 200:
                 print(f"[OK] API Health Check: {response.status}")
                 health_data = response.json()
@@ -66,7 +69,7 @@ def test_marketplace():
                 print(f"[FAIL] API Health Check failed: {response.status}")
 
             # Test 5: Check profiles endpoint
-            page.goto('http://83.222.23.107:8081/api/profiles')
+            page.goto(f'{app_url}/api/profiles')
             page.wait_for_load_state('networkidle')
             profiles_text = page.content()
             print(f"[OK] Profiles endpoint accessible")
@@ -76,23 +79,23 @@ def test_marketplace():
 
             # Test Number Racing
             print("   Testing Number Racing game...")
-            page.goto('http://83.222.23.107:8081/games-number-racing.html', timeout=30000)
+            page.goto(f'{app_url}/games-number-racing.html', timeout=30000)
             page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(2000)  # Wait for React to render
+            waiter.until('react_mounted', legacy_ms=2000)
             page.screenshot(path='test_screenshots/02_number_racing.png', full_page=True)
             print(f"   [OK] Number Racing loaded: {page.title()}")
 
             # Test Reading Game
             print("   Testing Reading game...")
-            page.goto('http://83.222.23.107:8081/games-reading.html', timeout=30000)
+            page.goto(f'{app_url}/games-reading.html', timeout=30000)
             page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(2000)  # Wait for React to render
+            waiter.until('react_mounted', legacy_ms=2000)
             page.screenshot(path='test_screenshots/03_reading_game.png', full_page=True)
             print(f"   [OK] Reading Game loaded: {page.title()}")
 
             # Test 7: Network requests
             print("\n[Test 6] Monitoring network requests...")
-            page.goto('http://83.222.23.107:8081/')
+            page.goto(f'{app_url}/')
             page.wait_for_load_state('networkidle')
 
             # Check if React and other libraries loaded
@@ -104,6 +107,7 @@ def test_marketplace():
             print(f"   ReactDOM loaded: {'[OK]' if react_dom_loaded else '[FAIL]'}")
             print(f"   Babel loaded: {'[OK]' if babel_loaded else '[FAIL]'}")
 
+            waiter.print_summary()
             print("\n" + "=" * 70)
             print("Testing completed successfully!")
             print("=" * 70)
@@ -122,4 +126,5 @@ if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
 
-    test_marketplace()
+    with local_app() as app_url:
+        test_marketplace(app_url)
@@ -1,28 +1,31 @@
 from playwright.sync_api import sync_playwright
-import time
 import sys
 
+from harness import config
+from harness.server import local_app
+from harness.waits import Waiter
+
 # Set UTF-8 encoding for console output
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_navigation():
+def test_navigation(app_url):
     """Test the navigation fix for the back button"""
 
     print("Testing Number Racing Navigation Fix")
     print("=" * 70)
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Run visible for debugging
+        browser = p.chromium.launch(headless=config.HEADLESS)  # HARNESS_HEADED=1 to watch
         page = browser.new_page()
+        waiter = Waiter(page)
 
         try:
             # Load the game
             print("\n[Test 1] Loading Number Racing game...")
-            page.goto('http://83.222.23.107:8081/games-number-racing.html', timeout=30000)
-            page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(2000)  # Wait for React to render
+            page.goto(f'{app_url}/games-number-racing.html', timeout=30000)
+            waiter.until('menu', legacy_ms=2000)
             print("[OK] Number Racing loaded")
 
             # Check we're on menu screen
@@ -35,7 +38,7 @@ def test_navigation():
             print("\n[Test 3] Navigating to garage...")
             garage_button = page.locator('button:has-text("🚗")').first
             garage_button.click()
-            page.wait_for_timeout(1000)
+            waiter.until('garage', legacy_ms=1000)
 
             # Verify we're in garage (check for car unlock buttons or stars display)
             car_locks = page.locator('text=🔒').all()
@@ -46,7 +49,7 @@ def test_navigation():
             print("\n[Test 4] Testing back button from garage...")
             back_button = page.locator('button:has-text("← Назад")').first
             back_button.click()
-            page.wait_for_timeout(1000)
+            waiter.until('menu', legacy_ms=1000)
 
             # Verify we're back on menu (not marketplace)
             start_button = page.locator('button:has-text("▶️")').first
@@ -60,11 +63,11 @@ def test_navigation():
             print("\n[Test 5] Testing back button from menu to marketplace...")
             back_button = page.locator('button:has-text("← Назад")').first
             back_button.click()
-            page.wait_for_timeout(2000)
+            waiter.until('marketplace', legacy_ms=2000)
 
             # Check if we're on marketplace page
             current_url = page.url
-            if current_url == 'http://83.222.23.107:8081/' or 'index.html' in current_url:
+            if current_url == f'{app_url}/' or 'index.html' in current_url:
                 print(f"[OK] Back button from menu correctly returned to marketplace")
                 print(f"    Current URL: {current_url}")
             else:
@@ -72,19 +75,17 @@ def test_navigation():
 
             # Navigate back to game and test stats screen
             print("\n[Test 6] Testing back button from stats screen...")
-            page.goto('http://83.222.23.107:8081/games-number-racing.html', timeout=30000)
-            page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(2000)
+            page.goto(f'{app_url}/games-number-racing.html', timeout=30000)
+            waiter.until('menu', legacy_ms=2000)
 
             # Click stats button
             stats_button = page.locator('button:has-text("📊")').first
             stats_button.click()
-            page.wait_for_timeout(1000)
 
-            # Click back button
+            # Click back button (the click waits for the stats screen to render it)
             back_button = page.locator('button:has-text("◀️")').first  # Stats has its own back button
-            back_button.click()
-            page.wait_for_timeout(1000)
+            back_button.click(timeout=5000)
+            waiter.until('menu', legacy_ms=2000)
 
             # Verify we're back on menu
             start_button = page.locator('button:has-text("▶️")').first
@@ -94,6 +95,7 @@ def test_navigation():
             print("\n" + "=" * 70)
             print("Navigation testing completed successfully!")
             print("=" * 70)
+            waiter.print_summary()
 
         except Exception as e:
             print(f"\n[ERROR] Error during testing: {str(e)}")
@@ -109,4 +111,5 @@ if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
 
-    test_navigation()
+    with local_app() as app_url:
+        test_navigation(app_url)
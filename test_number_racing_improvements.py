@@ -2,12 +2,14 @@ from playwright.sync_api import sync_playwright
 import time
 import sys
 
+from harness.server import local_app
+
 # Set UTF-8 encoding for console output
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_number_racing_improvements():
+def test_number_racing_improvements(app_url):
     """Test the improved Number Racing game"""
 
     print("Testing Number Racing Improvements")
@@ -20,7 +22,7 @@ def test_number_racing_improvements():
         try:
             # Load the game
             print("\n[Test 1] Loading Number Racing game...")
-            page.goto('http://83.222.23.107:8081/games-number-racing.html', timeout=30000)
+            page.goto(f'{app_url}/games-number-racing.html', timeout=30000)
             page.wait_for_load_state('networkidle')
             page.wait_for_timeout(2000)
             print("[OK] Number Racing loaded")
@@ -76,4 +78,5 @@ def test_number_racing_improvements():
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_number_racing_improvements()
+    with local_app() as app_url:
+        test_number_racing_improvements(app_url)
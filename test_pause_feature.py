@@ -1,15 +1,20 @@
 from playwright.sync_api import sync_playwright
-import time
 import sys
 
+from harness import config
+from harness.config import PROFILE_ID
+from harness.server import local_app
+from harness.waits import StateTimeout, Waiter
+
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_pause_feature():
+def test_pause_feature(app_url):
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=300)
+        browser = p.chromium.launch(headless=config.HEADLESS)
         page = browser.new_page()
+        waiter = Waiter(page)
 
         console = []
         errors = []
@@ -23,8 +28,8 @@ def test_pause_feature():
         try:
             # Load game
             print("\n[1] Loading game...")
-            page.goto('http://83.222.23.107:8081/games-number-racing.html?profile=1764998591846', timeout=30000)
-            page.wait_for_timeout(3000)
+            page.goto(f'{app_url}/games-number-racing.html?profile={PROFILE_ID}', timeout=30000)
+            waiter.until('menu', legacy_ms=3000)
 
             # Check if menu loaded
             start_btn = page.locator('button:has-text("▶️")').first
@@ -37,7 +42,7 @@ def test_pause_feature():
             # Start race
             print("\n[2] Starting race...")
             start_btn.click()
-            page.wait_for_timeout(2000)
+            waiter.until('race_task', legacy_ms=2000)
 
             # Check if race screen loaded
             if page.locator('.grid.grid-cols-3 button').first.is_visible(timeout=3000):
@@ -53,7 +58,8 @@ def test_pause_feature():
                     buttons = page.locator('.grid.grid-cols-3 button').all()
                     if len(buttons) > 0:
                         buttons[0].click(force=True)
-                        page.wait_for_timeout(1200)
+                        waiter.until('answer_feedback')
+                        waiter.until('feedback_settled', legacy_ms=1200)
                         print(f"   ✅ Answered question {i+1}")
                 except Exception as e:
                     print(f"   ⚠️ Error on question {i+1}: {str(e)[:50]}")
@@ -65,7 +71,7 @@ def test_pause_feature():
             if pause_btn.is_visible():
                 print("   ✅ Pause button found!")
                 pause_btn.click()
-                page.wait_for_timeout(1000)
+                waiter.until('pause_menu', legacy_ms=1000)
 
                 # Check if pause menu is visible
                 pause_menu = page.locator('text=Пауза').first
@@ -84,7 +90,7 @@ def test_pause_feature():
                     if resume_btn.is_visible():
                         print("   ✅ Resume button found!")
                         resume_btn.click()
-                        page.wait_for_timeout(1000)
+                        waiter.until('race_resumed', legacy_ms=1000)
                         print("   ✅ Race resumed!")
 
                 else:
@@ -94,7 +100,11 @@ def test_pause_feature():
 
             # Check localStorage for saved race
             print("\n[5] Checking auto-save...")
-            page.wait_for_timeout(6000)  # Wait for auto-save (5 seconds)
+            # Auto-save runs every 5 s; resolves as soon as it has written
+            try:
+                waiter.until('race_autosaved', legacy_ms=6000, timeout=8000)
+            except StateTimeout:
+                pass
 
             saved_race = page.evaluate("localStorage.getItem('raceInProgress')")
             if saved_race:
@@ -111,12 +121,12 @@ def test_pause_feature():
             pause_btn = page.locator('button:has-text("⏸️")').first
             if pause_btn.is_visible():
                 pause_btn.click()
-                page.wait_for_timeout(1000)
+                waiter.until('pause_menu', legacy_ms=1000)
 
                 exit_btn = page.locator('button:has-text("Выйти в меню")').first
                 if exit_btn.is_visible():
                     exit_btn.click()
-                    page.wait_for_timeout(2000)
+                    waiter.until('continue_dialog', legacy_ms=2000)
 
                     # Check if back in menu
                     if page.locator('button:has-text("▶️")').first.is_visible():
@@ -131,6 +141,7 @@ def test_pause_feature():
                         else:
                             print("   ⚠️ Continue race dialog not shown")
 
+            waiter.print_summary()
             print("\n" + "=" * 70)
             print("SUMMARY:")
             print(f"  Console messages: {len(console)}")
@@ -160,10 +171,10 @@ def test_pause_feature():
                 for msg in console[-5:]:
                     print(f"   {msg}")
 
-            time.sleep(3)
             browser.close()
 
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_pause_feature()
+    with local_app() as app_url:
+        test_pause_feature(app_url)
@@ -1,20 +1,25 @@
 from playwright.sync_api import sync_playwright
-import time
 import sys
 
+from harness import config
+from harness.config import PROFILE_ID
+from harness.server import local_app
+from harness.waits import StateTimeout, Waiter
+
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
 
-def test_profile_loading():
+def test_profile_loading(app_url):
     """Test loading game with profile parameter"""
 
     print("Testing Profile Loading Bug")
     print("=" * 70)
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=500)
+        browser = p.chromium.launch(headless=config.HEADLESS)
         page = browser.new_page()
+        waiter = Waiter(page)
 
         # Listen for all console messages
         console_messages = []
@@ -27,12 +32,15 @@ def test_profile_loading():
 
         try:
             # Test with profile parameter
-            profile_url = 'http://83.222.23.107:8081/games-number-racing.html?profile=1764998591846'
+            profile_url = f'{app_url}/games-number-racing.html?profile={PROFILE_ID}'
             print(f"\n[Test 1] Loading game with profile parameter...")
             print(f"   URL: {profile_url}")
 
             page.goto(profile_url, timeout=30000)
-            page.wait_for_timeout(5000)  # Wait longer for async loading
+            try:
+                waiter.until('menu', legacy_ms=5000)  # Profile fetched and menu rendered
+            except StateTimeout as e:
+                print(f"   [WARN] {e}")
 
             # Check for white screen
             body_text = page.locator('body').text_content()
@@ -69,7 +77,7 @@ def test_profile_loading():
 
             # Try to get profiles via API directly
             print(f"\n[Test 2] Checking API /api/profiles...")
-            api_response = page.goto('http://83.222.23.107:8081/api/profiles')
+            api_response = page.goto(f'{app_url}/api/profiles')
             if api_response.ok:
                 profiles = api_response.json()
                 print(f"   [OK] API responded with {len(profiles)} profiles")
@@ -77,7 +85,7 @@ def test_profile_loading():
                 # Find our profile
                 target_profile = None
                 for prof in profiles:
-                    if str(prof.get('id')) == '1764998591846':
+                    if str(prof.get('id')) == PROFILE_ID:
                         target_profile = prof
                         break
 
@@ -91,13 +99,13 @@ def test_profile_loading():
                         print(f"        Learning Stage: {nrd.get('learningStage', 'N/A')}")
                         print(f"        Difficulty: {nrd.get('difficulty', 'N/A')}")
                 else:
-                    print(f"   [WARN] Profile 1764998591846 NOT FOUND in profiles")
+                    print(f"   [WARN] Profile {PROFILE_ID} NOT FOUND in profiles")
             else:
                 print(f"   [FAIL] API error: {api_response.status}")
 
+            waiter.print_summary()
+
             print("\n" + "=" * 70)
-            print("Waiting 5 seconds to observe...")
-            page.wait_for_timeout(5000)
 
         except Exception as e:
             print(f"\n[ERROR] Exception: {str(e)}")
@@ -110,11 +118,10 @@ def test_profile_loading():
             raise
 
         finally:
-            print("\nClosing browser in 3 seconds...")
-            time.sleep(3)
             browser.close()
 
 if __name__ == '__main__':
     import os
     os.makedirs('test_screenshots', exist_ok=True)
-    test_profile_loading()
+    with local_app() as app_url:
+        test_profile_loading(app_url)
@@ -0,0 +1,22 @@
+import sys
+
+from harness import config
+from harness.taskgen import run
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+def test_task_generator(app_url):
+    """Every stage's tasks satisfy the invariants; stage 4 has +, - and a 0 answer."""
+    print("=" * 70)
+    print("TEST: Task generator invariants (in-page, 100k tasks per stage)")
+    print("=" * 70)
+
+    summary, failed = run(app_url, batches=1, batch_size=100_000, weak=7, headless=config.HEADLESS)
+
+    assert not failed, {stage: (s['violations'], s['problems']) for stage, s in summary.items()}
+    assert summary['4']['ops'].get('+') and summary['4']['ops'].get('-')
+    # Three mistakes on 7 must make it noticeably more frequent
+    weak = summary['3']['weak']
+    assert weak['share_after'] > weak['share_before'] * 2, weak
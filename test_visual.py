@@ -0,0 +1,70 @@
+import random
+import struct
+import sys
+import zlib
+
+import pytest
+
+from harness.visual import CHANNELS, PNG_SIGNATURE, decode_png
+
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if pa <= pb and pa <= pc else b if pb <= pc else c
+
+
+def _filter(kind, row, prev, bpp):
+    """Reference PNG filter (the encoder side of harness.visual._unfilter)."""
+    out = bytearray(len(row))
+    for i, x in enumerate(row):
+        a = row[i - bpp] if i >= bpp else 0
+        b = prev[i]
+        c = prev[i - bpp] if i >= bpp else 0
+        predictor = (0, a, b, (a + b) >> 1, _paeth(a, b, c))[kind]
+        out[i] = (x - predictor) & 0xFF
+    return out
+
+
+def _encode(width, height, color, pixels):
+    """PNG with every filter type in turn, so each one follows every other."""
+    stride = width * CHANNELS[color]
+    raw, prev = bytearray(), bytearray(stride)
+    for y in range(height):
+        row = pixels[y * stride:(y + 1) * stride]
+        kind = y % 5
+        raw += bytes([kind]) + _filter(kind, row, prev, CHANNELS[color])
+        prev = row
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+    return (PNG_SIGNATURE + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(bytes(raw))) + chunk(b'IEND', b''))
+
+
+def _expected_rgb(color, row):
+    if color == 2:
+        return row
+    if color == 6:
+        return bytes(b for i, b in enumerate(row) if i % 4 != 3)
+    gray = row[::2] if color == 4 else row
+    return bytes(g for g in gray for _ in range(3))
+
+
+@pytest.mark.parametrize('color', [0, 2, 4, 6])
+def test_decode_png(color):
+    """Every colour type and filter type decodes back to the encoded pixels."""
+    width, height = 7, 11
+    rng = random.Random(color)
+    stride = width * CHANNELS[color]
+    pixels = bytes(rng.randrange(256) for _ in range(stride * height))
+
+    w, h, rows = decode_png(_encode(width, height, color, pixels))
+
+    assert (w, h) == (width, height)
+    for y, row in enumerate(rows):
+        assert bytes(row) == _expected_rgb(color, pixels[y * stride:(y + 1) * stride]), f'row {y}'